@@ -9,6 +9,7 @@ all of your client code.
 """
 import a1_game
 import pygame
+from ui_assets import SpriteAtlas, LabelCache
 import sys
 
 GAME_SPEED = 100
@@ -23,12 +24,18 @@ P2_POSITION = CHARACTER_SIZE - (CHARACTER_SIZE // 4)
 RANDOM_TIMER = 10
 FONT_SIZE = 18
 
+# Loaded once by start_game()
+SPRITES = None
+BACKGROUND = None
+LABELS = None
+
 
 def start_game():
     """
     Start and initialize the game
     """
     global PYGAME_SCREEN, CHARACTER_SIZE, NUMBER_OF_CHARACTERS, FONT_SIZE
+    global SPRITES, BACKGROUND, LABELS
     a1_game.set_up_game()
 
     # Set up the width and height of the screen (proportional to the character
@@ -41,6 +48,11 @@ def start_game():
     # set the screen to draw on
     PYGAME_SCREEN = pygame.display.set_mode(pixel_size)
 
+    # Load every sprite and the font now, rather than on every frame
+    SPRITES = SpriteAtlas('sprites')
+    BACKGROUND = pygame.image.load('sprites/background.png').convert()
+    LABELS = LabelCache(FONT_SIZE)
+
 
 def update_game():
     """
@@ -64,26 +76,17 @@ def update_game():
 
     p2_label = "{}\nHP: {}\nSP: {}".format(p2_name, p2_hp, p2_sp).split("\n")
 
-    font_type = pygame.font.get_default_font()
-    font = pygame.font.SysFont(font_type, FONT_SIZE)
-
-    p1_icon = pygame.image.load('sprites/' + p1_sprite + '.png')
-    p2_icon = pygame.image.load('sprites/' + p2_sprite + '.png')
-
     PYGAME_SCREEN.fill((255, 255, 255))  # (255, 255, 255)=(r,g,b)=white
-    bg = pygame.image.load('sprites/background.png')
     rect = pygame.Rect(0, 0, NUMBER_OF_CHARACTERS * CHARACTER_SIZE,
                        CHARACTER_SIZE + PADDING * 2)
-    PYGAME_SCREEN.blit(bg, rect)
+    PYGAME_SCREEN.blit(BACKGROUND, rect)
 
     # Draw the first character
     (x, y) = P1_POSITION, PADDING
-    rect = pygame.Rect(x, y, CHARACTER_SIZE, CHARACTER_SIZE)
-    PYGAME_SCREEN.blit(p1_icon, rect)
+    SPRITES.draw(PYGAME_SCREEN, p1_sprite, (x, y))
 
     y_coordinate = 0
-    for line in p1_label:
-        text = font.render(line, True, (0, 0, 0))
+    for text in LABELS.render_lines('p1', p1_label):
         PYGAME_SCREEN.blit(text, (P1_POSITION + PADDING, y_coordinate))
         y_coordinate += FONT_SIZE
 
@@ -92,14 +95,11 @@ def update_game():
 
     # Draw the second character
     # Flip p2 so they face p1
-    p2_icon = pygame.transform.flip(p2_icon, True, False)
     (x, y) = P2_POSITION, PADDING
-    rect = pygame.Rect(x, y, CHARACTER_SIZE, CHARACTER_SIZE)
-    PYGAME_SCREEN.blit(p2_icon, rect)
+    SPRITES.draw(PYGAME_SCREEN, p2_sprite, (x, y), flipped=True)
 
     y_coordinate = 0
-    for line in p2_label:
-        text = font.render(line, True, (0, 0, 0))
+    for text in LABELS.render_lines('p2', p2_label):
         PYGAME_SCREEN.blit(text, (P2_POSITION + PADDING, y_coordinate))
         y_coordinate += FONT_SIZE
 
@@ -111,8 +111,7 @@ def update_game():
                         "Available Actions: {}".format(", ".join(actions))]
 
         y_coordinate = CHARACTER_SIZE + PADDING
-        for line in action_label:
-            text = font.render(line, True, (0, 0, 0))
+        for text in LABELS.render_lines('status', action_label):
             PYGAME_SCREEN.blit(text, (P1_POSITION + PADDING // 2, y_coordinate))
             y_coordinate += FONT_SIZE
     else:
@@ -124,8 +123,7 @@ def update_game():
             game_label.append("The game ended in a tie!")
 
         y_coordinate = CHARACTER_SIZE + PADDING
-        for line in game_label:
-            text = font.render(line, True, (0, 0, 0))
+        for text in LABELS.render_lines('status', game_label):
             PYGAME_SCREEN.blit(text, (P1_POSITION + PADDING // 2, y_coordinate))
             y_coordinate += FONT_SIZE
 
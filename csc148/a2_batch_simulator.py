@@ -0,0 +1,474 @@
+"""
+The BatchSimulator class for A2.
+
+A BatchSimulator plays many games between the same two classes of character
+at once, for balancing skill numbers. Each game is a row of NumPy arrays, and
+every unfinished game is advanced by one turn at a time with the same array
+operations, so a turn of a million games costs a few dozen array operations
+rather than a million calls into Character and BattleQueue.
+
+Games are played by the rules of perform_attack() in a2_game.py, using the
+tables of rules in a2_game_state.py. Note that perform_attack() only removes
+the character who acted if they can still act, so it doesn't always match
+BattleQueue.apply_move(), which searches use.
+"""
+from typing import Tuple
+import numpy as np
+from a2_game_state import get_rules, SKILL_ADDS, LIFESTEAL_SKILLS, \
+    SORCERER_ATTACK_COST, SORCERER_ATTACK_BOOST
+from a2_skill_decision_tree import Combatant, create_default_tree
+from a2_skills import SorcererSpecial
+
+# The policies players can use to pick actions: one of the actions available
+# at random, like RandomPlaystyle, or always attacking or always special
+# attacking when they can.
+POLICIES = ['random', 'attack', 'special']
+
+
+def _get_tree_skills(tree: 'SkillDecisionTree') -> list:
+    """
+    Return the skills in every node of tree.
+    """
+    skills = []
+    nodes = [tree]
+    while nodes:
+        node = nodes.pop()
+        skills.append(node.value)
+        nodes.extend(node.children)
+    return skills
+
+
+class BatchSimulator:
+    """
+    A class representing many games between the same two classes of
+    character, played at once.
+
+    Players are numbered 0 and 1 as in a2_game_state.py. Each game starts as
+    a2_game.py starts one: both players have 100 HP and 100 SP, and player 0
+    is added to the queue, then player 1.
+
+    The queue of each game is kept in a row of a 2D array, from the column in
+    its head to the one before its tail. Each entry is the player's number,
+    plus 2 in a RestrictedBattleQueue if they're able to add, as in
+    a2_battle_queue.py.
+
+    classes - the Character class of each player.
+    restricted - whether the games use RestrictedBattleQueues.
+    trees - the SkillDecisionTree of each player, or None for players that
+            don't use one.
+    hps - the HP of each player, one row per game.
+    sps - the SP of each player, one row per game.
+    turns - the number of turns each game has taken.
+    over - whether each game is over.
+    winners - the player who won each game, or -1 for games that aren't over
+              or were ties.
+    actions - a row for each turn so far, with the action taken in each game:
+              0 for 'A', 1 for 'S' or -1 for games that were already over. It's
+              None unless the simulator was made to record actions.
+    """
+    classes: Tuple[type, type]
+    restricted: bool
+    trees: Tuple['SkillDecisionTree', 'SkillDecisionTree']
+    hps: np.ndarray
+    sps: np.ndarray
+    turns: np.ndarray
+    over: np.ndarray
+    winners: np.ndarray
+    actions: list
+
+    def __init__(self, classes: Tuple[type, type], games: int,
+                 restricted: bool = False,
+                 trees: Tuple['SkillDecisionTree', 'SkillDecisionTree'] = None,
+                 policies: Tuple[str, str] = ('random', 'random'),
+                 seed: int = None, record: bool = False) -> None:
+        """
+        Initialize this BatchSimulator with games new games between a player
+        of classes[0] and one of classes[1], who pick actions by the policies
+        in POLICIES named by policies. Players who need a SkillDecisionTree
+        use the one in trees, or the default tree if trees is None. Random
+        choices are seeded by seed, and the actions taken are recorded if
+        record is True.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> sim = BatchSimulator((Rogue, Mage), 3)
+        >>> sim.hps.tolist()
+        [[100, 100], [100, 100], [100, 100]]
+        >>> sim.get_order(0)
+        [0, 1]
+        """
+        self.classes = tuple(classes)
+        self.restricted = restricted
+        rules = [get_rules(character_class) for character_class in classes]
+        if trees is None:
+            trees = tuple(create_default_tree() if attack is None else None
+                          for attack, _, _ in rules)
+        self.trees = tuple(trees)
+
+        # Number every skill the players can use, and tabulate what each one
+        # does by its number.
+        skills = [skill for attack, special, _ in rules
+                  for skill in [attack, special] if skill is not None]
+        for tree in self.trees:
+            if tree is not None:
+                skills.extend(_get_tree_skills(tree))
+        self._skill_ids = {}
+        unique = []
+        for skill in skills:
+            if type(skill) not in self._skill_ids:
+                self._skill_ids[type(skill)] = len(unique)
+                unique.append(skill)
+        skills = unique
+        self._costs = np.array([skill.get_sp_cost() for skill in skills])
+        self._damages = np.array([skill.get_damage() for skill in skills])
+        self._lifesteals = np.array([isinstance(skill, LIFESTEAL_SKILLS)
+                                     for skill in skills], dtype=bool)
+        self._dedupes = np.array([isinstance(skill, SorcererSpecial)
+                                  for skill in skills], dtype=bool)
+        # Who each skill adds, in order: 0 for the caster, 1 for the target and
+        # -1 for no one. SorcererSpecial adds its caster after deduping.
+        adds = [('c' if isinstance(skill, SorcererSpecial) else '') +
+                SKILL_ADDS[type(skill)] for skill in skills]
+        self._adds = np.full((len(skills), max(len(who) for who in adds)), -1)
+        for i, who in enumerate(adds):
+            for j, player in enumerate(who):
+                self._adds[i, j] = 0 if player == 'c' else 1
+
+        # The rules of each player, by their number. An attack skill of -1 is
+        # picked by the player's SkillDecisionTree.
+        self._attack_skills = np.array([
+            -1 if attack is None else self._skill_ids[type(attack)]
+            for attack, _, _ in rules])
+        self._special_skills = np.array([self._skill_ids[type(special)]
+                                         for _, special, _ in rules])
+        self._attack_costs = np.array([
+            SORCERER_ATTACK_COST if attack is None else attack.get_sp_cost()
+            for attack, _, _ in rules])
+        self._special_costs = self._costs[self._special_skills]
+        self._min_costs = np.minimum(self._attack_costs, self._special_costs)
+        self._defenses = np.array([defense for _, _, defense in rules])
+        self._class_ids = np.array([0, int(classes[1] != classes[0])])
+        self._policies = np.array([POLICIES.index(policy)
+                                   for policy in policies])
+        self._picks = {}
+        self._rng = np.random.default_rng(seed)
+
+        self.hps = np.full((games, 2), 100, dtype=np.int64)
+        self.sps = np.full((games, 2), 100, dtype=np.int64)
+        self.turns = np.zeros(games, dtype=np.int64)
+        self.over = np.zeros(games, dtype=bool)
+        self.winners = np.full(games, -1, dtype=np.int8)
+        self.actions = [] if record else None
+        self._queue = np.zeros((games, 16), dtype=np.int8)
+        self._head = np.zeros(games, dtype=np.int64)
+        self._tail = np.zeros(games, dtype=np.int64)
+        everyone = np.arange(games)
+        for player in range(2):
+            self._push(everyone, np.full(games, player), True)
+        self._update_over(everyone)
+
+    def get_order(self, game: int) -> list:
+        """
+        Return the players in the queue of game, front first.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> sim = BatchSimulator((Rogue, Mage), 1, policies=('special',
+        ...                                                  'special'))
+        >>> _ = sim.step()
+        >>> sim.get_order(0)
+        [1, 0, 0]
+        """
+        return [int(entry) & 1 for entry in
+                self._queue[game, self._head[game]:self._tail[game]]]
+
+    def get_ables(self, game: int) -> list:
+        """
+        Return whether each entry in the queue of game is able to add, front
+        first, if the games use RestrictedBattleQueues.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> sim = BatchSimulator((Rogue, Mage), 1, restricted=True,
+        ...                      policies=('special', 'special'))
+        >>> _ = sim.step()
+        >>> sim.get_ables(0)
+        [True, True, False]
+        """
+        return [bool(entry & 2) for entry in
+                self._queue[game, self._head[game]:self._tail[game]]]
+
+    def step(self) -> int:
+        """
+        Make the next player in every game that isn't over perform an action
+        picked by their policy, as perform_attack() does. Return the number of
+        games that still aren't over.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> sim = BatchSimulator((Rogue, Mage), 2, policies=('attack',
+        ...                                                  'attack'))
+        >>> sim.step()
+        2
+        >>> sim.hps.tolist(), sim.sps.tolist()
+        ([[100, 93], [100, 93]], [[97, 100], [97, 100]])
+        """
+        games = np.flatnonzero(~self.over)
+        if games.size == 0:
+            return 0
+        if self.actions is not None:
+            self.actions.append(np.full(len(self.over), -1, dtype=np.int8))
+        self._clean(games)
+        casters = self._queue[games, self._head[games]] & 1
+        targets = 1 - casters
+        actions = self._choose(games, casters)
+        if self.actions is not None:
+            self.actions[-1][games] = actions
+
+        skills = np.where(actions == 0, self._attack_skills[casters],
+                          self._special_skills[casters])
+        sorcery = skills < 0
+        sorcery_games, sorcery_casters = games[sorcery], casters[sorcery]
+        saved_sps = self.sps[sorcery_games, sorcery_casters]
+        if sorcery.any():
+            self.sps[sorcery_games, sorcery_casters] = \
+                saved_sps + SORCERER_ATTACK_BOOST
+            skills[sorcery] = self._pick_skills(sorcery_games,
+                                                sorcery_casters)
+
+        prev_hps = self.hps[games, targets]
+        self.sps[games, casters] -= self._costs[skills]
+        damage = self._damages[skills] - self._defenses[targets]
+        self.hps[games, targets] = np.maximum(prev_hps - damage, 0)
+        dedupes = self._dedupes[skills]
+        if dedupes.any():
+            self._dedupe(games[dedupes])
+        for column in self._adds.T:
+            who = column[skills]
+            adding = who >= 0
+            if adding.any():
+                self._add(games[adding],
+                          np.where(who == 0, casters, targets)[adding])
+        steals = self._lifesteals[skills]
+        if steals.any():
+            self.hps[games[steals], casters[steals]] += \
+                prev_hps[steals] - self.hps[games[steals], targets[steals]]
+        if sorcery.any():
+            self.sps[sorcery_games, sorcery_casters] = \
+                saved_sps - SORCERER_ATTACK_COST
+
+        can_act = self.sps[games, casters] >= self._min_costs[casters]
+        self._remove(games[can_act])
+        self.turns[games] += 1
+        self._update_over(games)
+        return int(np.count_nonzero(~self.over))
+
+    def run(self) -> None:
+        """
+        Play every game until it's over.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> sim = BatchSimulator((Rogue, Mage), 100, seed=148)
+        >>> sim.run()
+        >>> bool(sim.over.all())
+        True
+        """
+        while self.step():
+            pass
+
+    def get_win_counts(self) -> Tuple[int, int, int]:
+        """
+        Return the number of games won by player 0, won by player 1, and tied
+        or not over yet.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> sim = BatchSimulator((Rogue, Mage), 10, policies=('attack',
+        ...                                                   'attack'))
+        >>> sim.run()
+        >>> sim.get_win_counts()
+        (0, 10, 0)
+        """
+        return (int(np.count_nonzero(self.winners == 0)),
+                int(np.count_nonzero(self.winners == 1)),
+                int(np.count_nonzero(self.winners == -1)))
+
+    def _choose(self, games: np.ndarray, players: np.ndarray) -> np.ndarray:
+        """
+        Return the action each of players, who can act, picks in games by
+        their policy.
+        """
+        sps = self.sps[games, players]
+        can_attack = sps >= self._attack_costs[players]
+        can_special = sps >= self._special_costs[players]
+        policies = self._policies[players]
+        actions = (policies != POLICIES.index('attack')).astype(np.int8)
+        random = policies == POLICIES.index('random')
+        actions[random] = self._rng.integers(0, 2, np.count_nonzero(random))
+        # Fall back to the other action when the one picked isn't available.
+        available = np.where(actions == 0, can_attack, can_special)
+        return np.where(available, actions, 1 - actions).astype(np.int8)
+
+    def _pick_skills(self, games: np.ndarray,
+                     players: np.ndarray) -> np.ndarray:
+        """
+        Return the number of the skill each of players picks with their
+        SkillDecisionTree in games. Each situation is only put to a tree once.
+        """
+        targets = 1 - players
+        situations = np.stack([players, self.hps[games, players],
+                               self.sps[games, players],
+                               self.hps[games, targets],
+                               self.sps[games, targets]], axis=1)
+        unique, inverse = np.unique(situations, axis=0, return_inverse=True)
+        picks = np.array([self._pick_skill(tuple(situation))
+                          for situation in unique.tolist()])
+        return picks[inverse.reshape(-1)]
+
+    def _pick_skill(self, situation: tuple) -> int:
+        """
+        Return the number of the skill picked in situation, which is the
+        player picking it, their HP and SP, and their target's HP and SP.
+        """
+        if situation not in self._picks:
+            player, hp, sp, target_hp, target_sp = situation
+            skill = self.trees[player].pick_skill(Combatant(hp, sp),
+                                                  Combatant(target_hp,
+                                                            target_sp))
+            self._picks[situation] = self._skill_ids[type(skill)]
+        return self._picks[situation]
+
+    def _clean(self, games: np.ndarray) -> None:
+        """
+        Remove the entries at the front of the queues of games whose players
+        can't act.
+        """
+        while games.size:
+            games = games[self._head[games] < self._tail[games]]
+            players = self._queue[games, self._head[games]] & 1
+            games = games[self.sps[games, players] < self._min_costs[players]]
+            self._head[games] += 1
+
+    def _remove(self, games: np.ndarray) -> None:
+        """
+        Remove the entry at the front of the queues of games, after cleaning
+        them.
+        """
+        self._clean(games)
+        games = games[self._head[games] < self._tail[games]]
+        self._head[games] += 1
+
+    def _push(self, games: np.ndarray, players: np.ndarray,
+              ables: np.ndarray) -> None:
+        """
+        Append players to the back of the queues of games, able to add where
+        ables is True if the games use RestrictedBattleQueues.
+        """
+        if games.size and \
+                self._tail[games].max() >= self._queue.shape[1]:
+            self._make_room()
+        entries = players + 2 * (np.asarray(ables) & self.restricted)
+        self._queue[games, self._tail[games]] = entries
+        self._tail[games] += 1
+
+    def _make_room(self) -> None:
+        """
+        Move every queue to the start of its row, and widen the rows so that
+        each has room for at least as many entries again.
+        """
+        lengths = self._tail - self._head
+        width = max(self._queue.shape[1], 2 * int(lengths.max()) + 4)
+        columns = np.minimum(self._head[:, None] + np.arange(width),
+                             self._queue.shape[1] - 1)
+        self._queue = np.take_along_axis(self._queue, columns, axis=1)
+        self._head = np.zeros_like(self._head)
+        self._tail = lengths
+
+    def _add(self, games: np.ndarray, players: np.ndarray) -> None:
+        """
+        Add players to the queues of games, as BattleQueue.add() or
+        RestrictedBattleQueue.add() does.
+        """
+        if not self.restricted:
+            self._push(games, players, True)
+            return
+        empty = self._head[games] >= self._tail[games]
+        self._push(games[empty], players[empty], True)
+        # As in RestrictedBattleQueue.add(), whether anyone is added depends
+        # on the front of the queue before it's cleaned.
+        adding = ~empty & (self._get_fronts(games) & 2 != 0)
+        games, players = games[adding], players[adding]
+        self._clean(games)
+        fronts = self._get_fronts(games) & 1
+        same_class = self._class_ids[players] == self._class_ids[fronts]
+        ables = same_class & (self._count_ables(games, players) < 2)
+        self._push(games, players, ables)
+
+    def _get_fronts(self, games: np.ndarray) -> np.ndarray:
+        """
+        Return the entries at the front of the queues of games, or 0 for the
+        queues that are empty, whose heads may be past the end of their rows.
+        """
+        heads = np.minimum(self._head[games], self._queue.shape[1] - 1)
+        return np.where(self._head[games] < self._tail[games],
+                        self._queue[games, heads], 0)
+
+    def _count_ables(self, games: np.ndarray,
+                     players: np.ndarray) -> np.ndarray:
+        """
+        Return the number of entries in the queues of games that are able to
+        add and whose players are of the same class as players.
+        """
+        entries = self._queue[games]
+        columns = np.arange(entries.shape[1])
+        inside = (columns >= self._head[games, None]) & \
+            (columns < self._tail[games, None])
+        same_class = self._class_ids[entries & 1] == \
+            self._class_ids[players, None]
+        return np.count_nonzero(inside & same_class & (entries & 2 != 0),
+                                axis=1)
+
+    def _dedupe(self, games: np.ndarray) -> None:
+        """
+        Remove every player who can't act from the queues of games, along with
+        every entry of a player after their first, as
+        BattleQueue.dedupe_in_place() does.
+        """
+        rows = np.arange(games.size)
+        entries = self._queue[games]
+        columns = np.arange(entries.shape[1])
+        inside = (columns >= self._head[games, None]) & \
+            (columns < self._tail[games, None])
+        firsts, keeps = [], []
+        for player in range(2):
+            theirs = inside & ((entries & 1) == player)
+            firsts.append(theirs.argmax(axis=1))
+            keeps.append(theirs.any(axis=1) &
+                         (self.sps[games, player] >= self._min_costs[player]))
+        # The kept entries, in the order they were in the queue.
+        zero_first = ~keeps[1] | (keeps[0] & (firsts[0] < firsts[1]))
+        first = np.where(zero_first, entries[rows, firsts[0]],
+                         entries[rows, firsts[1]])
+        second = np.where(zero_first, entries[rows, firsts[1]],
+                          entries[rows, firsts[0]])
+        counts = keeps[0].astype(np.int64) + keeps[1]
+        heads = self._head[games]
+        self._queue[games, heads] = np.where(counts > 0, first,
+                                             self._queue[games, heads])
+        both = counts == 2
+        self._queue[games[both], heads[both] + 1] = second[both]
+        self._tail[games] = heads + counts
+
+    def _update_over(self, games: np.ndarray) -> None:
+        """
+        Work out whether each of games is over, and who won the ones that are,
+        as BattleQueue.is_over() and BattleQueue.get_winner() do.
+        """
+        self._clean(games)
+        hps = self.hps[games]
+        over = (self._head[games] >= self._tail[games]) | \
+            (hps[:, 0] == 0) | (hps[:, 1] == 0)
+        self.over[games] = over
+        self.winners[games] = np.where(
+            over & (hps[:, 0] == 0), 1,
+            np.where(over & (hps[:, 1] == 0), 0, -1))
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config='a2_pyta.txt')
@@ -0,0 +1,169 @@
+"""
+Unittests for the BatchSimulator for A2.
+
+The BatchSimulator re-implements the rules of the game on arrays, so these
+tests replay the actions it took through perform_attack() in a2_game.py and
+check that every turn ends the same way.
+"""
+import unittest
+
+import a2_game
+from a2_game import CHARACTER_CLASSES
+from a2_battle_queue import BattleQueue, RestrictedBattleQueue
+from a2_playstyle import Playstyle
+from a2_batch_simulator import BatchSimulator
+from a2_skill_decision_tree import create_default_tree
+
+
+class ReplayPlaystyle(Playstyle):
+    """
+    A Playstyle that picks the actions it's given, in order.
+    """
+
+    def __init__(self, battle_queue: 'BattleQueue', actions: list) -> None:
+        """
+        Initialize this ReplayPlaystyle to pick actions in order.
+        """
+        super().__init__(battle_queue)
+        self.is_manual = False
+        self.actions = actions
+
+    def select_attack(self, parameter=None) -> str:
+        """
+        Return the next action to pick.
+        """
+        return self.actions.pop(0)
+
+
+def set_up_game(queue_class, first, second, actions):
+    """
+    Set up a2_game for a game between a character of class first and one of
+    class second in a new queue_class, as set_up_game() does, with both
+    picking the actions in actions in order.
+    """
+    bq = queue_class()
+    p1 = first("P1", bq, ReplayPlaystyle(bq, actions))
+    p2 = second("P2", bq, ReplayPlaystyle(bq, actions))
+    for character in [p1, p2]:
+        if character.get_skill('A') is None:
+            character.set_skill_decision_tree(create_default_tree())
+    p1.enemy = p2
+    p2.enemy = p1
+    bq.add(p1)
+    bq.add(p2)
+    a2_game.BATTLE_QUEUE = bq
+    a2_game.P1 = p1
+    a2_game.P2 = p2
+    a2_game.GAME_IS_OVER = False
+    a2_game.GAME_WINNER = None
+
+
+class BatchSimulatorUnitTests(unittest.TestCase):
+    def assert_matches_perform_attack(self, queue_class, first, second,
+                                      games, seed):
+        """
+        Assert that every one of games the BatchSimulator plays at random,
+        with seed, between first and second goes the same way as
+        perform_attack() playing the same actions.
+        """
+        sim = BatchSimulator((first, second), games,
+                             restricted=queue_class == RestrictedBattleQueue,
+                             seed=seed, record=True)
+        turns = []
+        while sim.step():
+            turns.append((sim.hps.copy(), sim.sps.copy()))
+        turns.append((sim.hps.copy(), sim.sps.copy()))
+
+        for game in range(games):
+            actions = ['AS'[row[game]] for row in sim.actions
+                       if row[game] >= 0]
+            set_up_game(queue_class, first, second, actions[:])
+            for turn, action in enumerate(actions):
+                a2_game.perform_attack()
+                hps, sps = turns[turn]
+                expected = [[a2_game.P1.get_hp(), a2_game.P2.get_hp()],
+                            [a2_game.P1.get_sp(), a2_game.P2.get_sp()]]
+                actual = [hps[game].tolist(), sps[game].tolist()]
+                self.assertEqual(expected, actual,
+                                 ("After {} in {}, the BatchSimulator has " +
+                                  "HPs and SPs {} but perform_attack() " +
+                                  "gives {}.").format(actions[:turn + 1],
+                                                      a2_game.BATTLE_QUEUE,
+                                                      actual, expected))
+            self.assertTrue(a2_game.GAME_IS_OVER)
+            self.assertTrue(sim.over[game])
+            if a2_game.GAME_WINNER is None:
+                self.assertEqual(sim.winners[game], -1)
+            else:
+                winner = [a2_game.P1, a2_game.P2].index(a2_game.GAME_WINNER)
+                self.assertEqual(sim.winners[game], winner)
+            self.assertEqual(sim.turns[game], len(actions))
+
+    def test_matches_perform_attack(self):
+        """
+        Test to make sure every game the BatchSimulator plays at random goes
+        the same way as perform_attack() playing the same actions, for every
+        pair of characters and both kinds of BattleQueue.
+        """
+        for queue_class in [BattleQueue, RestrictedBattleQueue]:
+            for first in CHARACTER_CLASSES.values():
+                for second in CHARACTER_CLASSES.values():
+                    self.assert_matches_perform_attack(queue_class, first,
+                                                       second, 10, 148)
+
+    def test_restricted_same_class(self):
+        """
+        Test to make sure many games between two characters of the same class
+        on a RestrictedBattleQueue, where queues often empty out at the end
+        of their rows, go the same way as perform_attack().
+        """
+        for character in CHARACTER_CLASSES.values():
+            self.assert_matches_perform_attack(RestrictedBattleQueue,
+                                               character, character, 200, 1)
+
+    def test_queues_match_perform_attack(self):
+        """
+        Test to make sure the queues, and which entries are able to add, match
+        a RestrictedBattleQueue after every turn of a game between two
+        Vampires, whose special attack adds three entries.
+        """
+        vampire = CHARACTER_CLASSES['v']
+        sim = BatchSimulator((vampire, vampire), 1, restricted=True,
+                             policies=('special', 'random'), seed=148,
+                             record=True)
+        actions = []
+        orders = []
+        while sim.step():
+            actions.append('AS'[sim.actions[-1][0]])
+            orders.append((sim.get_order(0), sim.get_ables(0)))
+        set_up_game(RestrictedBattleQueue, vampire, vampire, actions[:])
+
+        for turn, expected in enumerate(orders):
+            a2_game.perform_attack()
+            key = a2_game.BATTLE_QUEUE.get_state_key()
+
+            self.assertEqual((list(key[3]), list(key[4])), expected,
+                             "After {}, the queues differ.".format(
+                                 actions[:turn + 1]))
+
+    def test_policies(self):
+        """
+        Test to make sure players with the attack policy only special attack
+        when they can't attack, and players with the special policy the other
+        way around.
+        """
+        rogue = CHARACTER_CLASSES['r']
+        sim = BatchSimulator((rogue, rogue), 5, policies=('attack',
+                                                          'special'),
+                             record=True)
+        sim.run()
+
+        self.assertEqual(sim.actions[0].tolist(), [0] * 5)
+        self.assertEqual(sim.actions[1].tolist(), [1] * 5)
+        for row in sim.actions:
+            self.assertEqual(len(set(row.tolist())), 1,
+                             "Games played by fixed policies differ.")
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
@@ -7,14 +7,22 @@ characters are going to attack.
 BattleQueue has been completed for you, and the class header for
 RestrictedBattleQueue has been provided. You must implement
 RestrictedBattleQueue and document it accordingly.
+
+RunLengthBattleQueue and RunLengthRestrictedBattleQueue behave the same as
+BattleQueue and RestrictedBattleQueue, but keep runs of the same entry as one
+(entry, count) pair, which suits games where characters add themselves many
+times in a row.
 """
 from typing import Union
+from a2_persistent_queue import PersistentQueue, RunLengthQueue
 
 
 class BattleQueue:
     """
     A class representing a BattleQueue.
     """
+    # The persistent queue class the contents are kept in.
+    _queue_class = PersistentQueue
 
     def __init__(self) -> None:
         """
@@ -24,9 +32,21 @@ class BattleQueue:
         >>> bq.is_empty()
         True
         """
-        self._content = []
+        # The entries of this BattleQueue: 0 for the first player and 1 for
+        # the second. The queue is persistent, so copies of this BattleQueue
+        # and undo_move() can share it.
+        self._content = self._queue_class()
         self._p1 = None
         self._p2 = None
+        self._undo_log = []
+        # Bumped whenever something changes that could change whether the
+        # character at the front can act or whether the game is over.
+        self._version = 0
+        # The _version at which the front was last cleaned, and at which
+        # is_over() and get_winner() were last worked out, with their results.
+        self._cleaned_version = -1
+        self._over_cache = (-1, None)
+        self._winner_cache = (-1, None)
 
     def _clean_queue(self) -> None:
         """
@@ -45,8 +65,35 @@ class BattleQueue:
         >>> bq.is_empty()
         False
         """
-        while self._content and self._content[0].get_available_actions() == []:
-            self._content.pop(0)
+        if self._cleaned_version == self._version:
+            return
+        while self._content and \
+                self._get_character(self._content.peek()) \
+                .get_available_actions() == []:
+            self._pop()
+        self._cleaned_version = self._version
+
+    def character_changed(self, character: 'Character') -> None:
+        """
+        Let this BattleQueue know that character's HP or SP changed, which may
+        change whether the character at its front can act and whether the
+        game is over.
+
+        >>> bq = BattleQueue()
+        >>> from a2_characters import Rogue
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> c = Rogue("Sophia", bq, ManualPlaystyle(bq))
+        >>> c2 = Rogue("Sophia", bq, ManualPlaystyle(bq))
+        >>> c.enemy = c2
+        >>> c2.enemy = c
+        >>> bq.add(c)
+        >>> bq.is_empty()
+        False
+        >>> c.set_sp(0)
+        >>> bq.is_empty()
+        True
+        """
+        self._version += 1
 
     def add(self, character: 'Character') -> None:
         """
@@ -63,12 +110,12 @@ class BattleQueue:
         >>> bq.is_empty()
         False
         """
-        self._content.append(character)
-
         if not self._p1:
             self._p1 = character
             self._p2 = character.enemy
 
+        self._push(character)
+
     def remove(self) -> 'Character':
         """
         Remove and return the character at the front of this BattleQueue.
@@ -88,7 +135,7 @@ class BattleQueue:
         """
         self._clean_queue()
 
-        return self._content.pop(0)
+        return self._pop()
 
     def is_empty(self) -> bool:
         """
@@ -101,7 +148,7 @@ class BattleQueue:
         """
         self._clean_queue()
 
-        return self._content == []
+        return not self._content
 
     def peek(self) -> 'Character':
         """
@@ -127,7 +174,7 @@ class BattleQueue:
         self._clean_queue()
 
         if self._content:
-            return self._content[0]
+            return self._get_character(self._content.peek())
 
         return self._p1
 
@@ -142,6 +189,8 @@ class BattleQueue:
             or
             - The BattleQueue is empty.
 
+        The answer is remembered until this BattleQueue or its players change.
+
         >>> bq = BattleQueue()
         >>> bq.is_over()
         True
@@ -155,19 +204,23 @@ class BattleQueue:
         >>> bq.is_over()
         False
         """
-        if self.is_empty():
-            return True
+        if self._over_cache[0] == self._version:
+            return self._over_cache[1]
 
-        if self._p1.get_hp() == 0 or self._p2.get_hp() == 0:
-            return True
+        over = self.is_empty() or \
+            self._p1.get_hp() == 0 or self._p2.get_hp() == 0
 
-        return False
+        # is_empty() may have cleaned the queue, so read _version afterwards.
+        self._over_cache = (self._version, over)
+        return over
 
     def get_winner(self) -> Union['Character', None]:
         """
         Return the winner of the game being carried out in this BattleQueue
         if the game is over. Otherwise, return None.
 
+        The answer is remembered until this BattleQueue or its players change.
+
         >>> bq = BattleQueue()
         >>> from a2_characters import Rogue
         >>> from a2_playstyle import ManualPlaystyle
@@ -178,21 +231,199 @@ class BattleQueue:
         >>> bq.add(c)
         >>> bq.get_winner()
         """
-        if not self.is_over():
-            return None
+        if self._winner_cache[0] == self._version:
+            return self._winner_cache[1]
 
-        if self._p1.get_hp() == 0:
-            return self._p2
-        elif self._p2.get_hp() == 0:
-            return self._p1
+        winner = None
+        if self.is_over():
+            if self._p1.get_hp() == 0:
+                winner = self._p2
+            elif self._p2.get_hp() == 0:
+                winner = self._p1
 
+        self._winner_cache = (self._version, winner)
+        return winner
+
+    def _get_character(self, entry: int) -> 'Character':
+        """
+        Return the character that entry of this BattleQueue stands for.
+        """
+        return self._p2 if entry & 1 else self._p1
+
+    def _get_side(self, character: 'Character') -> int:
+        """
+        Return 0 if character is the first player of this BattleQueue, or 1
+        if it's the second.
+        """
+        return 0 if character is self._p1 else 1
+
+    def _push(self, character: 'Character') -> None:
+        """
+        Append character to the back of this BattleQueue.
+        """
+        # Adding behind the front changes neither whether the front can act
+        # nor whether the game is over.
+        if not self._content:
+            self._version += 1
+        self._content = self._content.push(self._get_side(character))
+
+    def _pop(self) -> 'Character':
+        """
+        Remove and return the character at the front of this BattleQueue.
+        """
+        entry = self._content.peek()
+        self._content = self._content.pop()
+        self._version += 1
+        return self._get_character(entry)
+
+    def _save_flags(self) -> object:
+        """
+        Return any state of this BattleQueue, other than its contents, that
+        undo_move() needs to restore.
+        """
         return None
 
+    def _restore_flags(self, flags: object) -> None:
+        """
+        Restore the state saved by _save_flags().
+        """
+
+    def apply_move(self, action: str) -> None:
+        """
+        Make the next character in this BattleQueue perform action ('A' for
+        attack, 'S' for special attack), then remove them if they can still
+        act. Enough is recorded that undo_move() can reverse this exactly.
+
+        Moves can be nested: each undo_move() reverses the latest apply_move()
+        that hasn't been undone yet. Any cleaning of the queue done while a
+        move is applied is undone with it. Since the queue's contents are
+        persistent, remembering them before a move takes O(1) time.
+
+        >>> bq = BattleQueue()
+        >>> from a2_characters import Rogue
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> c = Rogue("r", bq, ManualPlaystyle(bq))
+        >>> c2 = Rogue("r2", bq, ManualPlaystyle(bq))
+        >>> c.enemy = c2
+        >>> c2.enemy = c
+        >>> bq.add(c)
+        >>> bq.add(c2)
+        >>> bq.apply_move('S')
+        >>> bq
+        r2 (Rogue): 90/100 -> r (Rogue): 100/90 -> r (Rogue): 100/90
+        >>> bq.apply_move('A')
+        >>> bq
+        r (Rogue): 95/90 -> r (Rogue): 95/90 -> r2 (Rogue): 90/97
+        >>> bq.undo_move()
+        >>> bq.undo_move()
+        >>> bq
+        r (Rogue): 100/100 -> r2 (Rogue): 100/100
+        """
+        self._undo_log.append((self._content, self._p1.save_state(),
+                               self._p2.save_state(), self._save_flags()))
+        if action == 'A':
+            self.peek().attack()
+        else:
+            self.peek().special_attack()
+        if self.peek().get_available_actions() != []:
+            self.remove()
+
+    def undo_move(self) -> None:
+        """
+        Reverse the latest apply_move() on this BattleQueue that hasn't been
+        undone yet.
+        """
+        self._content, p1_state, p2_state, flags = self._undo_log.pop()
+        self._version += 1
+        self._p1.restore_state(p1_state)
+        self._p2.restore_state(p2_state)
+        self._restore_flags(flags)
+
+    def get_state_key(self) -> tuple:
+        """
+        Return a hashable key that encodes the game being carried out in this
+        BattleQueue: the type of this BattleQueue, both players' types, HP and
+        SP, and the order of the characters in it (0 for the first player, 1
+        for the second).
+
+        Two BattleQueues with equal keys have the same outcome under
+        best play, so the key can be used to cache scores.
+
+        >>> bq = BattleQueue()
+        >>> from a2_characters import Rogue
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> c = Rogue("r", bq, ManualPlaystyle(bq))
+        >>> c2 = Rogue("r2", bq, ManualPlaystyle(bq))
+        >>> c.enemy = c2
+        >>> c2.enemy = c
+        >>> bq.add(c)
+        >>> bq.add(c2)
+        >>> bq.add(c)
+        >>> bq.get_state_key()[-1]
+        (0, 1, 0)
+        >>> bq.get_state_key() == bq.copy().get_state_key()
+        True
+        """
+        if not self._p1:
+            return type(self), None, None, ()
+
+        order = tuple(entry & 1 for entry in self._content)
+        return (type(self), self._p1.get_state_key(),
+                self._p2.get_state_key(), order)
+
+    def set_contents(self, p1: 'Character', p2: 'Character',
+                     order: tuple) -> None:
+        """
+        Replace the contents of this BattleQueue with p1 and p2 in the order
+        given by order, where 0 stands for p1 and 1 for p2. p1 becomes the
+        first player of this BattleQueue.
+
+        >>> bq = BattleQueue()
+        >>> from a2_characters import Rogue
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> c = Rogue("r", bq, ManualPlaystyle(bq))
+        >>> c2 = Rogue("r2", bq, ManualPlaystyle(bq))
+        >>> bq.set_contents(c, c2, (1, 0, 0))
+        >>> bq
+        r2 (Rogue): 100/100 -> r (Rogue): 100/100 -> r (Rogue): 100/100
+        """
+        self._p1 = p1
+        self._p2 = p2
+        self._content = self._queue_class(order)
+        self._version += 1
+
+    def dedupe_in_place(self) -> None:
+        """
+        Remove every character that can't act from this BattleQueue, along
+        with every entry of a character after its first, in a single pass.
+
+        >>> bq = BattleQueue()
+        >>> from a2_characters import Rogue
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> c = Rogue("r", bq, ManualPlaystyle(bq))
+        >>> c2 = Rogue("r2", bq, ManualPlaystyle(bq))
+        >>> bq.set_contents(c, c2, (1, 1, 0, 1, 0))
+        >>> bq.dedupe_in_place()
+        >>> bq
+        r2 (Rogue): 100/100 -> r (Rogue): 100/100
+        """
+        seen = set()
+        entries = []
+        for entry in self._content:
+            side = entry & 1
+            if side not in seen:
+                seen.add(side)
+                if self._get_character(entry).get_available_actions() != []:
+                    entries.append(entry)
+        self._content = self._queue_class(entries)
+        self._version += 1
+
     def copy(self) -> 'BattleQueue':
         """
         Return a copy of this BattleQueue. The copy contains copies of the
         characters inside this BattleQueue, so any changes that rely on
-        the copy do not affect this BattleQueue.
+        the copy do not affect this BattleQueue. The two BattleQueues share
+        their persistent contents, so copying takes O(1) time.
 
         >>> bq = BattleQueue()
         >>> from a2_characters import Rogue
@@ -210,22 +441,16 @@ class BattleQueue:
         >>> bq
         r (Rogue): 100/100 -> r2 (Rogue): 100/100
         """
-        new_battle_queue = BattleQueue()
+        new_battle_queue = type(self)()
 
         p1_copy = self._p1.copy(new_battle_queue)
         p2_copy = self._p2.copy(new_battle_queue)
         p1_copy.enemy = p2_copy
         p2_copy.enemy = p1_copy
 
-        new_battle_queue.add(p1_copy)
-        if not new_battle_queue.is_empty():
-            new_battle_queue.remove()
-
-        for character in self._content:
-            if character == self._p1:
-                new_battle_queue.add(p1_copy)
-            else:
-                new_battle_queue.add(p2_copy)
+        new_battle_queue._p1 = p1_copy
+        new_battle_queue._p2 = p2_copy
+        new_battle_queue._content = self._content
 
         return new_battle_queue
 
@@ -245,7 +470,28 @@ class BattleQueue:
         >>> bq
         r (Rogue): 100/100 -> r2 (Rogue): 100/100
         """
-        return " -> ".join([repr(character) for character in self._content])
+        return " -> ".join([repr(self._get_character(entry))
+                            for entry in self._content])
+
+    def _repr_runs(self) -> str:
+        """
+        Return a representation of this BattleQueue, which keeps its contents
+        in a RunLengthQueue, with each run of a character shown once with its
+        length.
+        """
+        runs = []
+        for entry, count in self._content.get_runs():
+            if runs and runs[-1][0] == entry & 1:
+                runs[-1][1] += count
+            else:
+                runs.append([entry & 1, count])
+        shown = []
+        for side, count in runs:
+            run = repr(self._get_character(side))
+            if count > 1:
+                run += " x {}".format(count)
+            shown.append(run)
+        return " -> ".join(shown)
 
 
 class RestrictedBattleQueue(BattleQueue):
@@ -282,6 +528,9 @@ class RestrictedBattleQueue(BattleQueue):
       then it would look like:
       Character order: A -> B -> A -> A
       Able to add:     Y    Y    N    Y
+    - A character added to an empty RestrictedBattleQueue is able to add,
+      since there's no one at the front doing the adding. This happens when a
+      Sorcerer's special attack drops every character who can't act.
     """
 
     def __init__(self) -> None:
@@ -289,7 +538,9 @@ class RestrictedBattleQueue(BattleQueue):
         Initializes a restricted battle queue.
         """
         super().__init__()
-        self._list_of_ables = []
+        # Entries also have 2 added to them if the character is able to add.
+        # _able_counts holds the number of entries of each player that are.
+        self._able_counts = (0, 0)
         self._first_time_p2 = True
 
     def _clean_queue(self) -> None:
@@ -309,23 +560,70 @@ class RestrictedBattleQueue(BattleQueue):
         >>> bq.is_empty()
         False
         """
-        while self._content and self._content[0].get_available_actions() == \
-                []:
-            self._content.pop(0)
-            self._list_of_ables.pop(0)
+        if self._cleaned_version == self._version:
+            return
+        while self._content and \
+                self._get_character(self._content.peek()) \
+                .get_available_actions() == []:
+            self._pop()
+        self._cleaned_version = self._version
+
+    def _push(self, character: 'Character', able: bool = True) -> None:
+        """
+        Append character, which is able to add if able is True, to the back of
+        this RestrictedBattleQueue.
+        """
+        if not self._content:
+            self._version += 1
+        side = self._get_side(character)
+        self._content = self._content.push(side + 2 * able)
+        if able:
+            self._count_able(side, 1)
+
+    def _count_able(self, side: int, change: int) -> None:
+        """
+        Add change to the number of entries of the player on side (0 or 1)
+        that are able to add.
+        """
+        if side:
+            self._able_counts = (self._able_counts[0],
+                                 self._able_counts[1] + change)
+        else:
+            self._able_counts = (self._able_counts[0] + change,
+                                 self._able_counts[1])
+
+    def _pop(self) -> 'Character':
+        """
+        Remove and return the character at the front of this
+        RestrictedBattleQueue.
+        """
+        entry = self._content.peek()
+        if entry & 2:
+            self._count_able(entry & 1, -1)
+        return super()._pop()
+
+    def _save_flags(self) -> object:
+        """
+        Return whether the second player has yet to be added and the counts
+        of entries able to add, which undo_move() needs to restore.
+        """
+        return self._first_time_p2, self._able_counts
+
+    def _restore_flags(self, flags: object) -> None:
+        """
+        Restore the state saved by _save_flags().
+        """
+        self._first_time_p2, self._able_counts = flags
 
     def find_num(self, character: 'Character') -> int:
         """
         Find number of occurences of character in current battle queue.
         """
-        list_of_index = []
-        for i in range(len(self._content)):
-            if type(self._content[i]) == type(character):
-                list_of_index.append(i)
         m = 0
-        for index in list_of_index:
-            if self._list_of_ables[index] == 'Y':
-                m += 1
+        if type(self._p1) == type(character):
+            m += self._able_counts[0]
+        if type(self._p2) == type(character):
+            m += self._able_counts[1]
         return m
 
     def add(self, character: 'Character') -> None:
@@ -344,26 +642,25 @@ class RestrictedBattleQueue(BattleQueue):
         False
         """
         if not self._p1:
-            self._content.append(character)
             self._p1 = character
             self._p2 = character.enemy
-            self._list_of_ables.append('Y')
+            self._push(character)
         elif self._first_time_p2:
-            self._content.append(character)
-            self._list_of_ables.append('Y')
+            self._push(character)
             self._first_time_p2 = False
-        elif self._list_of_ables[0] == 'Y':
+        elif not self._content:
+            # There's no one at the front doing the adding, so character is
+            # added as if it were the first time.
+            self._push(character)
+        elif self._content.peek() & 2:
             if type(character) != type(self.peek()):
-                self._list_of_ables.append('N')
-                self._content.append(character)
+                self._push(character, False)
             else:
                 i = self.find_num(character)
                 if i >= 2:
-                    self._list_of_ables.append('N')
-                    self._content.append(character)
+                    self._push(character, False)
                 else:
-                    self._list_of_ables.append('Y')
-                    self._content.append(character)
+                    self._push(character, True)
 
     def remove(self) -> 'Character':
         """
@@ -384,8 +681,48 @@ class RestrictedBattleQueue(BattleQueue):
         """
         self._clean_queue()
         if not self.is_empty():
-            self._list_of_ables.pop(0)
-            return self._content.pop(0)
+            return self._pop()
+
+    def set_contents(self, p1: 'Character', p2: 'Character', order: tuple,
+                     ables: tuple = None, first_time_p2: bool = False) -> None:
+        """
+        Replace the contents of this RestrictedBattleQueue with p1 and p2 in
+        the order given by order, where 0 stands for p1 and 1 for p2. ables
+        holds whether each of them is able to add; if it isn't given, they
+        all are. first_time_p2 is whether p2 has yet to be added for the first
+        time.
+        """
+        if not ables:
+            ables = [True] * len(order)
+        super().set_contents(p1, p2, [side + 2 * able
+                                      for side, able in zip(order, ables)])
+        self._able_counts = (0, 0)
+        for side, able in zip(order, ables):
+            if able:
+                self._count_able(side, 1)
+        self._first_time_p2 = first_time_p2
+
+    def dedupe_in_place(self) -> None:
+        """
+        Remove every character that can't act from this RestrictedBattleQueue,
+        along with every entry of a character after its first, in a single
+        pass. The entries that are kept keep their ability to add.
+
+        >>> bq = RestrictedBattleQueue()
+        >>> from a2_characters import Rogue
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> c = Rogue("r", bq, ManualPlaystyle(bq))
+        >>> c2 = Rogue("r2", bq, ManualPlaystyle(bq))
+        >>> bq.set_contents(c, c2, (1, 1, 0), (False, True, True))
+        >>> bq.dedupe_in_place()
+        >>> bq.get_state_key()[-3:]
+        ((1, 0), (False, True), False)
+        """
+        super().dedupe_in_place()
+        self._able_counts = (0, 0)
+        for entry in self._content:
+            if entry & 2:
+                self._count_able(entry & 1, 1)
 
     def copy(self) -> 'RestrictedBattleQueue':
         """
@@ -409,25 +746,94 @@ class RestrictedBattleQueue(BattleQueue):
         >>> bq
         r (Rogue): 100/100 -> r2 (Rogue): 100/100
         """
-        new_battle_queue = RestrictedBattleQueue()
+        new_battle_queue = type(self)()
         p1_copy = self._p1.copy(new_battle_queue)
         p2_copy = self._p2.copy(new_battle_queue)
         p1_copy.enemy = p2_copy
         p2_copy.enemy = p1_copy
-        new_battle_queue._list_of_ables = self._list_of_ables[:]
-        new_battle_queue._first_time_p2 = self._first_time_p2
-        new_battle_queue.add(p1_copy)
-        if not new_battle_queue.is_empty():
-            new_battle_queue.remove()
 
-        for character in self._content:
-            if character == self._p1:
-                new_battle_queue.add(p1_copy)
-            else:
-                new_battle_queue.add(p2_copy)
+        # Share the contents rather than adding to the copy, so that every
+        # character keeps the ability to add that it has in this queue.
+        new_battle_queue._p1 = p1_copy
+        new_battle_queue._p2 = p2_copy
+        new_battle_queue._first_time_p2 = self._first_time_p2
+        new_battle_queue._able_counts = self._able_counts
+        new_battle_queue._content = self._content
 
         return new_battle_queue
 
+    def get_state_key(self) -> tuple:
+        """
+        Return a hashable key that encodes the game being carried out in this
+        RestrictedBattleQueue. On top of BattleQueue's key, this includes
+        which characters are able to add.
+
+        >>> bq = RestrictedBattleQueue()
+        >>> from a2_characters import Rogue
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> c = Rogue("r", bq, ManualPlaystyle(bq))
+        >>> c2 = Rogue("r2", bq, ManualPlaystyle(bq))
+        >>> c.enemy = c2
+        >>> c2.enemy = c
+        >>> bq.add(c)
+        >>> bq.add(c2)
+        >>> bq.get_state_key()[-2:]
+        ((True, True), False)
+        """
+        return super().get_state_key() + (tuple(bool(entry & 2)
+                                                for entry in self._content),
+                                          self._first_time_p2)
+
+
+class RunLengthBattleQueue(BattleQueue):
+    """
+    A class representing a BattleQueue whose contents are kept as runs of
+    the same entry, so that copying, adding, removing and representing it
+    scale with the number of runs rather than the number of entries.
+    """
+    _queue_class = RunLengthQueue
+
+    def __repr__(self) -> str:
+        """
+        Return a representation of this RunLengthBattleQueue, with each run of
+        a character shown once.
+
+        >>> bq = RunLengthBattleQueue()
+        >>> from a2_characters import Rogue
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> c = Rogue("r", bq, ManualPlaystyle(bq))
+        >>> c2 = Rogue("r2", bq, ManualPlaystyle(bq))
+        >>> bq.set_contents(c, c2, (0, 0, 0, 1))
+        >>> bq
+        r (Rogue): 100/100 x 3 -> r2 (Rogue): 100/100
+        """
+        return self._repr_runs()
+
+
+class RunLengthRestrictedBattleQueue(RestrictedBattleQueue):
+    """
+    A class representing a RestrictedBattleQueue whose contents are kept as
+    runs of the same entry, where an entry records both the character and
+    whether it's able to add.
+    """
+    _queue_class = RunLengthQueue
+
+    def __repr__(self) -> str:
+        """
+        Return a representation of this RunLengthRestrictedBattleQueue, with
+        each run of a character shown once.
+
+        >>> bq = RunLengthRestrictedBattleQueue()
+        >>> from a2_characters import Rogue
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> c = Rogue("r", bq, ManualPlaystyle(bq))
+        >>> c2 = Rogue("r2", bq, ManualPlaystyle(bq))
+        >>> bq.set_contents(c, c2, (1, 0, 0), (True, True, False))
+        >>> bq
+        r2 (Rogue): 100/100 -> r (Rogue): 100/100 x 2
+        """
+        return self._repr_runs()
+
 
 if __name__ == '__main__':
     import python_ta
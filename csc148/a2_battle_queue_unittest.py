@@ -0,0 +1,179 @@
+"""
+Unittests for the BattleQueue for A2.
+"""
+import random
+import unittest
+from unittest import mock
+
+from a2_game import CHARACTER_CLASSES
+from a2_playstyle import ManualPlaystyle
+from a2_battle_queue import BattleQueue, RestrictedBattleQueue, \
+    RunLengthBattleQueue, RunLengthRestrictedBattleQueue
+MageConstructor = CHARACTER_CLASSES['m']
+RogueConstructor = CHARACTER_CLASSES['r']
+
+
+class BattleQueueUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up one of each kind of BattleQueue, each containing a Rogue and a
+        Mage, and counts calls to get_available_actions.
+        """
+        self.calls = 0
+        for character_class in [RogueConstructor, MageConstructor]:
+            original = character_class.get_available_actions
+
+            def counting(character, original=original):
+                self.calls += 1
+                return original(character)
+            patcher = mock.patch.object(character_class,
+                                        'get_available_actions', counting)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.battle_queues = []
+        for queue_class in [BattleQueue, RestrictedBattleQueue,
+                            RunLengthBattleQueue,
+                            RunLengthRestrictedBattleQueue]:
+            bq = queue_class()
+            p1 = RogueConstructor("R", bq, ManualPlaystyle(bq))
+            p2 = MageConstructor("M", bq, ManualPlaystyle(bq))
+            p1.enemy = p2
+            p2.enemy = p1
+            bq.add(p1)
+            bq.add(p2)
+            self.battle_queues.append(bq)
+
+    def test_repeated_peek_is_cached(self):
+        """
+        Test to make sure peek, is_empty and is_over only check the front
+        character once between changes to the queue.
+        """
+        for bq in self.battle_queues:
+            bq.peek()
+            self.calls = 0
+            for _ in range(10):
+                bq.peek()
+                bq.is_empty()
+                bq.is_over()
+
+            self.assertEqual(self.calls, 0,
+                             ("Checking an unchanged {} called " +
+                              "get_available_actions {} " +
+                              "times.").format(type(bq).__name__, self.calls))
+
+    def test_sp_change_cleans_again(self):
+        """
+        Test to make sure the front character is removed once it can no longer
+        act, even though the queue itself didn't change.
+        """
+        for bq in self.battle_queues:
+            front = bq.peek()
+            front.set_sp(0)
+
+            self.assertIsNot(front, bq.peek(),
+                             ("A character with no SP is still at the " +
+                              "front of the {}:\n{}").format(
+                                  type(bq).__name__, bq))
+
+    def test_undo_cleans_again(self):
+        """
+        Test to make sure undo_move restores the front character even after
+        the queue was cleaned.
+        """
+        for bq in self.battle_queues:
+            front = bq.peek()
+            before = bq.get_state_key()
+            bq.apply_move('S')
+            bq.peek()
+            bq.undo_move()
+
+            self.assertIs(front, bq.peek())
+            self.assertEqual(before, bq.get_state_key())
+
+    def test_copies_are_independent(self):
+        """
+        Test to make sure a copy, which shares its contents with the original,
+        isn't changed by adding to or removing from the original, and the
+        other way around.
+        """
+        for bq in self.battle_queues:
+            for _ in range(20):
+                bq.add(bq.peek())
+            before = repr(bq)
+            copy = bq.copy()
+            bq.remove()
+            bq.add(bq.peek().enemy)
+            after = repr(bq)
+
+            self.assertEqual(before, repr(copy))
+
+            copy.apply_move('A')
+
+            self.assertNotEqual(before, after)
+            self.assertEqual(after, repr(bq))
+
+    def test_is_over_is_cached(self):
+        """
+        Test to make sure is_over and get_winner are only worked out again
+        after the queue or its characters change.
+        """
+        for bq in self.battle_queues:
+            bq.is_over()
+            self.calls = 0
+            for _ in range(10):
+                self.assertFalse(bq.is_over())
+                self.assertIsNone(bq.get_winner())
+
+            self.assertEqual(self.calls, 0)
+
+            loser = bq.peek().enemy
+            loser.set_hp(0)
+
+            self.assertTrue(bq.is_over())
+            self.assertIs(bq.get_winner(), loser.enemy)
+
+            loser.set_hp(10)
+
+            self.assertFalse(bq.is_over())
+            self.assertIsNone(bq.get_winner())
+
+    def test_run_length_matches_plain(self):
+        """
+        Test to make sure the run-length BattleQueues stay in step with the
+        plain ones over random games, with moves undone along the way.
+        """
+        rng = random.Random(148)
+        pairs = [(BattleQueue, RunLengthBattleQueue),
+                 (RestrictedBattleQueue, RunLengthRestrictedBattleQueue)]
+        for plain_class, run_length_class in pairs:
+            for _ in range(20):
+                plain = plain_class()
+                run_length = run_length_class()
+                for bq in [plain, run_length]:
+                    p1 = RogueConstructor("R", bq, ManualPlaystyle(bq))
+                    p2 = MageConstructor("M", bq, ManualPlaystyle(bq))
+                    p1.enemy = p2
+                    p2.enemy = p1
+                    bq.add(p1)
+                    bq.add(p2)
+                steps = 0
+                while not plain.is_over():
+                    self.assertEqual(plain.get_state_key()[1:],
+                                     run_length.get_state_key()[1:],
+                                     ("The run-length queue:\n{}\nis out " +
+                                      "of step with the plain one:\n" +
+                                      "{}").format(run_length, plain))
+                    action = rng.choice(plain.peek().get_available_actions())
+                    plain.apply_move(action)
+                    run_length.apply_move(action)
+                    steps += 1
+                    if steps % 5 == 0:
+                        plain.undo_move()
+                        run_length.undo_move()
+                self.assertTrue(run_length.is_over())
+                self.assertIs(type(run_length.get_winner()),
+                              type(plain.get_winner()))
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
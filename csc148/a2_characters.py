@@ -23,9 +23,19 @@ class Character:
     battle_queue - the BattleQueue that this Character will add to.
     playstyle - the Playstyle that this Character uses to pick actions.
     enemy - the Character that this Character attacks.
+
+    Only what changes during a game is stored on each Character. The type,
+    defense and skills are the same for every Character of a class, so they
+    are class attributes; skills hold no state, so every Character of a class
+    shares one instance of each.
     """
+    __slots__ = ['_name', 'battle_queue', 'playstyle', 'enemy', '_hp', '_sp',
+                 '_current_state', '_current_frame']
     battle_queue: 'BattleQueue'
     playstyle: 'Playstyle'
+    _character_type = ''
+    _defense = 0
+    _skills = {'A': None, 'S': None}
 
     def __init__(self, name: str, bq: 'BattleQueue', ps: 'Playstyle') -> None:
         """
@@ -37,15 +47,11 @@ class Character:
         self.playstyle = ps
         self._hp = 100
         self._sp = 100
-        self._defense = 0
         self.enemy = None
 
-        self._character_type = ''
         self._current_state = 'idle'
         self._current_frame = 0
 
-        self._skills = {'A': None, 'S': None}
-
     def get_name(self) -> str:
         """
         Return the name of this Character.
@@ -64,6 +70,22 @@ class Character:
         """
         return self._sp
 
+    def get_defense(self) -> int:
+        """
+        Return the defense of this Character, which is subtracted from all
+        damage it takes.
+        """
+        return self._defense
+
+    def get_skill(self, action: str) -> 'Skill':
+        """
+        Return the Skill this Character uses for action, or None if there
+        isn't one.
+        'A' corresponds to the skill used by attack().
+        'S' corresponds to the skill used by special_attack().
+        """
+        return self._skills.get(action)
+
     def get_next_sprite(self) -> str:
         """
         Return the next sprite that needs to be drawn for this Character.
@@ -127,6 +149,7 @@ class Character:
         Reduce this Character's SP by cost.
         """
         self._sp -= cost
+        self._notify()
 
     def apply_damage(self, damage: int) -> None:
         """
@@ -136,18 +159,28 @@ class Character:
         damage -= self._defense
         self._hp -= damage
         self._hp = max(self._hp, 0)
+        self._notify()
 
     def set_sp(self, new_sp: int) -> None:
         """
         Sets this Character's SP to new_sp.
         """
         self._sp = new_sp
+        self._notify()
 
     def set_hp(self, new_hp: int) -> None:
         """
         Sets this Character's HP to new_hp.
         """
         self._hp = new_hp
+        self._notify()
+
+    def _notify(self) -> None:
+        """
+        Let this Character's BattleQueue know that its HP or SP changed.
+        """
+        if self.battle_queue is not None:
+            self.battle_queue.character_changed(self)
 
     def __repr__(self):
         """
@@ -159,18 +192,50 @@ class Character:
         return "{} ({}): {}/{}".format(self._name, class_name, self._hp,
                                        self._sp)
 
+    def save_state(self) -> tuple:
+        """
+        Return a snapshot of everything a move can change about this
+        Character: its HP, SP and animation state.
+        """
+        return self._hp, self._sp, self._current_state, self._current_frame
+
+    def restore_state(self, state: tuple) -> None:
+        """
+        Restore this Character to the snapshot state returned by save_state().
+        """
+        self._hp, self._sp, self._current_state, self._current_frame = state
+        self._notify()
+
+    def get_state_key(self) -> tuple:
+        """
+        Return a hashable key describing everything about this Character that
+        matters to the outcome of a game: its type, HP and SP.
+        """
+        return type(self), self._hp, self._sp
+
     def copy(self, new_battle_queue: 'BattleQueue') -> 'Character':
         """
         Return a copy of this Character whose BattleQueue is new_battle_queue.
         """
         raise NotImplementedError
 
-    def _set_copy_attributes(self, other: 'Character') -> None:
-        """
-        Set other's attributes to match this Character's.
-        """
-        other.set_hp(self._hp)
-        other.set_sp(self._sp)
+    def _make_copy(self, new_battle_queue: 'BattleQueue') -> 'Character':
+        """
+        Return a Character of the same class as this one, with the same name,
+        HP and SP, whose BattleQueue is new_battle_queue. The copy is built
+        without calling __init__, since everything else about it is shared by
+        its class.
+        """
+        copy = type(self).__new__(type(self))
+        copy._name = self._name
+        copy.battle_queue = new_battle_queue
+        copy.playstyle = self.playstyle.copy(new_battle_queue)
+        copy.enemy = None
+        copy._hp = self._hp
+        copy._sp = self._sp
+        copy._current_state = 'idle'
+        copy._current_frame = 0
+        return copy
 
 
 class Mage(Character):
@@ -181,8 +246,12 @@ class Mage(Character):
     playstyle - the Playstyle that this Mage uses to pick actions.
     enemy - the Mage that this Mage attacks.
     """
+    __slots__ = []
     battle_queue: 'BattleQueue'
     playstyle: 'Playstyle'
+    _character_type = 'mage'
+    _defense = 8
+    _skills = {'A': MageAttack(), 'S': MageSpecial()}
 
     def __init__(self, name: str, bq: 'BattleQueue', ps: 'Playstyle') -> None:
         """
@@ -200,10 +269,6 @@ class Mage(Character):
         m (Mage): 100/100
         """
         super().__init__(name, bq, ps)
-        self._character_type = 'mage'
-        self._skills['A'] = MageAttack()
-        self._skills['S'] = MageSpecial()
-        self._defense = 8
 
     def copy(self, new_battle_queue: 'BattleQueue') -> 'Mage':
         """
@@ -233,10 +298,7 @@ class Mage(Character):
         >>> c2_copy
         m2 (Mage): 88/100
         """
-        copy = Mage(self._name, new_battle_queue,
-                    self.playstyle.copy(new_battle_queue))
-        self._set_copy_attributes(copy)
-        return copy
+        return self._make_copy(new_battle_queue)
 
 
 class Rogue(Character):
@@ -247,8 +309,12 @@ class Rogue(Character):
     playstyle - the Playstyle that this Rogue uses to pick actions.
     enemy - the Rogue that this Rogue attacks.
     """
+    __slots__ = []
     battle_queue: 'BattleQueue'
     playstyle: 'Playstyle'
+    _character_type = 'rogue'
+    _defense = 10
+    _skills = {'A': RogueAttack(), 'S': RogueSpecial()}
 
     def __init__(self, name: str, bq: 'BattleQueue', ps: 'Playstyle') -> None:
         """
@@ -266,10 +332,6 @@ class Rogue(Character):
         r (Rogue): 100/100
         """
         super().__init__(name, bq, ps)
-        self._character_type = 'rogue'
-        self._skills['A'] = RogueAttack()
-        self._skills['S'] = RogueSpecial()
-        self._defense = 10
 
     def copy(self, new_battle_queue: 'BattleQueue') -> 'Rogue':
         """
@@ -299,10 +361,7 @@ class Rogue(Character):
         >>> c2_copy
         r2 (Rogue): 95/100
         """
-        copy = Rogue(self._name, new_battle_queue,
-                     self.playstyle.copy(new_battle_queue))
-        self._set_copy_attributes(copy)
-        return copy
+        return self._make_copy(new_battle_queue)
 
 
 # Implement your Vampire and Sorcerer classes
@@ -310,16 +369,16 @@ class Vampire(Character):
     """
     A class representing vampires.
     """
+    __slots__ = []
+    _character_type = 'vampire'
+    _defense = 3
+    _skills = {'A': VampireAttack(), 'S': VampireSpecial()}
 
     def __init__(self, name: str, bq: 'BattleQueue', ps: 'Playstyle') -> None:
         """
         Initializes a Vampire with name name, battlequeue bq and playstyle ps.
         """
         super().__init__(name, bq, ps)
-        self._character_type = 'vampire'
-        self._defense = 3
-        self._skills['A'] = VampireAttack()
-        self._skills['S'] = VampireSpecial()
 
     def copy(self, new_battle_queue: 'BattleQueue') -> 'Vampire':
         """
@@ -329,33 +388,34 @@ class Vampire(Character):
         >>> from a2_battle_queue import BattleQueue
         >>> from a1_playstyle import ManualPlaystyle
         >>> bq = BattleQueue()
-        >>> new_bq = BattleQueue
+        >>> new_bq = BattleQueue()
         >>> v = Vampire('v', bq, ManualPlaystyle(bq))
         >>> v2 = v.copy(new_bq)
         >>> v2
         v (Vampire): 100/100
         """
-        copy = Vampire(self._name, new_battle_queue,
-                       self.playstyle.copy(new_battle_queue))
-        self._set_copy_attributes(copy)
-        return copy
+        return self._make_copy(new_battle_queue)
 
 
 class Sorcerer(Character):
     """
     A class representing sorcerers.
+
+    A Sorcerer's attack skill is picked by its skill decision tree, so unlike
+    its special skill it's kept on each Sorcerer.
     """
+    __slots__ = ['_sdt', '_attack_skill']
+    _character_type = 'sorcerer'
+    _defense = 10
+    _skills = {'A': None, 'S': SorcererSpecial()}
 
     def __init__(self, name: str, bq: 'BattleQueue', ps: 'Playstyle') -> None:
         """
         Initializes a sorcerer with name name, battlequeue bq, and playstyle ps.
         """
         super().__init__(name, bq, ps)
-        self._character_type = 'sorcerer'
-        self._defense = 10
-        self._skills['S'] = SorcererSpecial()
-        self._skills['A'] = None
         self._sdt = None
+        self._attack_skill = None
 
     def set_skill_decision_tree(self, sdt: 'SkillDecisionTree') -> None:
         """
@@ -363,6 +423,40 @@ class Sorcerer(Character):
         """
         self._sdt = sdt
 
+    def get_skill(self, action: str) -> 'Skill':
+        """
+        Return the Skill this Sorcerer uses for action, or None if there
+        isn't one. For 'A', this is the skill its skill decision tree picked
+        last, or None if it hasn't picked one yet.
+
+        >>> from a2_battle_queue import BattleQueue
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> bq = BattleQueue()
+        >>> s = Sorcerer('s', bq, ManualPlaystyle(bq))
+        >>> s.get_skill('A') is None
+        True
+        >>> s.get_skill('S').get_sp_cost()
+        20
+        """
+        if action == 'A':
+            return self._attack_skill
+        return super().get_skill(action)
+
+    def get_state_key(self) -> tuple:
+        """
+        Return a hashable key describing everything about this Sorcerer that
+        matters to the outcome of a game. This includes the Sorcerer's skill
+        decision tree, since it decides which skill attack() uses.
+
+        >>> from a2_battle_queue import BattleQueue
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> bq = BattleQueue()
+        >>> s = Sorcerer('s', bq, ManualPlaystyle(bq))
+        >>> s.get_state_key() == (Sorcerer, 100, 100, None)
+        True
+        """
+        return super().get_state_key() + (self._sdt,)
+
     def get_available_actions(self) -> List[str]:
         """
         Return a list of all actions that this Character can perform.
@@ -378,7 +472,7 @@ class Sorcerer(Character):
         ['A', 'S']
         """
         available = []
-        self._skills['A'] = self._sdt.pick_skill(self, self.enemy)
+        self._attack_skill = self._sdt.pick_skill(self, self.enemy)
 
         for skill in self._skills:
             if self.is_valid_action(skill):
@@ -430,8 +524,8 @@ class Sorcerer(Character):
         self._current_state = 'attack'
         current_sp = self.get_sp()
         self.set_sp(current_sp + 50)
-        self._skills['A'] = self._sdt.pick_skill(self, self.enemy)
-        self._skills['A'].use(self, self.enemy)
+        self._attack_skill = self._sdt.pick_skill(self, self.enemy)
+        self._attack_skill.use(self, self.enemy)
         self.set_sp(current_sp - 15)
 
     def copy(self, new_battle_queue: 'BattleQueue') -> 'Sorcerer':
@@ -442,16 +536,15 @@ class Sorcerer(Character):
         >>> from a2_battle_queue import BattleQueue
         >>> from a1_playstyle import ManualPlaystyle
         >>> bq = BattleQueue()
-        >>> new_bq = BattleQueue
+        >>> new_bq = BattleQueue()
         >>> s = Sorcerer('s', bq, ManualPlaystyle(bq))
         >>> s2 = s.copy(new_bq)
         >>> s2
         s (Sorcerer): 100/100
         """
-        copy = Sorcerer(self._name, new_battle_queue,
-                        self.playstyle.copy(new_battle_queue))
-        self._set_copy_attributes(copy)
+        copy = self._make_copy(new_battle_queue)
         copy._sdt = self._sdt
+        copy._attack_skill = None
         return copy
 
 
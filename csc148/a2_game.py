@@ -9,9 +9,12 @@ Do NOT run PythonTA on this file.
 We will not grade the documentation of this file.
 """
 # Import classes as needed
-from a2_battle_queue import BattleQueue, RestrictedBattleQueue
+import threading
+from a2_battle_queue import BattleQueue, RestrictedBattleQueue, \
+    RunLengthBattleQueue, RunLengthRestrictedBattleQueue
 from a2_playstyle import ManualPlaystyle, RandomPlaystyle, RecursiveMinimax, \
-    IterativeMinimax
+    IterativeMinimax, AlphaBetaMinimax, TablebasePlaystyle, ParallelMinimax, \
+    IterativeDeepeningMinimax, MCTSPlaystyle
 from a2_characters import Mage, Rogue, Vampire, Sorcerer
 from a2_skill_decision_tree import create_default_tree
 
@@ -27,15 +30,34 @@ CHARACTER_CLASSES = {'m': Mage,
 # Replace None with the name of your Playstyle classes
 # mr should map to your class for your recursive minimax playstyle
 # mi should map to your class for your iterative minimax playstyle
+# ab maps to minimax with alpha-beta pruning
+# tb maps to looking attacks up in the tablebase built by a2_tablebase.py
+# mp maps to minimax that searches in parallel processes
+# mt maps to minimax that searches as deep as a per-move time budget allows
+# mc maps to Monte Carlo tree search
 PLAYSTYLE_CLASSES = {'m': ManualPlaystyle,
                      'r': RandomPlaystyle,
                      'mr': RecursiveMinimax,
-                     'mi': IterativeMinimax}
-
+                     'mi': IterativeMinimax,
+                     'ab': AlphaBetaMinimax,
+                     'tb': TablebasePlaystyle,
+                     'mp': ParallelMinimax,
+                     'mt': IterativeDeepeningMinimax,
+                     'mc': MCTSPlaystyle}
+
+# nl and rl map to the same BattleQueues, kept as runs of the same character
 BATTLE_QUEUE_CLASSES = {'n': BattleQueue,
-                        'r': RestrictedBattleQueue
+                        'r': RestrictedBattleQueue,
+                        'nl': RunLengthBattleQueue,
+                        'rl': RunLengthRestrictedBattleQueue
                         }
 
+# Held by MoveSearches and Ponders while their playstyles search. The minimax
+# playstyles share tables that aren't safe to use from two threads at once,
+# and a cancelled search keeps running until its playstyle returns, so only
+# one search may run at a time.
+SEARCH_LOCK = threading.Lock()
+
 # Do not change any of the code below
 # You may NOT use or modify any of the variables defined below within your code
 # they're only to be used by a1_game.py and a1_ui.py.
@@ -47,6 +69,8 @@ P1 = None
 P2 = None
 GAME_IS_OVER = False
 GAME_WINNER = None
+SEARCH = None
+PONDER = None
 
 def perform_attack():
     """
@@ -86,6 +110,268 @@ def perform_attack():
     # should return None. Otherwise, it should return the character that won.
     GAME_WINNER = BATTLE_QUEUE.get_winner()
 
+def start_search():
+    """
+    Starts searching for the next character's attack in the background, if
+    their playstyle isn't manual and a search isn't already running.
+    """
+    global BATTLE_QUEUE, SEARCH, PONDER
+
+    if SEARCH is None and not BATTLE_QUEUE.peek().playstyle.is_manual:
+        SEARCH = MoveSearch(BATTLE_QUEUE, PONDER)
+        PONDER = None
+
+def start_pondering():
+    """
+    Starts searching in the background for the replies to each attack the
+    next character could make, if their playstyle is manual and their
+    enemy's playstyle can ponder, so the reply is ready once they attack.
+    """
+    global BATTLE_QUEUE, PONDER
+
+    next_character = BATTLE_QUEUE.peek()
+    if not next_character.playstyle.is_manual or \
+            not next_character.enemy.playstyle.can_ponder:
+        return
+    key = BATTLE_QUEUE.get_state_key()
+    if PONDER is not None and PONDER.key != key:
+        PONDER.cancel()
+        PONDER = None
+    if PONDER is None:
+        PONDER = Ponder(BATTLE_QUEUE)
+
+def poll_attack():
+    """
+    Performs the attack found by the search started by start_search(), if it
+    has finished. Returns whether an attack was performed.
+    """
+    global BATTLE_QUEUE, GAME_IS_OVER, GAME_WINNER, SEARCH
+
+    if SEARCH is None or not SEARCH.is_done():
+        return False
+    move_to_make = SEARCH.get_move()
+    SEARCH = None
+    make_move(BATTLE_QUEUE, move_to_make)
+
+    GAME_IS_OVER = BATTLE_QUEUE.is_over()
+    GAME_WINNER = BATTLE_QUEUE.get_winner()
+    return True
+
+def cancel_search():
+    """
+    Cancels the search started by start_search(), if one is running, and
+    shuts down anything the characters' playstyles started, such as worker
+    processes. Call this before closing the game.
+    """
+    global P1, P2, SEARCH, PONDER
+
+    for search in [SEARCH, PONDER]:
+        if search is not None:
+            search.cancel()
+    SEARCH = None
+    PONDER = None
+    for character in [P1, P2]:
+        if character is not None and hasattr(character.playstyle, 'close'):
+            character.playstyle.close()
+
+class MoveSearch:
+    """
+    A search for the attack of the next character in a BattleQueue, made by
+    their playstyle in a background thread so that the UI keeps responding.
+
+    The playstyle reads the BattleQueue while it searches, so the BattleQueue
+    mustn't change until the search is done.
+
+    If a Ponder has already found the attack, it's used instead of searching.
+    """
+
+    def __init__(self, battle_queue, ponder=None):
+        """
+        Starts searching for the attack of the next character in
+        battle_queue, unless ponder, a Ponder, has found it.
+        """
+        self.battle_queue = battle_queue
+        self._ponder = ponder
+        self._move = None
+        self._error = None
+        self._cancelled = False
+        self._done = threading.Event()
+        # A daemon thread, so a search that's still running when the game is
+        # closed doesn't stop Python from exiting.
+        self._thread = threading.Thread(target=self._search, daemon=True)
+        self._thread.start()
+
+    def _search(self):
+        """
+        Asks the next character's playstyle for their attack, keeping
+        whatever it returns or raises.
+        """
+        try:
+            if self._ponder is not None:
+                # Let the Ponder finish the reply it's searching for, in case
+                # it's this one, but don't let it start on any others
+                self._ponder.cancel()
+                self._ponder.wait()
+                self._move = self._ponder.get_move(self.battle_queue)
+            if self._move is None:
+                with SEARCH_LOCK:
+                    self._move = \
+                        self.battle_queue.peek().playstyle.select_attack()
+        except Exception as error:
+            self._error = error
+        finally:
+            self._done.set()
+
+    def is_done(self):
+        """
+        Returns whether the search has finished, or been cancelled.
+        """
+        return self._cancelled or self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Waits up to timeout seconds, or forever if timeout is None, for the
+        search to finish. Returns whether it has.
+        """
+        return self._done.wait(timeout)
+
+    def get_move(self):
+        """
+        Returns the attack the search found, or None if it hasn't finished or
+        was cancelled. Raises whatever the playstyle raised, if it did.
+        """
+        if self._cancelled or not self._done.is_set():
+            return None
+        if self._error is not None:
+            raise self._error
+        return self._move
+
+    def cancel(self):
+        """
+        Cancels the search, so that whatever it finds is ignored. The thread
+        can't be stopped, so it runs until the playstyle returns, and later
+        searches wait for it, but it won't keep Python from exiting.
+        """
+        self._cancelled = True
+
+class Ponder:
+    """
+    A search for the replies to each attack the next character in a
+    BattleQueue could make, made in a background thread while they pick
+    theirs. Each reply is found by the enemy's playstyle on a copy of the
+    BattleQueue the attack leads to.
+
+    key - the state key of the BattleQueue the replies are searched from.
+    """
+
+    def __init__(self, battle_queue):
+        """
+        Starts searching for the replies to each attack the next character in
+        battle_queue could make.
+        """
+        self.key = battle_queue.get_state_key()
+        self._moves = {}
+        self._cancelled = False
+        # Copied here, so the BattleQueue can change while this searches
+        self._battle_queue = battle_queue.copy()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._search, daemon=True)
+        self._thread.start()
+
+    def _search(self):
+        """
+        Finds the reply to each attack the next character could make, until
+        cancelled.
+        """
+        try:
+            for action in self._battle_queue.peek().get_available_actions():
+                with SEARCH_LOCK:
+                    if self._cancelled:
+                        break
+                    battle_queue = self._battle_queue.copy()
+                    make_move(battle_queue, action)
+                    if battle_queue.is_over():
+                        continue
+                    playstyle = battle_queue.peek().playstyle
+                    if not playstyle.is_manual and playstyle.can_ponder:
+                        self._moves[battle_queue.get_state_key()] = \
+                            playstyle.select_attack()
+                    if hasattr(playstyle, 'close'):
+                        playstyle.close()
+        finally:
+            self._done.set()
+
+    def is_done(self):
+        """
+        Returns whether every reply has been found, or the search has stopped
+        after being cancelled.
+        """
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Waits up to timeout seconds, or forever if timeout is None, for the
+        search to stop. Returns whether it has.
+        """
+        return self._done.wait(timeout)
+
+    def get_move(self, battle_queue):
+        """
+        Returns the reply found for the next character in battle_queue, or
+        None if one wasn't found.
+        """
+        return self._moves.get(battle_queue.get_state_key())
+
+    def cancel(self):
+        """
+        Stops the search once it has found the reply it's searching for.
+        """
+        self._cancelled = True
+
+def play_turn(battle_queue, key_pressed=None):
+    """
+    Uses the next character in battle_queue's playstyle to decide on and
+    perform an attack, and returns the move it picked. A manual playstyle
+    picks its move from key_pressed.
+
+    Unlike perform_attack(), this doesn't use the variables above, so it can
+    play games without the UI.
+    """
+    # Get the next character in the battle queue, but don't remove them.
+    next_character = battle_queue.peek()
+    playstyle = next_character.playstyle
+
+    # Uses the next character's playstyle to select an attack
+    if playstyle.is_manual:
+        move_to_make = playstyle.select_attack(key_pressed)
+    else:
+        move_to_make = playstyle.select_attack()
+
+    make_move(battle_queue, move_to_make)
+    return move_to_make
+
+def make_move(battle_queue, move_to_make):
+    """
+    Makes the next character in battle_queue perform move_to_make, if it's
+    valid.
+    """
+    next_character = battle_queue.peek()
+
+    # Check if the next_character can make that action ('A' represents
+    # a normal attack, 'S' represents a special attack.)
+    # If a move that is not 'A' or 'S' is passed in, this should return False.
+    if next_character.is_valid_action(move_to_make):
+        if move_to_make == 'A':
+            next_character.attack()
+        else:
+            next_character.special_attack()
+
+        # Call remove() to remove the next_character from the battle_queue
+        # (if they still have SP; otherwise the next call to remove()
+        # should skip them)
+        if next_character.get_available_actions() != []:
+            battle_queue.remove()
+
 def set_up_game():
     """
     Sets up the battle queue and characters for the game.
@@ -96,9 +382,8 @@ def set_up_game():
     bq = ''
     while bq not in list(BATTLE_QUEUE_CLASSES.keys()):
         bq = input("Select a Battle Queue type (n for a Normal Battle Queue, " +
-                   "r for a Restricted Battle Queue): ").strip()
-
-    BATTLE_QUEUE = BATTLE_QUEUE_CLASSES[bq]()
+                   "r for a Restricted Battle Queue, nl or rl for either " +
+                   "kept as runs): ").strip()
 
     # Get the parameters for the first character
     player_1 = ''
@@ -115,7 +400,12 @@ def set_up_game():
         player_1_playstyle = input("Select a playstyle for the first " +
                                    "character (m for Manual, r for Random, " +
                                    "mr for Minimax (Recursive), " +
-                                   "mi for Minimax (Iterative)): ")
+                                   "mi for Minimax (Iterative), " +
+                                   "ab for Minimax (Alpha-Beta), " +
+                                   "tb for Tablebase, " +
+                                   "mp for Minimax (Parallel), " +
+                                   "mt for Minimax (Timed), " +
+                                   "mc for Monte Carlo Tree Search): ")
         player_1_playstyle = player_1_playstyle.strip()
 
     # Get the parameters for the second character
@@ -133,37 +423,62 @@ def set_up_game():
         player_2_playstyle = input("Select a playstyle for the second " +
                                    "character (m for Manual, r for Random, " +
                                    "mr for Minimax (Recursive), " +
-                                   "mi for Minimax (Iterative)): ")
+                                   "mi for Minimax (Iterative), " +
+                                   "ab for Minimax (Alpha-Beta), " +
+                                   "tb for Tablebase, " +
+                                   "mp for Minimax (Parallel), " +
+                                   "mt for Minimax (Timed), " +
+                                   "mc for Monte Carlo Tree Search): ")
         player_2_playstyle = player_2_playstyle.strip()
 
+    BATTLE_QUEUE = make_game(bq, player_1, player_2, player_1_playstyle,
+                             player_2_playstyle, player_1_name, player_2_name)
+    P1 = BATTLE_QUEUE.peek()
+    P2 = P1.enemy
+
+def make_game(bq, player_1, player_2, player_1_playstyle, player_2_playstyle,
+              player_1_name='P1', player_2_name='P2'):
+    """
+    Returns a new battle queue of the type bq with a character of class
+    player_1 named player_1_name, and one of class player_2 named
+    player_2_name, added to it, using the playstyles player_1_playstyle and
+    player_2_playstyle. Each of these is a key of the dictionaries above.
+
+    Unlike set_up_game(), this doesn't ask for input or use the variables
+    above, so it can set up games without the UI.
+    """
+    battle_queue = BATTLE_QUEUE_CLASSES[bq]()
+
     # Store the classes in other variable names for convenience
     P1_Character = CHARACTER_CLASSES[player_1]
     P2_Character = CHARACTER_CLASSES[player_2]
-    p1_playstyle = PLAYSTYLE_CLASSES[player_1_playstyle](BATTLE_QUEUE)
-    p2_playstyle = PLAYSTYLE_CLASSES[player_2_playstyle](BATTLE_QUEUE)
+    p1_playstyle = PLAYSTYLE_CLASSES[player_1_playstyle](battle_queue)
+    p2_playstyle = PLAYSTYLE_CLASSES[player_2_playstyle](battle_queue)
 
     # Call the corresponding __init__ for each player's character class
     # The parameters passed in are: their name, the battle queue and an
     # instance of their playstyle
-    P1 = P1_Character(player_1_name, BATTLE_QUEUE, p1_playstyle)
-    P2 = P2_Character(player_2_name, BATTLE_QUEUE, p2_playstyle)
+    p1 = P1_Character(player_1_name, battle_queue, p1_playstyle)
+    p2 = P2_Character(player_2_name, battle_queue, p2_playstyle)
 
     if player_1 == 's':
         default_tree = create_default_tree()
-        P1.set_skill_decision_tree(default_tree)
+        p1.set_skill_decision_tree(default_tree)
 
     if player_2 == 's':
         default_tree = create_default_tree()
-        P2.set_skill_decision_tree(default_tree)
+        p2.set_skill_decision_tree(default_tree)
 
     # Set the enemy attribute of the characters
     # You can assume this will be called before any attacks are performed
-    P1.enemy = P2
-    P2.enemy = P1
+    p1.enemy = p2
+    p2.enemy = p1
 
     # Add the characters to the Battle Queue
-    BATTLE_QUEUE.add(P1)
-    BATTLE_QUEUE.add(P2)
+    battle_queue.add(p1)
+    battle_queue.add(p2)
+
+    return battle_queue
 
 def update_ui():
     """
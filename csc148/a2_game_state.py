@@ -0,0 +1,563 @@
+"""
+The GameState class for A2.
+
+A GameState is a small, immutable snapshot of a game: the two players'
+classes, HP and SP, the order of the BattleQueue, and for a
+RestrictedBattleQueue, which characters are able to add. Searching over
+GameStates avoids building Character and BattleQueue objects for every
+position, and GameStates can be hashed, compared and pickled.
+
+successors() plays the rules of a2_characters.py, a2_skills.py and
+a2_battle_queue.py directly on GameStates. It must be kept in step with them.
+The tables of rules here are also used by a2_batch_simulator.py.
+"""
+from typing import List, Tuple, Union
+from a2_battle_queue import BattleQueue, RestrictedBattleQueue
+from a2_transposition_table import TranspositionTable
+from a2_skill_decision_tree import Combatant
+from a2_skills import MageAttack, MageSpecial, RogueAttack, RogueSpecial, \
+    VampireAttack, VampireSpecial, SorcererSpecial
+
+# The characters each skill adds to the BattleQueue after dealing damage, in
+# order: 'c' for the caster and 't' for the target. SorcererSpecial instead
+# rebuilds the whole queue.
+SKILL_ADDS = {MageAttack: 'c', MageSpecial: 'tc', RogueAttack: 'c',
+               RogueSpecial: 'cc', VampireAttack: 'c', VampireSpecial: 'cct',
+               SorcererSpecial: ''}
+
+# Skills whose caster heals as much HP as the damage they deal.
+LIFESTEAL_SKILLS = (VampireAttack, VampireSpecial)
+
+# The SP a Sorcerer's attack costs, whichever skill its tree picks.
+SORCERER_ATTACK_COST = 15
+
+# The SP a Sorcerer's attack temporarily gains while its skill is used.
+SORCERER_ATTACK_BOOST = 50
+
+# The scores of GameStates already searched by get_game_state_score().
+GAME_STATE_TABLE = TranspositionTable()
+
+# Maps each Character class to its (attack skill, special skill, defense).
+# The attack skill is None if it is picked by a SkillDecisionTree.
+_CLASS_RULES = {}
+
+
+def get_rules(character_class: type) -> Tuple['Skill', 'Skill', int]:
+    """
+    Return the (attack skill, special skill, defense) of character_class.
+    """
+    if character_class not in _CLASS_RULES:
+        prototype = character_class('', None, None)
+        _CLASS_RULES[character_class] = (prototype.get_skill('A'),
+                                         prototype.get_skill('S'),
+                                         prototype.get_defense())
+    return _CLASS_RULES[character_class]
+
+
+class GameState:
+    """
+    An immutable snapshot of a game, for use in search.
+
+    Players are numbered 0 (the first player of the BattleQueue) and 1.
+
+    classes - the Character class of each player.
+    hps - the HP of each player.
+    sps - the SP of each player.
+    order - the players in the BattleQueue, front first.
+    ables - whether each entry of order is able to add, or None if the game
+            uses a plain BattleQueue.
+    first_time_p2 - whether player 1 has yet to be added to a
+                    RestrictedBattleQueue for the first time.
+    trees - the SkillDecisionTree of each player, or None for players that
+            don't use one.
+    """
+    __slots__ = ('classes', 'hps', 'sps', 'order', 'ables', 'first_time_p2',
+                 'trees', '_hash')
+    classes: Tuple[type, type]
+    hps: Tuple[int, int]
+    sps: Tuple[int, int]
+    order: Tuple[int, ...]
+    ables: Union[Tuple[bool, ...], None]
+    first_time_p2: bool
+    trees: Tuple['SkillDecisionTree', 'SkillDecisionTree']
+
+    def __init__(self, classes: Tuple[type, type], hps: Tuple[int, int],
+                 sps: Tuple[int, int], order: Tuple[int, ...],
+                 ables: Union[Tuple[bool, ...], None] = None,
+                 first_time_p2: bool = False,
+                 trees: Tuple['SkillDecisionTree',
+                              'SkillDecisionTree'] = (None, None)) -> None:
+        """
+        Initialize this GameState.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> s = GameState((Rogue, Mage), (100, 100), (100, 100), (0, 1))
+        >>> s.get_next_player()
+        0
+        >>> s.get_available_actions()
+        ['A', 'S']
+        """
+        self.classes = tuple(classes)
+        self.hps = tuple(hps)
+        self.sps = tuple(sps)
+        self.order = tuple(order)
+        self.ables = None if ables is None else tuple(ables)
+        self.first_time_p2 = first_time_p2
+        self.trees = tuple(trees)
+        self._hash = hash(self._key())
+
+    @classmethod
+    def from_battle_queue(cls, battle_queue: 'BattleQueue') -> 'GameState':
+        """
+        Return the GameState of the game being carried out in battle_queue.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> from a2_playstyle import ManualPlaystyle
+        >>> bq = BattleQueue()
+        >>> r = Rogue("r", bq, ManualPlaystyle(bq))
+        >>> m = Mage("m", bq, ManualPlaystyle(bq))
+        >>> r.enemy = m
+        >>> m.enemy = r
+        >>> bq.add(r)
+        >>> bq.add(m)
+        >>> m.set_hp(30)
+        >>> s = GameState.from_battle_queue(bq)
+        >>> s.hps, s.order
+        ((100, 30), (0, 1))
+        """
+        key = battle_queue.get_state_key()
+        p1_key, p2_key, order = key[1], key[2], key[3]
+        ables, first_time_p2 = None, False
+        if isinstance(battle_queue, RestrictedBattleQueue):
+            ables = key[4]
+            first_time_p2 = key[5]
+        trees = (p1_key[3] if len(p1_key) > 3 else None,
+                 p2_key[3] if len(p2_key) > 3 else None)
+        return cls((p1_key[0], p2_key[0]), (p1_key[1], p2_key[1]),
+                   (p1_key[2], p2_key[2]), order, ables, first_time_p2, trees)
+
+    def to_battle_queue(self, names: Tuple[str, str] = ('P1', 'P2'),
+                        playstyle_classes: Tuple[type, type] = None
+                        ) -> 'BattleQueue':
+        """
+        Return a new BattleQueue carrying out the game in this GameState, with
+        characters named names. Their playstyles are instances of
+        playstyle_classes, which default to ManualPlaystyle.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> s = GameState((Rogue, Mage), (40, 100), (97, 100), (1, 0))
+        >>> s.to_battle_queue(('r', 'm'))
+        m (Mage): 100/100 -> r (Rogue): 40/97
+        >>> GameState.from_battle_queue(s.to_battle_queue()) == s
+        True
+        """
+        if playstyle_classes is None:
+            from a2_playstyle import ManualPlaystyle
+            playstyle_classes = (ManualPlaystyle, ManualPlaystyle)
+        if self.ables is None:
+            battle_queue = BattleQueue()
+        else:
+            battle_queue = RestrictedBattleQueue()
+        players = []
+        for i in range(2):
+            player = self.classes[i](names[i], battle_queue,
+                                     playstyle_classes[i](battle_queue))
+            player.set_hp(self.hps[i])
+            player.set_sp(self.sps[i])
+            if self.trees[i] is not None:
+                player.set_skill_decision_tree(self.trees[i])
+            players.append(player)
+        players[0].enemy = players[1]
+        players[1].enemy = players[0]
+        if self.ables is None:
+            battle_queue.set_contents(players[0], players[1], self.order)
+        else:
+            battle_queue.set_contents(players[0], players[1], self.order,
+                                      self.ables, self.first_time_p2)
+        return battle_queue
+
+    def _key(self) -> tuple:
+        """
+        Return a tuple of everything that identifies this GameState.
+        """
+        return (self.classes, self.hps, self.sps, self.order, self.ables,
+                self.first_time_p2, self.trees)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Return whether this GameState is the same as other.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> s = GameState((Rogue, Mage), (100, 100), (100, 100), (0, 1))
+        >>> s == GameState((Rogue, Mage), (100, 100), (100, 100), (0, 1))
+        True
+        >>> s == GameState((Rogue, Mage), (100, 99), (100, 100), (0, 1))
+        False
+        """
+        return isinstance(other, GameState) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        """
+        Return the hash of this GameState.
+        """
+        return self._hash
+
+    def __getstate__(self) -> tuple:
+        """
+        Return the state of this GameState to be pickled.
+        """
+        return self._key()
+
+    def __setstate__(self, state: tuple) -> None:
+        """
+        Restore this GameState from the pickled state.
+        """
+        self.__init__(*state)
+
+    def __repr__(self) -> str:
+        """
+        Return a representation of this GameState.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> GameState((Rogue, Mage), (100, 88), (90, 100), (1, 0, 0))
+        GameState(Rogue 100/90, Mage 88/100, order=(1, 0, 0))
+        """
+        text = "GameState({} {}/{}, {} {}/{}, order={}".format(
+            self.classes[0].__name__, self.hps[0], self.sps[0],
+            self.classes[1].__name__, self.hps[1], self.sps[1], self.order)
+        if self.ables is not None:
+            text += ", ables={}".format(self.ables)
+        return text + ")"
+
+    def get_next_player(self) -> int:
+        """
+        Return the player to act next in this GameState, after skipping those
+        at the front who can't act. If nobody can act, return 0, as
+        BattleQueue.peek() returns its first player.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> GameState((Rogue, Mage), (100, 100), (2, 100), (0, 1)
+        ...           ).get_next_player()
+        1
+        """
+        for player in self.order:
+            if _get_actions(self.classes[player], self.sps[player]):
+                return player
+        return 0
+
+    def cleaned(self) -> 'GameState':
+        """
+        Return this GameState without the entries at the front of its queue
+        whose players can't act. Every move starts by removing them, so the
+        result plays out exactly like this GameState.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> GameState((Rogue, Mage), (100, 100), (2, 100), (0, 1, 0)
+        ...           ).cleaned()
+        GameState(Rogue 100/2, Mage 100/100, order=(1, 0))
+        """
+        start = 0
+        while start < len(self.order) and \
+                not _get_actions(self.classes[self.order[start]],
+                                 self.sps[self.order[start]]):
+            start += 1
+        if start == 0:
+            return self
+        ables = None if self.ables is None else self.ables[start:]
+        return GameState(self.classes, self.hps, self.sps, self.order[start:],
+                         ables, self.first_time_p2, self.trees)
+
+    def get_available_actions(self) -> List[str]:
+        """
+        Return the actions available to the next player in this GameState.
+        """
+        player = self.get_next_player()
+        return _get_actions(self.classes[player], self.sps[player])
+
+    def is_over(self) -> bool:
+        """
+        Return whether the game in this GameState is over.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> GameState((Rogue, Mage), (100, 0), (100, 100), (0, 1)).is_over()
+        True
+        """
+        if self.hps[0] == 0 or self.hps[1] == 0:
+            return True
+        return all(not _get_actions(self.classes[player], self.sps[player])
+                   for player in self.order)
+
+    def get_winner(self) -> Union[int, None]:
+        """
+        Return the player who won the game in this GameState, or None if the
+        game is not over or was a tie.
+        """
+        if not self.is_over():
+            return None
+        if self.hps[0] == 0:
+            return 1
+        if self.hps[1] == 0:
+            return 0
+        return None
+
+    def get_terminal_score(self) -> int:
+        """
+        Return the score of this GameState, whose game is over, for the next
+        player, as get_state_score() in a2_playstyle.py would.
+
+        >>> from a2_characters import Rogue, Mage
+        >>> GameState((Rogue, Mage), (40, 0), (100, 100), (1, 0)
+        ...           ).get_terminal_score()
+        -40
+        """
+        winner = self.get_winner()
+        if winner is None:
+            return 0
+        if self.classes[winner] == self.classes[self.get_next_player()]:
+            return self.hps[winner]
+        return -self.hps[winner]
+
+
+def _get_actions(character_class: type, sp: int) -> List[str]:
+    """
+    Return the actions a character of character_class with sp SP can perform.
+    """
+    attack, special, _ = get_rules(character_class)
+    attack_cost = SORCERER_ATTACK_COST if attack is None else \
+        attack.get_sp_cost()
+    actions = []
+    if attack_cost <= sp:
+        actions.append('A')
+    if special.get_sp_cost() <= sp:
+        actions.append('S')
+    return actions
+
+
+class _Game:
+    """
+    A mutable copy of a GameState that a single move is played out on.
+
+    Each method mirrors the BattleQueue or Character method of the same name.
+    """
+
+    def __init__(self, state: GameState) -> None:
+        """
+        Initialize this _Game from state.
+        """
+        self.state = state
+        self.hps = list(state.hps)
+        self.sps = list(state.sps)
+        self.order = list(state.order)
+        self.ables = None if state.ables is None else list(state.ables)
+        self.first_time_p2 = state.first_time_p2
+
+    def freeze(self) -> GameState:
+        """
+        Return the GameState this _Game is now in.
+        """
+        return GameState(self.state.classes, self.hps, self.sps, self.order,
+                         self.ables, self.first_time_p2, self.state.trees)
+
+    def actions(self, player: int) -> List[str]:
+        """
+        Return the actions player can perform.
+        """
+        return _get_actions(self.state.classes[player], self.sps[player])
+
+    def _pop(self) -> int:
+        """
+        Remove and return the player at the front of the queue.
+        """
+        if self.ables is not None:
+            self.ables.pop(0)
+        return self.order.pop(0)
+
+    def clean(self) -> None:
+        """
+        Remove the players at the front of the queue who can't act.
+        """
+        while self.order and not self.actions(self.order[0]):
+            self._pop()
+
+    def peek(self) -> int:
+        """
+        Return the player at the front of the queue.
+        """
+        self.clean()
+        return self.order[0] if self.order else 0
+
+    def is_empty(self) -> bool:
+        """
+        Return whether the queue is empty.
+        """
+        self.clean()
+        return not self.order
+
+    def remove(self) -> Union[int, None]:
+        """
+        Remove and return the player at the front of the queue.
+        """
+        self.clean()
+        if self.ables is None:
+            return self._pop()
+        if not self.is_empty():
+            return self._pop()
+        return None
+
+    def add(self, player: int) -> None:
+        """
+        Add player to the back of the queue.
+        """
+        if self.ables is None:
+            self.order.append(player)
+            return
+        classes = self.state.classes
+        if self.first_time_p2:
+            able = True
+            self.first_time_p2 = False
+        elif not self.order:
+            able = True
+        elif self.ables[0]:
+            if classes[player] != classes[self.peek()]:
+                able = False
+            else:
+                able = sum(1 for i in range(len(self.order))
+                           if classes[self.order[i]] == classes[player] and
+                           self.ables[i]) < 2
+        else:
+            return
+        self.order.append(player)
+        self.ables.append(able)
+
+    def dedupe(self) -> None:
+        """
+        Remove the players who can't act and every entry of a player after
+        their first.
+        """
+        keep = []
+        seen = set()
+        for i, player in enumerate(self.order):
+            if player not in seen:
+                seen.add(player)
+                if self.actions(player):
+                    keep.append(i)
+        self.order = [self.order[i] for i in keep]
+        if self.ables is not None:
+            self.ables = [self.ables[i] for i in keep]
+
+    def apply_damage(self, player: int, damage: int) -> None:
+        """
+        Deal damage to player, less their defense.
+        """
+        damage -= get_rules(self.state.classes[player])[2]
+        self.hps[player] = max(self.hps[player] - damage, 0)
+
+    def use(self, skill: 'Skill', caster: int) -> None:
+        """
+        Make caster use skill on the other player.
+        """
+        target = 1 - caster
+        prev_target_hp = self.hps[target]
+        self.sps[caster] -= skill.get_sp_cost()
+        self.apply_damage(target, skill.get_damage())
+        if isinstance(skill, SorcererSpecial):
+            self.dedupe()
+            self.add(caster)
+        for who in SKILL_ADDS[type(skill)]:
+            self.add(caster if who == 'c' else target)
+        if isinstance(skill, LIFESTEAL_SKILLS):
+            self.hps[caster] += prev_target_hp - self.hps[target]
+
+    def perform(self, action: str) -> None:
+        """
+        Make the next player perform action, then remove them if they can
+        still act, as BattleQueue.apply_move() does.
+        """
+        caster = self.peek()
+        attack, special, _ = get_rules(self.state.classes[caster])
+        if action == 'S':
+            self.use(special, caster)
+        elif attack is not None:
+            self.use(attack, caster)
+        else:
+            current_sp = self.sps[caster]
+            self.sps[caster] = current_sp + SORCERER_ATTACK_BOOST
+            skill = self.state.trees[caster].pick_skill(
+                Combatant(self.hps[caster], self.sps[caster]),
+                Combatant(self.hps[1 - caster], self.sps[1 - caster]))
+            self.use(skill, caster)
+            self.sps[caster] = current_sp - SORCERER_ATTACK_COST
+        if self.actions(self.peek()):
+            self.remove()
+
+
+def play(state: GameState, action: str) -> GameState:
+    """
+    Return the GameState that the next player in state performing action
+    ('A' or 'S') leads to.
+
+    >>> from a2_characters import Rogue, Mage
+    >>> play(GameState((Rogue, Mage), (100, 100), (100, 100), (0, 1)), 'S')
+    GameState(Rogue 100/90, Mage 88/100, order=(1, 0, 0))
+    """
+    game = _Game(state)
+    game.perform(action)
+    return game.freeze()
+
+
+def successors(state: GameState) -> List[Tuple[str, GameState]]:
+    """
+    Return an (action, GameState) pair for each action available to the next
+    player in state, giving the GameState that action leads to. Return an
+    empty list if the game in state is over.
+
+    >>> from a2_characters import Rogue, Mage
+    >>> s = GameState((Rogue, Mage), (100, 100), (100, 100), (0, 1))
+    >>> for action, next_state in successors(s):
+    ...     print(action, next_state)
+    A GameState(Rogue 100/97, Mage 93/100, order=(1, 0))
+    S GameState(Rogue 100/90, Mage 88/100, order=(1, 0, 0))
+    """
+    if state.is_over():
+        return []
+    return [(action, play(state, action))
+            for action in state.get_available_actions()]
+
+
+def get_game_state_score(state: GameState,
+                         table: TranspositionTable = None) -> int:
+    """
+    Return the highest score that the next player in state can guarantee, as
+    get_state_score() in a2_playstyle.py would for the matching BattleQueue.
+
+    Scores are looked up in and stored to table, which defaults to
+    GAME_STATE_TABLE.
+
+    >>> from a2_characters import Rogue, Mage
+    >>> get_game_state_score(GameState((Rogue, Mage), (40, 3), (100, 100),
+    ...                                (1, 0)))
+    -10
+    """
+    if table is None:
+        table = GAME_STATE_TABLE
+    if state.is_over():
+        return state.get_terminal_score()
+    state = state.cleaned()
+    score = table.lookup(state)
+    if score is not None:
+        return score
+    player_class = state.classes[state.get_next_player()]
+    scores = []
+    for _, child in successors(state):
+        if child.classes[child.get_next_player()] == player_class:
+            scores.append(get_game_state_score(child, table))
+        else:
+            scores.append(-get_game_state_score(child, table))
+    score = max(scores)
+    table.store(state, score)
+    return score
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config='a2_pyta.txt')
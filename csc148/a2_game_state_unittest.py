@@ -0,0 +1,110 @@
+"""
+Unittests for GameState and successors for A2.
+
+successors() re-implements the rules of the game, so these tests play random
+games with both the Character/BattleQueue classes and GameStates, and check
+that they stay in step.
+"""
+import pickle
+import random
+import unittest
+
+from a2_game import CHARACTER_CLASSES
+from a2_playstyle import ManualPlaystyle
+from a2_battle_queue import BattleQueue, RestrictedBattleQueue, \
+    RunLengthBattleQueue, RunLengthRestrictedBattleQueue
+from a2_skill_decision_tree import create_default_tree
+from a2_game_state import GameState, successors
+
+
+def make_battle_queue(queue_class, first, second):
+    """
+    Return a new queue_class with a character of class first and one of class
+    second added to it.
+    """
+    bq = queue_class()
+    p1 = first("P1", bq, ManualPlaystyle(bq))
+    p2 = second("P2", bq, ManualPlaystyle(bq))
+    for character in [p1, p2]:
+        if character.get_skill('A') is None:
+            character.set_skill_decision_tree(create_default_tree())
+    p1.enemy = p2
+    p2.enemy = p1
+    bq.add(p1)
+    bq.add(p2)
+    return bq
+
+
+class GameStateUnitTests(unittest.TestCase):
+    def test_round_trip(self):
+        """
+        Test to make sure a GameState turned into a BattleQueue and back is
+        unchanged.
+        """
+        bq = make_battle_queue(RestrictedBattleQueue, CHARACTER_CLASSES['r'],
+                               CHARACTER_CLASSES['v'])
+        bq.apply_move('S')
+        state = GameState.from_battle_queue(bq)
+
+        actual = GameState.from_battle_queue(state.to_battle_queue())
+
+        self.assertEqual(state, actual,
+                         ("Turning {} into a BattleQueue and back should " +
+                          "give the same GameState but got {} " +
+                          "instead.").format(state, actual))
+
+    def test_pickle(self):
+        """
+        Test to make sure a GameState can be pickled, including a Sorcerer's
+        SkillDecisionTree.
+        """
+        bq = make_battle_queue(BattleQueue, CHARACTER_CLASSES['s'],
+                               CHARACTER_CLASSES['m'])
+        state = GameState.from_battle_queue(bq)
+
+        actual = pickle.loads(pickle.dumps(state))
+
+        self.assertEqual(state.hps, actual.hps)
+        self.assertEqual(state.order, actual.order)
+        self.assertEqual(successors(state)[0][1].hps,
+                         successors(actual)[0][1].hps)
+
+    def test_successors_match_battle_queue(self):
+        """
+        Test to make sure successors gives the same states as apply_move on a
+        BattleQueue, over random games between every pair of characters.
+        """
+        rng = random.Random(148)
+        for queue_class in [BattleQueue, RestrictedBattleQueue,
+                            RunLengthBattleQueue,
+                            RunLengthRestrictedBattleQueue]:
+            for first in CHARACTER_CLASSES.values():
+                for second in CHARACTER_CLASSES.values():
+                    for _ in range(5):
+                        bq = make_battle_queue(queue_class, first, second)
+                        while not bq.is_over():
+                            state = GameState.from_battle_queue(bq)
+                            expected = []
+                            for action in bq.peek().get_available_actions():
+                                bq.apply_move(action)
+                                expected.append(
+                                    (action, GameState.from_battle_queue(bq)))
+                                bq.undo_move()
+
+                            actual = successors(state)
+
+                            self.assertEqual(expected, actual,
+                                             ("From the BattleQueue:\n{}\n" +
+                                              "successors should give {} " +
+                                              "but got {} " +
+                                              "instead.").format(bq, expected,
+                                                                 actual))
+                            bq.apply_move(rng.choice(actual)[0])
+
+                        state = GameState.from_battle_queue(bq)
+                        self.assertTrue(state.is_over())
+                        self.assertEqual(successors(state), [])
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
@@ -0,0 +1,114 @@
+"""
+Unittests for the Monte Carlo Tree Search Playstyle for A2.
+"""
+import random
+import unittest
+
+from a2_game import CHARACTER_CLASSES, PLAYSTYLE_CLASSES
+from a2_playstyle import ManualPlaystyle
+from a2_battle_queue import BattleQueue
+MageConstructor = CHARACTER_CLASSES['m']
+RogueConstructor = CHARACTER_CLASSES['r']
+MCTS = PLAYSTYLE_CLASSES['mc']
+
+
+class MCTSPlaystyleUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up a BattleQueue containing a Rogue and a Mage, and seeds the
+        random rollouts.
+        """
+        random.seed(148)
+        self.battle_queue = BattleQueue()
+        playstyle = ManualPlaystyle(self.battle_queue)
+        self.p1 = RogueConstructor("R", self.battle_queue, playstyle)
+        self.p2 = MageConstructor("M", self.battle_queue, playstyle)
+        self.p1.enemy = self.p2
+        self.p2.enemy = self.p1
+        self.battle_queue.add(self.p1)
+        self.battle_queue.add(self.p2)
+
+    def test_select_attack_one_attack(self):
+        """
+        Test to make sure calling select_attack when only one attack is
+        available returns that attack.
+        """
+        self.p1.set_sp(5)
+
+        actual = MCTS(self.battle_queue, 50).select_attack()
+
+        self.assertEqual("A", actual)
+
+    def test_select_special_attack_to_win(self):
+        """
+        Test to make sure calling select_attack picks the special attack when
+        it wins the game and attacking loses it.
+        """
+        self.battle_queue.remove()
+        self.battle_queue.add(self.p1)
+        self.p1.set_hp(30)
+        self.p1.set_sp(100)
+        self.p2.set_hp(5)
+        self.p2.set_sp(30)
+
+        bq = repr(self.battle_queue)
+
+        expected = "S"
+        actual = MCTS(self.battle_queue, 500).select_attack()
+
+        self.assertEqual(expected, actual,
+                         ("Calling select_attack() on a BattleQueue that " +
+                          "looks like:\n{}\nShould return the attack {} " +
+                          "but got {} instead.").format(bq,
+                                                        expected,
+                                                        actual))
+
+    def test_select_attack_to_win_opponent_can_kill(self):
+        """
+        Test to make sure calling select_attack picks the attack when the
+        special attack lets the opponent win.
+        """
+        self.battle_queue.remove()
+        self.battle_queue.add(self.p1)
+        self.p1.set_hp(40)
+        self.p1.set_sp(6)
+        self.p2.set_hp(14)
+        self.p2.set_sp(35)
+
+        bq = repr(self.battle_queue)
+
+        expected = "A"
+        actual = MCTS(self.battle_queue, 500).select_attack()
+
+        self.assertEqual(expected, actual,
+                         ("Calling select_attack() on a BattleQueue that " +
+                          "looks like:\n{}\nShould return the attack {} " +
+                          "but got {} instead.").format(bq,
+                                                        expected,
+                                                        actual))
+
+    def test_no_limit(self):
+        """
+        Test to make sure MCTSPlaystyle rejects limits that would stop it
+        from ever running a simulation, or from ever stopping.
+        """
+        for simulations, time_budget in [(None, None), (0, None), (-1, 1),
+                                         (None, 0), (10, -0.5)]:
+            self.assertRaises(ValueError, MCTS, self.battle_queue,
+                              simulations, time_budget)
+
+    def test_time_budget(self):
+        """
+        Test to make sure select_attack with only a time budget returns an
+        available attack and leaves the BattleQueue unchanged.
+        """
+        before = self.battle_queue.get_state_key()
+
+        actual = MCTS(self.battle_queue, None, 0.05).select_attack()
+
+        self.assertIn(actual, self.p1.get_available_actions())
+        self.assertEqual(before, self.battle_queue.get_state_key())
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
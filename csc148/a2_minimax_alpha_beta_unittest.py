@@ -0,0 +1,199 @@
+"""
+Unittests for the Alpha-Beta Minimax Playstyle for A2.
+
+AlphaBetaMinimax must pick the same attack as RecursiveMinimax, so these tests
+mirror the Recursive Minimax tests and then compare the two playstyles on a
+range of other states.
+"""
+import math
+import random
+import unittest
+
+from a2_game import CHARACTER_CLASSES, PLAYSTYLE_CLASSES
+from a2_playstyle import ManualPlaystyle, TRANSPOSITION_TABLE, BOUND_TABLE
+from a2_playstyle import get_state_score, _get_alpha_beta_score
+from a2_transposition_table import TranspositionTable
+from a2_battle_queue import BattleQueue, RestrictedBattleQueue
+from a2_skill_decision_tree import create_default_tree
+MageConstructor = CHARACTER_CLASSES['m']
+RogueConstructor = CHARACTER_CLASSES['r']
+Minimax = PLAYSTYLE_CLASSES['ab']
+RecursiveMinimax = PLAYSTYLE_CLASSES['mr']
+
+
+class AlphaBetaMinimaxUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up a Battle Queue containing 2 a Mage and Rogue for all of the
+        unittests.
+        """
+        TRANSPOSITION_TABLE.clear()
+        self.battle_queue = BattleQueue()
+        playstyle = ManualPlaystyle(self.battle_queue)
+
+        self.p1 = RogueConstructor("R", self.battle_queue, playstyle)
+        self.p2 = MageConstructor("M", self.battle_queue, playstyle)
+
+        self.p1.enemy = self.p2
+        self.p2.enemy = self.p1
+
+        self.battle_queue.add(self.p1)
+        self.battle_queue.add(self.p2)
+
+        self.minimax_playstyle = Minimax(self.battle_queue)
+
+    def tearDown(self):
+        """
+        Delete the attributes that were created in setUp.
+        """
+        del self.battle_queue
+        del self.p1
+        del self.p2
+
+    def assert_attack(self, expected):
+        """
+        Assert that select_attack() returns expected on self.battle_queue.
+        """
+        bq = repr(self.battle_queue)
+        actual = self.minimax_playstyle.select_attack()
+
+        self.assertEqual(expected, actual,
+                         ("Calling select_attack() on a BattleQueue that " +
+                          "looks like:\n{}\nShould return the attack {} " +
+                          "but got {} instead.").format(bq,
+                                                        expected,
+                                                        actual))
+
+    def test_select_attack_one_attack(self):
+        """
+        Test to make sure calling select_attack when only one attack is
+        available returns that attack.
+        """
+        self.p1.set_sp(5)
+        self.assert_attack("A")
+
+    def test_select_attack_to_win_opponent_can_kill(self):
+        """
+        Test to make sure calling select_attack when use special attack results
+        in a loss but attack results in a win.
+        """
+        self.battle_queue.remove()
+        self.battle_queue.add(self.p1)
+        self.p1.set_hp(40)
+        self.p1.set_sp(6)
+        self.p2.set_hp(14)
+        self.p2.set_sp(35)
+        self.assert_attack("A")
+
+    def test_select_special_attack_to_win(self):
+        """
+        Test to make sure calling select_attack when use special attack results
+        in a win but attack results in a loss.
+        """
+        self.battle_queue.remove()
+        self.battle_queue.add(self.p1)
+        self.p1.set_hp(30)
+        self.p1.set_sp(100)
+        self.p2.set_hp(5)
+        self.p2.set_sp(30)
+        self.assert_attack("S")
+
+    def test_run_full_game(self):
+        """
+        Test to make sure calling select_attack works from the start of a game.
+        """
+        self.assert_attack("S")
+
+    def test_matches_recursive_minimax(self):
+        """
+        Test to make sure AlphaBetaMinimax picks the same attack as
+        RecursiveMinimax for every pair of characters and both kinds of
+        BattleQueue.
+        """
+        rng = random.Random(148)
+        for queue_class in [BattleQueue, RestrictedBattleQueue]:
+            for first in CHARACTER_CLASSES.values():
+                for second in CHARACTER_CLASSES.values():
+                    for _ in range(3):
+                        bq = queue_class()
+                        p1 = first("P1", bq, ManualPlaystyle(bq))
+                        p2 = second("P2", bq, ManualPlaystyle(bq))
+                        for character in [p1, p2]:
+                            if character.get_skill('A') is None:
+                                character.set_skill_decision_tree(
+                                    create_default_tree())
+                            character.set_hp(rng.randint(10, 60))
+                            character.set_sp(rng.randint(20, 60))
+                        p1.enemy = p2
+                        p2.enemy = p1
+                        bq.add(p1)
+                        bq.add(p2)
+
+                        TRANSPOSITION_TABLE.clear()
+                        expected = RecursiveMinimax(bq).select_attack()
+                        TRANSPOSITION_TABLE.clear()
+                        actual = Minimax(bq).select_attack()
+
+                        self.assertEqual(expected, actual,
+                                         ("On a BattleQueue that looks " +
+                                          "like:\n{}\nRecursiveMinimax " +
+                                          "returns {} but AlphaBetaMinimax " +
+                                          "returned {}.").format(bq, expected,
+                                                                 actual))
+
+    def test_warm_tables(self):
+        """
+        Test to make sure searches that reuse the scores and bounds stored by
+        the searches before them, with windows of every width, still find the
+        same scores and attacks as RecursiveMinimax.
+        """
+        rng = random.Random(1)
+        TRANSPOSITION_TABLE.clear()
+        BOUND_TABLE.clear()
+        for _ in range(150):
+            queue_class = rng.choice([BattleQueue, RestrictedBattleQueue])
+            bq = queue_class()
+            p1 = rng.choice(list(CHARACTER_CLASSES.values()))(
+                "P1", bq, ManualPlaystyle(bq))
+            p2 = rng.choice(list(CHARACTER_CLASSES.values()))(
+                "P2", bq, ManualPlaystyle(bq))
+            for character in [p1, p2]:
+                if character.get_skill('A') is None:
+                    character.set_skill_decision_tree(create_default_tree())
+                character.set_hp(rng.randint(5, 40))
+                character.set_sp(rng.randint(0, 40))
+            p1.enemy = p2
+            p2.enemy = p1
+            bq.add(p1)
+            bq.add(p2)
+            score = get_state_score(bq, TranspositionTable())
+
+            for _ in range(5):
+                alpha = rng.randint(-100, 100)
+                beta = alpha + rng.randint(1, 30)
+                actual = _get_alpha_beta_score(bq.copy(), alpha, beta,
+                                               TRANSPOSITION_TABLE)
+                self.assertTrue((actual <= alpha and score <= alpha) or
+                                (actual >= beta and score >= beta) or
+                                actual == score,
+                                ("On a BattleQueue that looks like:\n{}\n" +
+                                 "the score is {}, but searching between " +
+                                 "{} and {} found {}.").format(
+                                     bq, score, alpha, beta, actual))
+            actual = _get_alpha_beta_score(bq.copy(), -math.inf, math.inf,
+                                           TRANSPOSITION_TABLE)
+            self.assertEqual(score, actual,
+                             ("On a BattleQueue that looks like:\n{}\n" +
+                              "the score is {} but the alpha-beta search " +
+                              "found {}.").format(bq, score, actual))
+            expected = RecursiveMinimax(bq).select_attack()
+            actual = Minimax(bq).select_attack()
+            self.assertEqual(expected, actual,
+                             ("On a BattleQueue that looks like:\n{}\n" +
+                              "RecursiveMinimax returns {} but " +
+                              "AlphaBetaMinimax returned {}.").format(
+                                  bq, expected, actual))
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
@@ -17,6 +17,8 @@ import unittest
 from a2_game import CHARACTER_CLASSES, PLAYSTYLE_CLASSES
 from a2_playstyle import get_state_score, ManualPlaystyle
 from a2_battle_queue import BattleQueue
+from a2_search_stats import SearchStats
+import a2_tree
 MageConstructor = CHARACTER_CLASSES['m']
 RogueConstructor = CHARACTER_CLASSES['r']
 Minimax = PLAYSTYLE_CLASSES['mi']
@@ -199,6 +201,35 @@ class IterativeMinimaxUnitTests(unittest.TestCase):
                           "but got {} instead.").format(bq,
                                                         expected,
                                                         actual)) 
+
+    def test_only_path_is_alive(self):
+        """
+        Test to make sure select_attack only keeps the States on the path it's
+        searching alive, by counting the States that exist at the deepest
+        point of the search.
+        """
+        live = [0]
+        most_live = [0]
+        original_init = a2_tree.State.__init__
+
+        def counting_init(state, *args, **kwargs):
+            original_init(state, *args, **kwargs)
+            live[0] += 1
+            most_live[0] = max(most_live[0], live[0])
+
+        a2_tree.State.__init__ = counting_init
+        a2_tree.State.__del__ = lambda state: live.__setitem__(0, live[0] - 1)
+        try:
+            stats = SearchStats()
+            Minimax(self.battle_queue, stats).select_attack()
+        finally:
+            a2_tree.State.__init__ = original_init
+            del a2_tree.State.__del__
+
+        depth = stats.moves[0]['max_depth']
+        self.assertLessEqual(most_live[0], depth + 2,
+                             ("A search {} moves deep had {} States alive " +
+                              "at once.").format(depth, most_live[0]))
     
         
 if __name__ == "__main__":
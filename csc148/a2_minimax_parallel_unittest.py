@@ -0,0 +1,77 @@
+"""
+Unittests for the Parallel Minimax Playstyle for A2.
+"""
+import random
+import unittest
+
+from a2_game import CHARACTER_CLASSES, PLAYSTYLE_CLASSES
+from a2_game_state import GameState, get_game_state_score
+from a2_playstyle import ManualPlaystyle, get_state_score
+from a2_battle_queue import BattleQueue
+from a2_skill_decision_tree import create_default_tree
+Minimax = PLAYSTYLE_CLASSES['mp']
+RecursiveMinimax = PLAYSTYLE_CLASSES['mr']
+
+
+class ParallelMinimaxUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up a BattleQueue for each pair of characters, with random HP
+        and SP.
+        """
+        rng = random.Random(148)
+        self.battle_queues = []
+        for first in CHARACTER_CLASSES.values():
+            for second in CHARACTER_CLASSES.values():
+                bq = BattleQueue()
+                p1 = first("P1", bq, ManualPlaystyle(bq))
+                p2 = second("P2", bq, ManualPlaystyle(bq))
+                for character in [p1, p2]:
+                    if character.get_skill('A') is None:
+                        character.set_skill_decision_tree(
+                            create_default_tree())
+                    character.set_hp(rng.randint(10, 60))
+                    character.set_sp(rng.randint(20, 60))
+                p1.enemy = p2
+                p2.enemy = p1
+                bq.add(p1)
+                bq.add(p2)
+                self.battle_queues.append(bq)
+
+    def test_get_game_state_score(self):
+        """
+        Test to make sure get_game_state_score matches get_state_score.
+        """
+        for bq in self.battle_queues:
+            expected = get_state_score(bq)
+            actual = get_game_state_score(GameState.from_battle_queue(bq))
+
+            self.assertEqual(expected, actual,
+                             ("On a BattleQueue that looks like:\n{}\n" +
+                              "get_state_score returns {} but " +
+                              "get_game_state_score returned " +
+                              "{}.").format(bq, expected, actual))
+
+    def test_matches_recursive_minimax(self):
+        """
+        Test to make sure ParallelMinimax picks the same attack as
+        RecursiveMinimax when splitting at the root's children and at its
+        grandchildren.
+        """
+        for split_depth in [1, 2]:
+            minimax = Minimax(None, 2, split_depth)
+            for bq in self.battle_queues:
+                minimax.battle_queue = bq
+                expected = RecursiveMinimax(bq).select_attack()
+                actual = minimax.select_attack()
+
+                self.assertEqual(expected, actual,
+                                 ("On a BattleQueue that looks like:\n{}\n" +
+                                  "RecursiveMinimax returns {} but " +
+                                  "ParallelMinimax returned " +
+                                  "{}.").format(bq, expected, actual))
+            minimax.close()
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
@@ -0,0 +1,109 @@
+"""
+Unittests for the Iterative Deepening Minimax Playstyle for A2.
+"""
+import random
+import unittest
+
+from a2_game import CHARACTER_CLASSES, PLAYSTYLE_CLASSES
+from a2_playstyle import ManualPlaystyle, TRANSPOSITION_TABLE, \
+    evaluate_state
+from a2_battle_queue import BattleQueue
+from a2_skill_decision_tree import create_default_tree
+Minimax = PLAYSTYLE_CLASSES['mt']
+RecursiveMinimax = PLAYSTYLE_CLASSES['mr']
+
+
+class IterativeDeepeningMinimaxUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up a BattleQueue for each pair of characters, with random HP
+        and SP.
+        """
+        TRANSPOSITION_TABLE.clear()
+        rng = random.Random(148)
+        self.battle_queues = []
+        for first in CHARACTER_CLASSES.values():
+            for second in CHARACTER_CLASSES.values():
+                bq = BattleQueue()
+                p1 = first("P1", bq, ManualPlaystyle(bq))
+                p2 = second("P2", bq, ManualPlaystyle(bq))
+                for character in [p1, p2]:
+                    if character.get_skill('A') is None:
+                        character.set_skill_decision_tree(
+                            create_default_tree())
+                    character.set_hp(rng.randint(10, 40))
+                    character.set_sp(rng.randint(20, 40))
+                p1.enemy = p2
+                p2.enemy = p1
+                bq.add(p1)
+                bq.add(p2)
+                self.battle_queues.append(bq)
+
+    def test_matches_recursive_minimax(self):
+        """
+        Test to make sure IterativeDeepeningMinimax picks the same attack as
+        RecursiveMinimax when it has time to search to the end of the game.
+        """
+        for bq in self.battle_queues:
+            expected = RecursiveMinimax(bq).select_attack()
+            actual = Minimax(bq, 60).select_attack()
+
+            self.assertEqual(expected, actual,
+                             ("On a BattleQueue that looks like:\n{}\n" +
+                              "RecursiveMinimax returns {} but " +
+                              "IterativeDeepeningMinimax returned " +
+                              "{}.").format(bq, expected, actual))
+
+    def test_out_of_time(self):
+        """
+        Test to make sure IterativeDeepeningMinimax still picks an available
+        attack when it has no time to search, and leaves the BattleQueue
+        unchanged.
+        """
+        for bq in self.battle_queues:
+            before = bq.get_state_key()
+            actual = Minimax(bq, 0).select_attack()
+
+            self.assertIn(actual, bq.peek().get_available_actions(),
+                          ("On a BattleQueue that looks like:\n{}\n" +
+                           "IterativeDeepeningMinimax returned {}, which " +
+                           "isn't an available attack.").format(bq, actual))
+            self.assertEqual(before, bq.get_state_key())
+
+    def test_max_depth_below_one(self):
+        """
+        Test to make sure IterativeDeepeningMinimax rejects a max_depth less
+        than 1, which it couldn't honour.
+        """
+        for max_depth in [0, -1]:
+            self.assertRaises(ValueError, Minimax, self.battle_queues[0], 60,
+                              max_depth)
+
+    def test_max_depth(self):
+        """
+        Test to make sure IterativeDeepeningMinimax with a max_depth of 1
+        picks the attack that leads to the best evaluated state.
+        """
+        for bq in self.battle_queues:
+            player = bq.peek()
+            scores = []
+            for action in player.get_available_actions():
+                bq.apply_move(action)
+                score = evaluate_state(bq)
+                if type(player) != type(bq.peek()):
+                    score = -score
+                scores.append(score)
+                bq.undo_move()
+            expected = player.get_available_actions()[
+                scores.index(max(scores))]
+            actual = Minimax(bq, 60, 1).select_attack()
+
+            self.assertEqual(expected, actual,
+                             ("On a BattleQueue that looks like:\n{}\n" +
+                              "a search 1 move deep should pick {} but " +
+                              "IterativeDeepeningMinimax returned " +
+                              "{}.").format(bq, expected, actual))
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
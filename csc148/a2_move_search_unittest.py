@@ -0,0 +1,265 @@
+"""
+Unittests for searching for moves in the background for A2.
+"""
+import random
+import threading
+import time
+import unittest
+
+import a2_game
+from a2_game import MoveSearch, Ponder, make_game, make_move
+from a2_playstyle import Playstyle
+
+
+class BlockingPlaystyle(Playstyle):
+    """
+    A Playstyle that doesn't pick its attack until it's released.
+    """
+
+    def __init__(self, battle_queue: 'BattleQueue', move: str = 'A') -> None:
+        """
+        Initialize this BlockingPlaystyle to pick move once released.
+        """
+        super().__init__(battle_queue)
+        self.is_manual = False
+        self.move = move
+        self.release = threading.Event()
+        self.closed = False
+
+    def select_attack(self, parameter=None) -> str:
+        """
+        Return move once this BlockingPlaystyle is released, or raise
+        ValueError if move is None.
+        """
+        self.release.wait()
+        if self.move is None:
+            raise ValueError("no move")
+        return self.move
+
+    def close(self) -> None:
+        """
+        Record that this BlockingPlaystyle was closed.
+        """
+        self.closed = True
+
+
+class CountingPlaystyle(Playstyle):
+    """
+    A Playstyle that can ponder, and counts how many of its searches, across
+    every copy of it, run at once.
+    """
+    lock = threading.Lock()
+    running = 0
+    most_running = 0
+
+    def __init__(self, battle_queue: 'BattleQueue') -> None:
+        """
+        Initialize this CountingPlaystyle.
+        """
+        super().__init__(battle_queue)
+        self.is_manual = False
+        self.can_ponder = True
+
+    def select_attack(self, parameter=None) -> str:
+        """
+        Return 'A' after searching for a while.
+        """
+        with CountingPlaystyle.lock:
+            CountingPlaystyle.running += 1
+            CountingPlaystyle.most_running = max(
+                CountingPlaystyle.most_running, CountingPlaystyle.running)
+        time.sleep(0.05)
+        with CountingPlaystyle.lock:
+            CountingPlaystyle.running -= 1
+        return 'A'
+
+    def copy(self, new_battle_queue: 'BattleQueue') -> 'Playstyle':
+        """
+        Return a copy of this CountingPlaystyle using new_battle_queue.
+        """
+        return CountingPlaystyle(new_battle_queue)
+
+
+def set_up_game(bq):
+    """
+    Set up a2_game to play the game in bq, as set_up_game() does.
+    """
+    a2_game.BATTLE_QUEUE = bq
+    a2_game.P1 = bq.peek()
+    a2_game.P2 = a2_game.P1.enemy
+    a2_game.GAME_IS_OVER = False
+    a2_game.GAME_WINNER = None
+    a2_game.SEARCH = None
+    a2_game.PONDER = None
+
+
+class MoveSearchUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a game between a Rogue and a Mage whose first player blocks.
+        """
+        self.bq = make_game('n', 'r', 'm', 'r', 'r')
+        self.playstyle = BlockingPlaystyle(self.bq)
+        self.bq.peek().playstyle = self.playstyle
+
+    def tearDown(self):
+        """
+        Release any search left blocking.
+        """
+        self.playstyle.release.set()
+
+    def test_search_runs_in_background(self):
+        """
+        Test to make sure a search returns straight away, and has the move
+        once its playstyle picks it.
+        """
+        search = MoveSearch(self.bq)
+
+        self.assertFalse(search.is_done())
+        self.assertIsNone(search.get_move())
+        self.playstyle.release.set()
+        self.assertTrue(search.wait(5))
+        self.assertTrue(search.is_done())
+        self.assertEqual(search.get_move(), 'A')
+
+    def test_search_raises_errors(self):
+        """
+        Test to make sure an error raised by the playstyle is raised by
+        get_move().
+        """
+        self.playstyle.move = None
+        search = MoveSearch(self.bq)
+        self.playstyle.release.set()
+        search.wait(5)
+
+        self.assertRaises(ValueError, search.get_move)
+
+    def test_cancel(self):
+        """
+        Test to make sure cancelling a search ignores its move, and closes the
+        playstyles.
+        """
+        set_up_game(self.bq)
+        hp = a2_game.P2.get_hp()
+        a2_game.start_search()
+        search = a2_game.SEARCH
+        a2_game.cancel_search()
+        self.playstyle.release.set()
+        search.wait(5)
+
+        self.assertTrue(search.is_done())
+        self.assertIsNone(search.get_move())
+        self.assertFalse(a2_game.poll_attack())
+        self.assertEqual(a2_game.P2.get_hp(), hp)
+        self.assertTrue(self.playstyle.closed)
+
+    def test_polling_matches_perform_attack(self):
+        """
+        Test to make sure a game played by polling for moves searched for in
+        the background goes the same way as one played with
+        perform_attack().
+        """
+        for polling in [False, True]:
+            random.seed(148)
+            set_up_game(make_game('r', 'v', 's', 'r', 'r'))
+            hps = []
+            while not a2_game.GAME_IS_OVER:
+                if polling:
+                    a2_game.start_search()
+                    a2_game.SEARCH.wait(5)
+                    self.assertTrue(a2_game.poll_attack())
+                else:
+                    a2_game.perform_attack()
+                hps.append((a2_game.P1.get_hp(), a2_game.P2.get_hp()))
+            if polling:
+                self.assertEqual(expected, hps,
+                                 ("Polling gave HPs {} but perform_attack() " +
+                                  "gave {}.").format(hps, expected))
+            expected = hps
+
+    def test_ponder_finds_replies(self):
+        """
+        Test to make sure pondering while a manual player picks their attack
+        finds the reply to each attack they could make, and that the search
+        for the reply uses it.
+        """
+        for action in ['A', 'S']:
+            bq = make_game('r', 'v', 'm', 'm', 'ab')
+            for character in [bq.peek(), bq.peek().enemy]:
+                character.set_hp(25)
+            ponder = Ponder(bq)
+            self.assertTrue(ponder.wait(60))
+
+            make_move(bq, action)
+            expected = bq.peek().playstyle.select_attack()
+            self.assertIsNotNone(ponder.get_move(bq))
+            self.assertEqual(ponder.get_move(bq), expected,
+                             ("After {}, pondering found the reply {} but " +
+                              "searching finds {}.").format(
+                                  action, ponder.get_move(bq), expected))
+            search = MoveSearch(bq, ponder)
+            search.wait(5)
+            self.assertEqual(search.get_move(), expected)
+
+    def test_start_pondering(self):
+        """
+        Test to make sure pondering only starts on a manual player's turn
+        against a playstyle that can ponder, and restarts once the game
+        moves on.
+        """
+        set_up_game(make_game('n', 'm', 'r', 'm', 'r'))
+        a2_game.start_pondering()
+        self.assertIsNone(a2_game.PONDER)
+
+        set_up_game(make_game('n', 'm', 'r', 'm', 'ab'))
+        for character in [a2_game.P1, a2_game.P2]:
+            character.set_hp(30)
+        a2_game.start_pondering()
+        ponder = a2_game.PONDER
+        a2_game.start_pondering()
+        self.assertIs(a2_game.PONDER, ponder)
+
+        a2_game.LAST_KEY_PRESSED = 'A'
+        a2_game.perform_attack()
+        a2_game.start_search()
+        self.assertIsNone(a2_game.PONDER)
+        a2_game.SEARCH.wait(60)
+        self.assertTrue(a2_game.poll_attack())
+        self.assertFalse(a2_game.GAME_IS_OVER)
+        a2_game.start_pondering()
+        self.assertIsNot(a2_game.PONDER, ponder)
+        a2_game.cancel_search()
+        self.assertIsNone(a2_game.PONDER)
+
+    def test_searches_run_one_at_a_time(self):
+        """
+        Test to make sure a Ponder or search that was cancelled, but is still
+        running, doesn't search at the same time as the ones started after
+        it, since they share the minimax playstyles' tables.
+        """
+        set_up_game(make_game('n', 'm', 'r', 'm', 'r'))
+        a2_game.P2.playstyle = CountingPlaystyle(a2_game.BATTLE_QUEUE)
+        CountingPlaystyle.most_running = 0
+        searches = []
+        for _ in range(3):
+            a2_game.start_pondering()
+            searches.append(a2_game.PONDER)
+            a2_game.P1.set_hp(a2_game.P1.get_hp() - 1)
+        a2_game.cancel_search()
+        a2_game.BATTLE_QUEUE.remove()
+        a2_game.start_search()
+        searches.append(a2_game.SEARCH)
+        a2_game.cancel_search()
+        a2_game.start_search()
+        searches.append(a2_game.SEARCH)
+
+        for search in searches:
+            self.assertTrue(search.wait(5))
+        self.assertEqual(CountingPlaystyle.most_running, 1,
+                         "{} searches ran at once.".format(
+                             CountingPlaystyle.most_running))
+        a2_game.cancel_search()
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
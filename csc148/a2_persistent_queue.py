@@ -0,0 +1,320 @@
+"""
+The PersistentQueue class for A2.
+
+A PersistentQueue never changes once it's made: push() and pop() return new
+queues that share everything they can with the old one. BattleQueue keeps its
+contents in one, so copying a BattleQueue, or remembering what it looked like
+before a move, takes the same time however long the queue is.
+
+A RunLengthQueue is a PersistentQueue that stores runs of equal items as one
+(item, count) pair, for queues that are mostly long runs.
+"""
+from typing import Any, Iterator, Tuple
+
+
+class PersistentQueue:
+    """
+    A class representing an immutable first-in, first-out queue.
+
+    This is a banker's queue: items are popped from a front list and pushed
+    onto a rear list, which is reversed into a new front list when the front
+    one runs out. Both lists are linked lists of (item, rest) pairs ending in
+    None, so queues made from each other share their unchanged pairs.
+
+    The front list is only empty when the whole queue is, so peek() is always
+    O(1). push() is O(1), and pop() is O(1) except when it reverses the rear
+    list.
+    """
+    __slots__ = ['_front', '_rear', '_length']
+    _front: tuple
+    _rear: tuple
+    _length: int
+
+    def __init__(self, items: Any = ()) -> None:
+        """
+        Initialize this PersistentQueue to hold items, front first.
+
+        >>> q = PersistentQueue([1, 2, 3])
+        >>> list(q)
+        [1, 2, 3]
+        >>> len(PersistentQueue())
+        0
+        """
+        front = None
+        length = 0
+        for item in reversed(list(items)):
+            front = (item, front)
+            length += 1
+        self._front = front
+        self._rear = None
+        self._length = length
+
+    @classmethod
+    def _make(cls, front: tuple, rear: tuple,
+              length: int) -> 'PersistentQueue':
+        """
+        Return a PersistentQueue with the lists front and rear, holding length
+        items, moving rear into front if front is empty.
+        """
+        if front is None:
+            while rear is not None:
+                front = (rear[0], front)
+                rear = rear[1]
+        queue = cls.__new__(cls)
+        queue._front = front
+        queue._rear = rear
+        queue._length = length
+        return queue
+
+    def __len__(self) -> int:
+        """
+        Return the number of items in this PersistentQueue.
+
+        >>> len(PersistentQueue('ab'))
+        2
+        """
+        return self._length
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Return an iterator over the items in this PersistentQueue, front
+        first.
+
+        >>> list(PersistentQueue('ab').push('c'))
+        ['a', 'b', 'c']
+        """
+        node = self._front
+        while node is not None:
+            yield node[0]
+            node = node[1]
+        rear = []
+        node = self._rear
+        while node is not None:
+            rear.append(node[0])
+            node = node[1]
+        yield from reversed(rear)
+
+    def peek(self) -> Any:
+        """
+        Return the item at the front of this PersistentQueue.
+
+        Raise IndexError if this PersistentQueue is empty.
+
+        >>> PersistentQueue('ab').peek()
+        'a'
+        """
+        if self._front is None:
+            raise IndexError("peek from an empty PersistentQueue")
+        return self._front[0]
+
+    def push(self, item: Any) -> 'PersistentQueue':
+        """
+        Return a PersistentQueue holding the items of this one followed by
+        item.
+
+        >>> q = PersistentQueue('a')
+        >>> list(q.push('b')), list(q)
+        (['a', 'b'], ['a'])
+        """
+        if self._front is None:
+            return PersistentQueue._make((item, None), None, 1)
+        return PersistentQueue._make(self._front, (item, self._rear),
+                                     self._length + 1)
+
+    def pop(self) -> 'PersistentQueue':
+        """
+        Return a PersistentQueue holding the items of this one except the one
+        at its front.
+
+        Raise IndexError if this PersistentQueue is empty.
+
+        >>> q = PersistentQueue('ab')
+        >>> list(q.pop()), list(q)
+        (['b'], ['a', 'b'])
+        >>> list(q.push('c').pop().pop())
+        ['c']
+        """
+        if self._front is None:
+            raise IndexError("pop from an empty PersistentQueue")
+        return PersistentQueue._make(self._front[1], self._rear,
+                                     self._length - 1)
+
+    def replace_front(self, item: Any) -> 'PersistentQueue':
+        """
+        Return a PersistentQueue holding the items of this one, except with
+        item in place of the one at its front.
+
+        Raise IndexError if this PersistentQueue is empty.
+
+        >>> list(PersistentQueue('ab').replace_front('c'))
+        ['c', 'b']
+        """
+        if self._front is None:
+            raise IndexError("replace_front on an empty PersistentQueue")
+        return PersistentQueue._make((item, self._front[1]), self._rear,
+                                     self._length)
+
+    def __repr__(self) -> str:
+        """
+        Return a representation of this PersistentQueue.
+
+        >>> PersistentQueue([1, 2])
+        PersistentQueue([1, 2])
+        """
+        return "PersistentQueue({})".format(list(self))
+
+
+class RunLengthQueue:
+    """
+    A class representing an immutable first-in, first-out queue that stores
+    runs of equal items as (item, count) pairs.
+
+    It has the same methods as PersistentQueue. All but the last run are kept
+    in a PersistentQueue of runs; the last run is kept on its own so that
+    push() can lengthen it. push(), peek() and pop() are O(1) like
+    PersistentQueue's, and memory scales with the number of runs.
+    """
+    __slots__ = ['_runs', '_last', '_length']
+    _runs: PersistentQueue
+    _last: Tuple[Any, int]
+    _length: int
+
+    def __init__(self, items: Any = ()) -> None:
+        """
+        Initialize this RunLengthQueue to hold items, front first.
+
+        >>> q = RunLengthQueue('aabbba')
+        >>> q.get_runs()
+        [('a', 2), ('b', 3), ('a', 1)]
+        >>> len(q)
+        6
+        """
+        runs = []
+        for item in items:
+            if runs and runs[-1][0] == item:
+                runs[-1] = (item, runs[-1][1] + 1)
+            else:
+                runs.append((item, 1))
+        self._last = runs.pop() if runs else None
+        self._runs = PersistentQueue(runs)
+        self._length = sum(count for _, count in runs) + \
+            (self._last[1] if self._last else 0)
+
+    @classmethod
+    def _make(cls, runs: PersistentQueue, last: Tuple[Any, int],
+              length: int) -> 'RunLengthQueue':
+        """
+        Return a RunLengthQueue with runs before its last run last, holding
+        length items.
+        """
+        queue = cls.__new__(cls)
+        queue._runs = runs
+        queue._last = last
+        queue._length = length
+        return queue
+
+    def __len__(self) -> int:
+        """
+        Return the number of items in this RunLengthQueue.
+
+        >>> len(RunLengthQueue('aab'))
+        3
+        """
+        return self._length
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Return an iterator over the items in this RunLengthQueue, front
+        first.
+
+        >>> list(RunLengthQueue('ab').push('b'))
+        ['a', 'b', 'b']
+        """
+        for item, count in self.get_runs():
+            for _ in range(count):
+                yield item
+
+    def get_runs(self) -> list:
+        """
+        Return the (item, count) runs of this RunLengthQueue, front first.
+
+        >>> RunLengthQueue('abb').get_runs()
+        [('a', 1), ('b', 2)]
+        """
+        runs = list(self._runs)
+        if self._last is not None:
+            runs.append(self._last)
+        return runs
+
+    def peek(self) -> Any:
+        """
+        Return the item at the front of this RunLengthQueue.
+
+        Raise IndexError if this RunLengthQueue is empty.
+
+        >>> RunLengthQueue('ab').peek()
+        'a'
+        """
+        if self._runs:
+            return self._runs.peek()[0]
+        if self._last is None:
+            raise IndexError("peek from an empty RunLengthQueue")
+        return self._last[0]
+
+    def push(self, item: Any) -> 'RunLengthQueue':
+        """
+        Return a RunLengthQueue holding the items of this one followed by
+        item.
+
+        >>> q = RunLengthQueue('a')
+        >>> q.push('a').get_runs(), q.get_runs()
+        ([('a', 2)], [('a', 1)])
+        >>> q.push('b').get_runs()
+        [('a', 1), ('b', 1)]
+        """
+        last = self._last
+        if last is not None and last[0] == item:
+            return RunLengthQueue._make(self._runs, (item, last[1] + 1),
+                                        self._length + 1)
+        runs = self._runs if last is None else self._runs.push(last)
+        return RunLengthQueue._make(runs, (item, 1), self._length + 1)
+
+    def pop(self) -> 'RunLengthQueue':
+        """
+        Return a RunLengthQueue holding the items of this one except the one
+        at its front.
+
+        Raise IndexError if this RunLengthQueue is empty.
+
+        >>> q = RunLengthQueue('aab')
+        >>> q.pop().get_runs(), q.get_runs()
+        ([('a', 1), ('b', 1)], [('a', 2), ('b', 1)])
+        >>> q.pop().pop().pop().get_runs()
+        []
+        """
+        if self._runs:
+            item, count = self._runs.peek()
+            if count > 1:
+                runs = self._runs.replace_front((item, count - 1))
+            else:
+                runs = self._runs.pop()
+            return RunLengthQueue._make(runs, self._last, self._length - 1)
+        if self._last is None:
+            raise IndexError("pop from an empty RunLengthQueue")
+        item, count = self._last
+        last = (item, count - 1) if count > 1 else None
+        return RunLengthQueue._make(self._runs, last, self._length - 1)
+
+    def __repr__(self) -> str:
+        """
+        Return a representation of this RunLengthQueue.
+
+        >>> RunLengthQueue([1, 1, 2])
+        RunLengthQueue([1, 1, 2])
+        """
+        return "RunLengthQueue({})".format(list(self))
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config='a2_pyta.txt')
@@ -5,9 +5,23 @@ Docstring examples are not required for Playstyles.
 You are responsible for implementing the get_state_score function, as well as
 creating classes for both Iterative Minimax and Recursive Minimax.
 """
-from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Tuple
+import math
 import random
-from a2_tree import State
+import time
+from a2_tree import State, MCTSNode
+from a2_transposition_table import TranspositionTable
+from a2_search_stats import SearchStats
+from a2_game_state import GameState, play, get_game_state_score
+import a2_tablebase
+
+# The scores of states already searched by get_state_score, shared by every
+# minimax playstyle.
+TRANSPOSITION_TABLE = TranspositionTable()
+
+# Bounds on the scores of states that AlphaBetaMinimax has cut off.
+BOUND_TABLE = TranspositionTable()
 
 
 class Playstyle:
@@ -15,10 +29,14 @@ class Playstyle:
     The Playstyle superclass.
 
     is_manual - Whether the class is a manual Playstyle or not.
+    can_ponder - Whether the attack this Playstyle picks only depends on the
+                 state of its battle_queue, so that it can be searched for
+                 ahead of time, while the other player picks their attack.
     battle_queue - The BattleQueue corresponding to the game this Playstyle is
                    being used in.
     """
     is_manual: bool
+    can_ponder: bool
     battle_queue: 'BattleQueue'
 
     def __init__(self, battle_queue: 'BattleQueue') -> None:
@@ -27,6 +45,7 @@ class Playstyle:
         """
         self.battle_queue = battle_queue
         self.is_manual = True
+        self.can_ponder = False
 
     def select_attack(self, parameter: Any = None) -> str:
         """
@@ -106,11 +125,28 @@ class RandomPlaystyle(Playstyle):
         return RandomPlaystyle(new_battle_queue)
 
 
-def get_state_score(battle_queue: 'BattleQueue') -> int:
+def _get_terminal_score(battle_queue: 'BattleQueue') -> int:
+    """
+    Return the score of battle_queue, whose game is over, for the next player
+    who was supposed to act.
+    """
+    if battle_queue.get_winner() is None:
+        return 0
+    if type(battle_queue.get_winner()) == type(battle_queue.peek()):
+        return battle_queue.get_winner().get_hp()
+    return battle_queue.get_winner().get_hp() * -1
+
+
+def get_state_score(battle_queue: 'BattleQueue',
+                    table: TranspositionTable = None,
+                    stats: SearchStats = None) -> int:
     """
     Return an int corresponding to the highest score that the next player in
     battle_queue can guarantee.
 
+    Scores are looked up in and stored to table, which defaults to the
+    module's TRANSPOSITION_TABLE. The work done is counted in stats, if given.
+
     For a state that's over, the score is the HP of the character who still has
     HP if the next player who was supposed to act is the winner. If the next
     player who was supposed to act is the loser, then the score is -1 * the
@@ -138,41 +174,68 @@ def get_state_score(battle_queue: 'BattleQueue') -> int:
     >>> get_state_score(bq)
     -10
     """
+    if table is None:
+        table = TRANSPOSITION_TABLE
+    if stats is not None:
+        stats.record_copy()
+    return _get_score(battle_queue.copy(), table, stats)
+
+
+def _get_score(battle_queue: 'BattleQueue', table: TranspositionTable,
+               stats: SearchStats = None, depth: int = 0) -> int:
+    """
+    Return the highest score that the next player in battle_queue can
+    guarantee, searching battle_queue in place with apply_move() and
+    undo_move().
+
+    battle_queue is depth moves ahead of where the search started, and the
+    work done is counted in stats, if given.
+    """
     if battle_queue.is_over():
-        if battle_queue.get_winner() is None:
-            return 0
-        if type(battle_queue.get_winner()) == type(battle_queue.peek()):
-            return battle_queue.get_winner().get_hp()
-        return battle_queue.get_winner().get_hp() * -1
-    action = battle_queue.peek().get_available_actions()
+        if stats is not None:
+            stats.record_terminal(depth)
+        return _get_terminal_score(battle_queue)
+    key = battle_queue.get_state_key()
+    score = table.lookup(key)
+    if stats is not None:
+        stats.record_lookup(score is not None)
+        if score is None:
+            stats.record_node(depth)
+    if score is not None:
+        return score
+    current_player = battle_queue.peek()
     scores = []
-    for skill in action:
-        new_battlequeue = battle_queue.copy()
-        current_player = new_battlequeue.peek()
-        if skill == 'A':
-            new_battlequeue.peek().attack()
-        else:
-            new_battlequeue.peek().special_attack()
-        if new_battlequeue.peek().get_available_actions() != []:
-            new_battlequeue.remove()
-        if type(current_player) == type(new_battlequeue.peek()):
-            scores.append(get_state_score(new_battlequeue))
+    for skill in current_player.get_available_actions():
+        battle_queue.apply_move(skill)
+        if type(current_player) == type(battle_queue.peek()):
+            scores.append(_get_score(battle_queue, table, stats, depth + 1))
         else:
-            scores.append(get_state_score(new_battlequeue) * -1)
-    return max(scores)
+            scores.append(_get_score(battle_queue, table, stats, depth + 1) *
+                          -1)
+        battle_queue.undo_move()
+    score = max(scores)
+    table.store(key, score)
+    return score
 
 
 class RecursiveMinimax(Playstyle):
     """
     A class representing Minimax writen recursively.
+
+    stats - the SearchStats each attack's search is counted in, or None.
     """
+    stats: SearchStats
 
-    def __init__(self, battlequeue: 'BattleQueue') -> None:
+    def __init__(self, battlequeue: 'BattleQueue',
+                 stats: SearchStats = None) -> None:
         """
-        Initializes the minimax with battlequeue battlequeue.
+        Initializes the minimax with battlequeue battlequeue, counting its
+        searches in stats if it's given.
         """
         super().__init__(battlequeue)
         self.is_manual = False
+        self.can_ponder = True
+        self.stats = stats
 
     def select_attack(self, parameter: Any = None) -> str:
         """
@@ -181,51 +244,70 @@ class RecursiveMinimax(Playstyle):
 
         Return 'X' if a valid move cannot be found.
         """
-        current_player = self.battle_queue.peek()
+        stats = self.stats
+        if stats is not None:
+            stats.start_move()
+            stats.record_copy()
+        battle_queue = self.battle_queue.copy()
+        current_player = battle_queue.peek()
         actions = current_player.get_available_actions()
         scores = []
         if not actions:
-            return 'X'
-        for skill in actions:
-            new_battlequeue = self.battle_queue.copy()
-            if skill == 'A':
-                new_battlequeue.peek().attack()
-            else:
-                new_battlequeue.peek().special_attack()
-            if new_battlequeue.peek().get_available_actions() != []:
-                new_battlequeue.remove()
-            if type(self.battle_queue.peek()) == type(new_battlequeue.peek()):
-                scores.append(get_state_score(new_battlequeue))
-            else:
-                scores.append(get_state_score(new_battlequeue) * -1)
-        return actions[scores.index(max(scores))]
+            skill = 'X'
+        else:
+            if stats is not None:
+                stats.record_node(0)
+            for skill in actions:
+                battle_queue.apply_move(skill)
+                if type(current_player) == type(battle_queue.peek()):
+                    scores.append(_get_score(battle_queue,
+                                             TRANSPOSITION_TABLE, stats, 1))
+                else:
+                    scores.append(_get_score(battle_queue,
+                                             TRANSPOSITION_TABLE, stats, 1) *
+                                  -1)
+                battle_queue.undo_move()
+            skill = actions[scores.index(max(scores))]
+        if stats is not None:
+            stats.end_move(skill)
+        return skill
 
     def copy(self, new_battle_queue: 'BattleQueue') -> 'Playstyle':
         """
         Return a copy of this RandomPlaystyle which uses the
         BattleQueue new_battle_queue.
         """
-        return RecursiveMinimax(new_battle_queue)
+        return RecursiveMinimax(new_battle_queue, self.stats)
 
 
 class IterativeMinimax(Playstyle):
     """
     A class representing Minimax writen iteratively.
+
+    Like RecursiveMinimax, the scores of states it finishes searching are
+    stored to, and looked up in, the module's TRANSPOSITION_TABLE.
+
+    stats - the SearchStats each attack's search is counted in, or None.
     """
+    stats: SearchStats
 
-    def __init__(self, battlequeue: 'BattleQueue') -> None:
+    def __init__(self, battlequeue: 'BattleQueue',
+                 stats: SearchStats = None) -> None:
         """
-        Initializes the iterative minimax playstyle with battlequeue battlequeue
+        Initializes the iterative minimax playstyle with battlequeue
+        battlequeue, counting its searches in stats if it's given.
         """
         super().__init__(battlequeue)
         self.is_manual = False
+        self.can_ponder = True
+        self.stats = stats
 
     def copy(self, new_battle_queue: 'BattleQueue') -> 'Playstyle':
         """
         Return a copy of this RandomPlaystyle which uses the
         BattleQueue new_battle_queue.
         """
-        return IterativeMinimax(new_battle_queue)
+        return IterativeMinimax(new_battle_queue, self.stats)
 
     def select_attack(self, parameter: Any = None) -> str:
         """
@@ -234,66 +316,616 @@ class IterativeMinimax(Playstyle):
 
         Return 'X' if a valid move cannot be found.
         """
-        new_bq = self.battle_queue.copy()
-        stack = []
-        state1 = State(new_bq)
-        stack.append(state1)
-        list_of_states = []
-        if not state1.bq.peek().get_available_actions():
+        stats = self.stats
+        if stats is not None:
+            stats.start_move()
+            stats.record_copy()
+        battle_queue = self.battle_queue.copy()
+        if not battle_queue.peek().get_available_actions():
+            if stats is not None:
+                stats.end_move('X')
             return 'X'
+        root = State(None, battle_queue.peek().get_available_actions())
+        root.player = type(battle_queue.peek())
+        if stats is not None:
+            stats.record_node(0)
+        # The States from root to the one being searched. battle_queue is
+        # always in the game state of the last one.
+        stack = [root]
         while stack:
-            current_state = stack.pop()
-            if current_state.bq.is_over():
-                if not current_state.bq.get_winner():
-                    current_state.score = 0
-                elif type(current_state.bq.get_winner()) == \
-                        type(current_state.bq.peek()):
-                    current_state.score = current_state.bq.get_winner().get_hp()
-                else:
-                    current_state.score = \
-                        current_state.bq.get_winner().get_hp() * -1
-                current_state.best_action = current_state.prev_action
-                list_of_states.append(current_state.best_action)
+            current_state = stack[-1]
+            if not current_state.actions:
+                # Every child has been folded in, so step back out of
+                # current_state and fold it into its parent.
+                stack.pop()
+                if stack:
+                    TRANSPOSITION_TABLE.store(battle_queue.get_state_key(),
+                                              current_state.score)
+                    battle_queue.undo_move()
+                    stack[-1].fold(current_state)
+                continue
+            # Step into the next child of current_state.
+            child = State(current_state.actions.pop())
+            battle_queue.apply_move(child.prev_action)
+            child.player = type(battle_queue.peek())
+            if battle_queue.is_over():
+                if stats is not None:
+                    stats.record_terminal(len(stack))
+                child.score = _get_terminal_score(battle_queue)
+                battle_queue.undo_move()
+                current_state.fold(child)
+                continue
+            child.score = TRANSPOSITION_TABLE.lookup(
+                battle_queue.get_state_key())
+            if stats is not None:
+                stats.record_lookup(child.score is not None)
+            if child.score is not None:
+                battle_queue.undo_move()
+                current_state.fold(child)
             else:
-                if current_state.children:
-                    c1, c2 = None, None
-                    temp_bq = current_state.bq.copy()
-                    if type(temp_bq.peek()) == \
-                            type(current_state.children[0].bq.peek()):
-                        c1 = current_state.children[0].score
-                    else:
-                        c1 = current_state.children[0].score * -1
-                    if len(current_state.children) == 2:
-                        if type(temp_bq.peek()) == \
-                                type(current_state.children[1].bq.peek()):
-                            c2 = current_state.children[1].score
-                        else:
-                            c2 = current_state.children[1].score * -1
-                    if c2 is None or c1 >= c2:
-                        current_state.score = c1
-                        current_state.best_action = \
-                            current_state.children[0].prev_action
-                    else:
-                        current_state.score = c2
-                        current_state.best_action = \
-                            current_state.children[1].prev_action
-                    list_of_states.append(current_state.best_action)
-                else:
-                    action = current_state.bq.peek().get_available_actions()
-                    for skill in action:
-                        my_bq = current_state.bq.copy()
-                        if skill == 'A':
-                            my_bq.peek().attack()
-                        else:
-                            my_bq.peek().special_attack()
-                        if my_bq.peek().get_available_actions() != []:
-                            my_bq.remove()
-                        new_state = State(my_bq, skill)
-                        current_state.children.append(new_state)
-                    stack.append(current_state)
-                    for child in current_state.children:
-                        stack.append(child)
-        return list_of_states[-1]
+                if stats is not None:
+                    stats.record_node(len(stack))
+                child.actions = \
+                    battle_queue.peek().get_available_actions()[::-1]
+                stack.append(child)
+        if stats is not None:
+            stats.end_move(root.best_action)
+        return root.best_action
+
+
+def _order_moves(character: 'Character', actions: List[str]) -> List[str]:
+    """
+    Return actions, which are available to character, in the order they should
+    be searched: 'S' goes first if character's special attack hits harder than
+    its normal attack.
+    """
+    if len(actions) == 2 and character.get_skill('S').get_damage() > \
+            character.get_skill('A').get_damage():
+        return ['S', 'A']
+    return actions
+
+
+def _get_alpha_beta_score(battle_queue: 'BattleQueue', alpha: float,
+                          beta: float, table: TranspositionTable) -> int:
+    """
+    Return the score that the next player in battle_queue can guarantee if it
+    lies strictly between alpha and beta. Otherwise, return a bound on it: a
+    score that is at most alpha if the real score is at most alpha, or at
+    least beta if the real score is at least beta. battle_queue is searched
+    in place with apply_move() and undo_move().
+
+    Exact scores are stored to table, so that it can be shared with
+    get_state_score. Bounds are stored to BOUND_TABLE as (lower, upper) pairs.
+    """
+    if battle_queue.is_over():
+        return _get_terminal_score(battle_queue)
+    key = battle_queue.get_state_key()
+    score = table.lookup(key)
+    if score is not None:
+        return score
+    lower, upper = BOUND_TABLE.lookup(key) or (-math.inf, math.inf)
+    if lower >= upper or lower >= beta:
+        return lower
+    if upper <= alpha:
+        return upper
+    # The search is only cut off, and best only classified, against the
+    # window passed in: a window narrowed to the stored bounds can close up
+    # and cut the search off before best is a bound on anything.
+    current_player = battle_queue.peek()
+    best = -math.inf
+    window = alpha
+    for skill in _order_moves(current_player,
+                              current_player.get_available_actions()):
+        battle_queue.apply_move(skill)
+        if type(current_player) == type(battle_queue.peek()):
+            score = _get_alpha_beta_score(battle_queue, window, beta, table)
+        else:
+            score = -_get_alpha_beta_score(battle_queue, -beta, -window,
+                                           table)
+        battle_queue.undo_move()
+        best = max(best, score)
+        window = max(window, score)
+        if window >= beta:
+            break
+    if best <= alpha:
+        upper = min(upper, best)
+    elif best >= beta:
+        lower = max(lower, best)
+    else:
+        table.store(key, best)
+        return best
+    if lower <= upper:
+        BOUND_TABLE.store(key, (lower, upper))
+    return best
+
+
+class AlphaBetaMinimax(Playstyle):
+    """
+    A class representing Minimax with alpha-beta pruning.
+
+    Picks the same attack as RecursiveMinimax, but skips the parts of the game
+    tree that cannot change which attack that is.
+    """
+
+    def __init__(self, battlequeue: 'BattleQueue') -> None:
+        """
+        Initializes the alpha-beta minimax with battlequeue battlequeue.
+        """
+        super().__init__(battlequeue)
+        self.is_manual = False
+        self.can_ponder = True
+
+    def select_attack(self, parameter: Any = None) -> str:
+        """
+        Return the attack for the next character in this Playstyle's
+        battle_queue to perform.
+
+        Return 'X' if a valid move cannot be found.
+        """
+        battle_queue = self.battle_queue.copy()
+        current_player = battle_queue.peek()
+        actions = current_player.get_available_actions()
+        if not actions:
+            return 'X'
+        best_score, best_skill = None, None
+        for skill in _order_moves(current_player, actions):
+            battle_queue.apply_move(skill)
+            # Ties go to the attack RecursiveMinimax would pick, so a child
+            # that only matches best_score still needs its exact score.
+            alpha = -math.inf if best_score is None else best_score - 1
+            if type(current_player) == type(battle_queue.peek()):
+                score = _get_alpha_beta_score(battle_queue, alpha,
+                                              math.inf, TRANSPOSITION_TABLE)
+            else:
+                score = -_get_alpha_beta_score(battle_queue, -math.inf,
+                                               -alpha, TRANSPOSITION_TABLE)
+            battle_queue.undo_move()
+            if best_score is None or score > best_score or \
+                    (score == best_score and
+                     actions.index(skill) < actions.index(best_skill)):
+                best_score, best_skill = score, skill
+        return best_skill
+
+    def copy(self, new_battle_queue: 'BattleQueue') -> 'Playstyle':
+        """
+        Return a copy of this AlphaBetaMinimax which uses the
+        BattleQueue new_battle_queue.
+        """
+        return AlphaBetaMinimax(new_battle_queue)
+
+
+class ParallelMinimax(Playstyle):
+    """
+    A class representing Minimax that scores the subtrees below the root in
+    parallel, each in its own process.
+
+    Picks the same attack as RecursiveMinimax. Subtrees are sent to worker
+    processes as GameStates.
+
+    max_workers - the number of worker processes to use, or None for one per
+                  CPU.
+    split_depth - 1 to score each of the root's children in parallel, or 2 to
+                  score each of its grandchildren in parallel.
+    """
+    max_workers: int
+    split_depth: int
+
+    def __init__(self, battlequeue: 'BattleQueue', max_workers: int = None,
+                 split_depth: int = 2) -> None:
+        """
+        Initializes the parallel minimax with battlequeue battlequeue, using
+        max_workers processes and splitting the search split_depth levels
+        below the root.
+        """
+        super().__init__(battlequeue)
+        self.is_manual = False
+        self.can_ponder = True
+        self.max_workers = max_workers
+        self.split_depth = split_depth
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Return this ParallelMinimax's pool of worker processes, starting it
+        the first time.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        """
+        Shut down this ParallelMinimax's worker processes, if it started any,
+        cancelling any scores they haven't started on.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def select_attack(self, parameter: Any = None) -> str:
+        """
+        Return the attack for the next character in this Playstyle's
+        battle_queue to perform.
+
+        Return 'X' if a valid move cannot be found.
+        """
+        actions = self.battle_queue.peek().get_available_actions()
+        if not actions:
+            return 'X'
+        state = GameState.from_battle_queue(self.battle_queue)
+        children = [play(state, skill) for skill in actions]
+
+        # Each child is either scored in a worker itself, or, if the search
+        # splits one level deeper, from the scores of its own children.
+        splits = []
+        for child in children:
+            if self.split_depth < 2 or child.is_over():
+                splits.append(None)
+            else:
+                splits.append([play(child, skill)
+                               for skill in child.get_available_actions()])
+        leaves = set()
+        for child, split in zip(children, splits):
+            leaves.update([child] if split is None else split)
+        leaves = list(leaves)
+        leaf_scores = dict(zip(leaves, self._get_executor().map(
+            get_game_state_score, leaves)))
+
+        scores = []
+        for child, split in zip(children, splits):
+            if split is None:
+                score = leaf_scores[child]
+            else:
+                score = max(_signed_score(child, leaf, leaf_scores[leaf])
+                            for leaf in split)
+            scores.append(_signed_score(state, child, score))
+        return actions[scores.index(max(scores))]
+
+    def copy(self, new_battle_queue: 'BattleQueue') -> 'Playstyle':
+        """
+        Return a copy of this ParallelMinimax which uses the
+        BattleQueue new_battle_queue.
+        """
+        return ParallelMinimax(new_battle_queue, self.max_workers,
+                               self.split_depth)
+
+
+def _signed_score(state: GameState, child: GameState, score: int) -> int:
+    """
+    Return score, which is the score of child for its next player, as a
+    score for the next player of state, whose action led to child.
+    """
+    if state.classes[state.get_next_player()] == \
+            child.classes[child.get_next_player()]:
+        return score
+    return -score
+
+
+# How many points of HP one point of SP is worth to evaluate_state().
+SP_WEIGHT = 0.25
+
+
+def evaluate_state(battle_queue: 'BattleQueue') -> float:
+    """
+    Return an estimate of the score the next player in battle_queue can
+    guarantee, for when there's no time to search to the end of the game.
+
+    Games that are over get their real score. Otherwise, the estimate is
+    how much more HP the next player has than their enemy, plus SP_WEIGHT
+    for each point of SP they have over their enemy.
+
+    >>> from a2_battle_queue import BattleQueue
+    >>> from a2_characters import Rogue, Mage
+    >>> bq = BattleQueue()
+    >>> r = Rogue("r", bq, ManualPlaystyle(bq))
+    >>> m = Mage("m", bq, ManualPlaystyle(bq))
+    >>> r.enemy = m
+    >>> m.enemy = r
+    >>> bq.add(r)
+    >>> bq.add(m)
+    >>> m.set_hp(60)
+    >>> m.set_sp(80)
+    >>> evaluate_state(bq)
+    45.0
+    """
+    if battle_queue.is_over():
+        return _get_terminal_score(battle_queue)
+    player = battle_queue.peek()
+    return player.get_hp() - player.enemy.get_hp() + \
+        SP_WEIGHT * (player.get_sp() - player.enemy.get_sp())
+
+
+class _SearchTimeout(Exception):
+    """
+    Raised when a search runs out of time.
+    """
+
+
+def _get_depth_limited_score(battle_queue: 'BattleQueue', depth: int,
+                             deadline: float) -> Tuple[float, bool]:
+    """
+    Return (score, exact), where score is the score that the next player in
+    battle_queue can guarantee, searching depth moves ahead and estimating the
+    score of the states there with evaluate_state(). exact is whether the
+    search reached the end of the game everywhere, making score exact.
+
+    Exact scores are stored to and looked up in TRANSPOSITION_TABLE.
+
+    Raise _SearchTimeout once time.monotonic() passes deadline.
+    """
+    if battle_queue.is_over():
+        return _get_terminal_score(battle_queue), True
+    key = battle_queue.get_state_key()
+    score = TRANSPOSITION_TABLE.lookup(key)
+    if score is not None:
+        return score, True
+    if depth == 0:
+        return evaluate_state(battle_queue), False
+    if time.monotonic() > deadline:
+        raise _SearchTimeout
+    current_player = battle_queue.peek()
+    scores = []
+    exact = True
+    for skill in current_player.get_available_actions():
+        battle_queue.apply_move(skill)
+        score, child_exact = _get_depth_limited_score(battle_queue, depth - 1,
+                                                      deadline)
+        if type(current_player) != type(battle_queue.peek()):
+            score = -score
+        battle_queue.undo_move()
+        scores.append(score)
+        exact = exact and child_exact
+    if exact:
+        TRANSPOSITION_TABLE.store(key, max(scores))
+    return max(scores), exact
+
+
+class IterativeDeepeningMinimax(Playstyle):
+    """
+    A class representing Minimax that searches one move deeper at a time
+    until it runs out of time.
+
+    States at the search horizon are scored by evaluate_state(). When time
+    runs out, the attack picked by the deepest finished search is returned.
+    If a search reaches the end of the game everywhere, its attack is the one
+    RecursiveMinimax would pick.
+
+    time_budget - the number of seconds each select_attack() may take.
+    max_depth - the deepest search to try, at least 1, or None to keep going
+                until the search is exact or time runs out.
+    """
+    time_budget: float
+    max_depth: int
+
+    def __init__(self, battlequeue: 'BattleQueue', time_budget: float = 0.5,
+                 max_depth: int = None) -> None:
+        """
+        Initializes the iterative deepening minimax with battlequeue
+        battlequeue, spending at most time_budget seconds on each attack and
+        searching at most max_depth moves ahead.
+
+        Raise ValueError if max_depth is less than 1, since the shallowest
+        search looks 1 move ahead.
+        """
+        if max_depth is not None and max_depth < 1:
+            raise ValueError("max_depth must be at least 1, not {}".format(
+                max_depth))
+        super().__init__(battlequeue)
+        self.is_manual = False
+        self.can_ponder = True
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+
+    def select_attack(self, parameter: Any = None) -> str:
+        """
+        Return the attack for the next character in this Playstyle's
+        battle_queue to perform.
+
+        Return 'X' if a valid move cannot be found.
+        """
+        deadline = time.monotonic() + self.time_budget
+        battle_queue = self.battle_queue.copy()
+        current_player = battle_queue.peek()
+        actions = current_player.get_available_actions()
+        if not actions:
+            return 'X'
+        best_skill = actions[0]
+        depth = 0
+        exact = False
+        while not exact and depth != self.max_depth:
+            depth += 1
+            scores = []
+            exact = True
+            try:
+                for skill in actions:
+                    battle_queue.apply_move(skill)
+                    score, child_exact = _get_depth_limited_score(
+                        battle_queue, depth - 1, deadline)
+                    if type(current_player) != type(battle_queue.peek()):
+                        score = -score
+                    battle_queue.undo_move()
+                    scores.append(score)
+                    exact = exact and child_exact
+            except _SearchTimeout:
+                break
+            best_skill = actions[scores.index(max(scores))]
+        return best_skill
+
+    def copy(self, new_battle_queue: 'BattleQueue') -> 'Playstyle':
+        """
+        Return a copy of this IterativeDeepeningMinimax which uses the
+        BattleQueue new_battle_queue.
+        """
+        return IterativeDeepeningMinimax(new_battle_queue, self.time_budget,
+                                         self.max_depth)
+
+
+class MCTSPlaystyle(Playstyle):
+    """
+    A class representing Monte Carlo tree search, using UCT to pick which
+    part of the game tree to simulate next and RandomPlaystyle to play each
+    simulation out to the end of the game.
+
+    Simulations are played on one copy of the BattleQueue, and undone with
+    undo_move() once they're finished. A simulation's reward is its final
+    score over 100, for the character who picked each action along the way.
+
+    simulations - the number of simulations to run for each attack, or None
+                  to run until time_budget runs out.
+    time_budget - the number of seconds each select_attack() may take, or
+                  None for no limit.
+    exploration - how much UCT favours actions that have been simulated less.
+    """
+    simulations: int
+    time_budget: float
+    exploration: float
+
+    def __init__(self, battlequeue: 'BattleQueue', simulations: int = 1000,
+                 time_budget: float = None,
+                 exploration: float = math.sqrt(2)) -> None:
+        """
+        Initializes the Monte Carlo tree search with battlequeue battlequeue,
+        running simulations simulations for each attack, or for up to
+        time_budget seconds, whichever comes first.
+
+        Raise ValueError if simulations and time_budget are both None, since
+        the search would never end, or if simulations is less than 1 or
+        time_budget isn't positive.
+        """
+        if simulations is None and time_budget is None:
+            raise ValueError("simulations and time_budget can't both be None")
+        if simulations is not None and simulations < 1:
+            raise ValueError("simulations must be at least 1, not {}".format(
+                simulations))
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be positive, not {}".format(
+                time_budget))
+        super().__init__(battlequeue)
+        self.is_manual = False
+        self.simulations = simulations
+        self.time_budget = time_budget
+        self.exploration = exploration
+
+    def select_attack(self, parameter: Any = None) -> str:
+        """
+        Return the attack for the next character in this Playstyle's
+        battle_queue to perform: the one that was simulated the most.
+
+        Return 'X' if a valid move cannot be found.
+        """
+        battle_queue = self.battle_queue.copy()
+        actions = battle_queue.peek().get_available_actions()
+        if not actions:
+            return 'X'
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.monotonic() + self.time_budget
+        rollout = RandomPlaystyle(battle_queue)
+        root = MCTSNode(None, None, type(battle_queue.peek()), actions)
+        simulation = 0
+        while self.simulations is None or simulation < self.simulations:
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            simulation += 1
+            self._simulate(root, battle_queue, rollout)
+        if not root.children:
+            return actions[0]
+        best = root.children[0]
+        for child in root.children:
+            if child.visits > best.visits:
+                best = child
+        return best.prev_action
+
+    def _simulate(self, root: MCTSNode, battle_queue: 'BattleQueue',
+                  rollout: RandomPlaystyle) -> None:
+        """
+        Run one simulation from root, which is the state of battle_queue, and
+        add its reward to the nodes it passed through. battle_queue is left
+        as it was.
+        """
+        node = root
+        moves = 0
+        # Follow UCT down through nodes whose actions are all expanded.
+        while not node.actions and node.children:
+            node = max(node.children,
+                       key=lambda child: child.get_uct(self.exploration))
+            battle_queue.apply_move(node.prev_action)
+            moves += 1
+        # Expand one new child.
+        if node.actions:
+            action = node.actions.pop()
+            battle_queue.apply_move(action)
+            moves += 1
+            player = battle_queue.peek()
+            child = MCTSNode(action, node, type(player),
+                             [] if battle_queue.is_over()
+                             else player.get_available_actions())
+            node.children.append(child)
+            node = child
+        # Play randomly to the end of the game.
+        while not battle_queue.is_over():
+            battle_queue.apply_move(rollout.select_attack())
+            moves += 1
+        reward = _get_terminal_score(battle_queue) / 100
+        last_player = type(battle_queue.peek())
+        for _ in range(moves):
+            battle_queue.undo_move()
+        while node is not root:
+            node.visits += 1
+            if node.parent.player == last_player:
+                node.total += reward
+            else:
+                node.total -= reward
+            node = node.parent
+        root.visits += 1
+
+    def copy(self, new_battle_queue: 'BattleQueue') -> 'Playstyle':
+        """
+        Return a copy of this MCTSPlaystyle which uses the BattleQueue
+        new_battle_queue.
+        """
+        return MCTSPlaystyle(new_battle_queue, self.simulations,
+                             self.time_budget, self.exploration)
+
+
+class TablebasePlaystyle(Playstyle):
+    """
+    A class representing a Playstyle that looks its attacks up in the
+    tablebase built by a2_tablebase.py.
+
+    Positions that aren't in the tablebase (e.g. because it hasn't been built,
+    the game didn't start at full HP and SP, or a Sorcerer doesn't use the
+    default SkillDecisionTree) are searched with AlphaBetaMinimax instead.
+    """
+
+    def __init__(self, battlequeue: 'BattleQueue') -> None:
+        """
+        Initializes the tablebase playstyle with battlequeue battlequeue.
+        """
+        super().__init__(battlequeue)
+        self.is_manual = False
+
+    def select_attack(self, parameter: Any = None) -> str:
+        """
+        Return the attack for the next character in this Playstyle's
+        battle_queue to perform.
+
+        Return 'X' if a valid move cannot be found.
+        """
+        if not self.battle_queue.peek().get_available_actions():
+            return 'X'
+        result = a2_tablebase.lookup(
+            GameState.from_battle_queue(self.battle_queue))
+        if result is None:
+            return AlphaBetaMinimax(self.battle_queue).select_attack()
+        return result[1]
+
+    def copy(self, new_battle_queue: 'BattleQueue') -> 'Playstyle':
+        """
+        Return a copy of this TablebasePlaystyle which uses the
+        BattleQueue new_battle_queue.
+        """
+        return TablebasePlaystyle(new_battle_queue)
 
 
 if __name__ == '__main__':
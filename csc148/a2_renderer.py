@@ -0,0 +1,99 @@
+"""
+The DirtyRenderer class for the A2 UI.
+
+The UI used to repaint its whole window every frame, even when only a sprite
+had moved on a frame. A DirtyRenderer is told what each part of the window
+shows every frame, but only redraws, and only passes to
+pygame.display.update(), the areas whose contents changed.
+"""
+from typing import Any, Dict, List, Tuple
+import pygame
+
+# What to draw: a source surface, where to draw it, and the area of the
+# source to draw, or None for all of it, as passed to Surface.blit().
+Blit = Tuple[pygame.Surface, Any, Any]
+
+
+class DirtyRenderer:
+    """
+    A class that draws layers onto a surface, redrawing only the areas that
+    changed since it last drew.
+
+    Each layer is named and drawn with a list of Blits. Layers are drawn in
+    the order they were first set, over a background colour, so later layers
+    cover earlier ones. A layer has changed when its list of Blits isn't equal
+    to the last one; surfaces are only equal to themselves, so sources that
+    are re-rendered every frame, rather than cached, are always redrawn.
+
+    surface - the surface layers are drawn onto.
+    """
+    surface: pygame.Surface
+    _colour: Tuple[int, int, int]
+    _layers: Dict[str, List[Blit]]
+    _rects: Dict[str, pygame.Rect]
+    _dirty: List[pygame.Rect]
+
+    def __init__(self, surface: pygame.Surface,
+                 colour: Tuple[int, int, int] = (255, 255, 255)) -> None:
+        """
+        Initialize this DirtyRenderer to draw onto surface, over colour. All
+        of surface is redrawn the first time it draws.
+        """
+        self.surface = surface
+        self._colour = colour
+        self._layers = {}
+        self._rects = {}
+        self._dirty = [surface.get_rect()]
+
+    def set_layer(self, name: str, blits: List[Blit]) -> None:
+        """
+        Set the layer called name to be drawn with blits. If that changes
+        what it draws, mark both the area it covered and the area it covers
+        as needing to be redrawn, unless they already are.
+        """
+        blits = [tuple(blit) for blit in blits]
+        if self._layers.get(name) == blits:
+            return
+        rect = _get_rect(blits)
+        for changed in [self._rects.get(name), rect]:
+            if changed is not None and changed.width and changed.height and \
+                    not any(area.contains(changed) for area in self._dirty):
+                self._dirty.append(changed)
+        self._layers[name] = blits
+        self._rects[name] = rect
+
+    def draw(self) -> List[pygame.Rect]:
+        """
+        Redraw every area of the surface that needs to be, and return those
+        areas, to be passed to pygame.display.update().
+        """
+        dirty = self._dirty
+        self._dirty = []
+        clip = self.surface.get_clip()
+        for area in dirty:
+            self.surface.set_clip(area)
+            self.surface.fill(self._colour, area)
+            for name, blits in self._layers.items():
+                if self._rects[name].colliderect(area):
+                    for blit in blits:
+                        self.surface.blit(*blit)
+        self.surface.set_clip(clip)
+        return dirty
+
+
+def _get_rect(blits: List[Blit]) -> pygame.Rect:
+    """
+    Return the smallest area covering everything blits draw.
+    """
+    rects = []
+    for source, dest, area in blits:
+        size = source.get_size() if area is None else pygame.Rect(area).size
+        rects.append(pygame.Rect((dest[0], dest[1]), size))
+    if not rects:
+        return pygame.Rect(0, 0, 0, 0)
+    return rects[0].unionall(rects[1:])
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config='a2_pyta.txt')
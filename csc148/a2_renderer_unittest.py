@@ -0,0 +1,87 @@
+"""
+Unittests for the DirtyRenderer for the A2 UI.
+
+These check that redrawing only the areas that changed leaves the surface
+looking the same as repainting all of it.
+"""
+import os
+import random
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from a2_renderer import DirtyRenderer
+
+
+def repaint(size, layers):
+    """
+    Return a surface of size with every one of layers, a list of lists of
+    blits, drawn onto it over white.
+    """
+    surface = pygame.Surface(size)
+    surface.fill((255, 255, 255))
+    for blits in layers:
+        for blit in blits:
+            surface.blit(*blit)
+    return surface
+
+
+class DirtyRendererUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up some overlapping squares of different colours to draw.
+        """
+        pygame.init()
+        self.squares = []
+        for colour in [(255, 0, 0), (0, 255, 0), (0, 0, 255), (0, 0, 0)]:
+            square = pygame.Surface((40, 30))
+            square.fill(colour)
+            self.squares.append(square)
+
+    def test_matches_repaint(self):
+        """
+        Test to make sure that after layers move and change, the surface
+        looks the same as if it had all been repainted.
+        """
+        random.seed(148)
+        size = (120, 100)
+        renderer = DirtyRenderer(pygame.Surface(size))
+        layers = [[] for _ in range(4)]
+        for i, blits in enumerate(layers):
+            renderer.set_layer(str(i), blits)
+        for frame in range(200):
+            for i in random.sample(range(4), random.randint(0, 3)):
+                layers[i] = [(random.choice(self.squares),
+                              (random.randint(-10, 100),
+                               random.randint(-10, 80)), None)
+                             for _ in range(random.randint(0, 2))]
+                renderer.set_layer(str(i), layers[i])
+            renderer.draw()
+
+            expected = pygame.image.tobytes(repaint(size, layers), 'RGB')
+            actual = pygame.image.tobytes(renderer.surface, 'RGB')
+            self.assertTrue(expected == actual,
+                            ("After frame {}, the surface differs from a " +
+                             "repaint.").format(frame))
+
+    def test_only_changes_are_drawn(self):
+        """
+        Test to make sure only the areas of layers that changed are redrawn.
+        """
+        renderer = DirtyRenderer(pygame.Surface((120, 100)))
+        renderer.set_layer('a', [(self.squares[0], (0, 0), None)])
+        renderer.set_layer('b', [(self.squares[1], (50, 50), None)])
+
+        self.assertEqual(renderer.draw(), [pygame.Rect(0, 0, 120, 100)])
+        renderer.set_layer('a', [(self.squares[0], (0, 0), None)])
+        self.assertEqual(renderer.draw(), [])
+        renderer.set_layer('b', [(self.squares[1], (60, 50), (0, 0, 20, 20))])
+        self.assertEqual(renderer.draw(), [pygame.Rect(50, 50, 40, 30)])
+        renderer.set_layer('a', [(self.squares[0], (0, 10), None)])
+        self.assertEqual(renderer.draw(), [pygame.Rect(0, 0, 40, 30),
+                                           pygame.Rect(0, 10, 40, 30)])
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
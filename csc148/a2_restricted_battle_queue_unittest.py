@@ -11,6 +11,7 @@ errors.
 Try playing your game through multiple times and trying various combinations of
 actions.
 """
+import random
 import unittest
 
 # Import the student solution
@@ -137,6 +138,25 @@ class RestrictedBattleQueueUnitTests(unittest.TestCase):
                          ("After emptying out a copy of a " +
                           "RestrictedBattleQueue, the original should still " +
                           "have elements in it."))
+
+    def test_copy_maintains_state_key(self):
+        """
+        Test to make sure a copy encodes to the same state key as the
+        RestrictedBattleQueue it was copied from.
+        """
+        self.p1.special_attack()
+        self.battle_queue.remove()
+        bq = self.battle_queue.copy()
+
+        expected = self.battle_queue.get_state_key()
+        actual = bq.get_state_key()
+
+        self.assertEqual(expected, actual,
+                         ("After copying the RestrictedBattleQueue:\n{}\n" +
+                          "the copy should have the state key {} but got " +
+                          "{} instead.").format(self.battle_queue,
+                                                expected,
+                                                actual))
         
     def test_add_extra_copies(self):
         """
@@ -215,6 +235,39 @@ class RestrictedBattleQueueUnitTests(unittest.TestCase):
                                        " -> ".join(actual)))        
         
     
+    def test_add_to_empty(self):
+        """
+        Test to make sure a character added to an empty queue is able to add.
+        """
+        self.battle_queue.remove()
+        self.battle_queue.remove()
+        self.battle_queue.add(self.p1)
+        self.battle_queue.add(self.p1)
+        self.battle_queue.add(self.p2)
+
+        commands = ["bq.remove()",
+                    "bq.remove()",
+                    "bq.add(r)",
+                    "bq.add(r)",
+                    "bq.add(m)"]
+
+        expected = ["R", "R", "M"]
+
+        actual = []
+
+        while not self.battle_queue.is_empty():
+            actual.append(self.battle_queue.remove().get_name())
+
+        self.assertEqual(expected, actual,
+                         ("After adding and removing from a " +
+                          "RestrictedBattleQueue using the following commands" +
+                          " where r is named R and m is named M:\n{}\n"
+                          "The RestrictedBattleQueue should be in the order:" +
+                          "\n{}\nBut got the following order instead:\n" +
+                          "{}").format("\n".join(commands),
+                                       " -> ".join(expected),
+                                       " -> ".join(actual)))
+
     def test_is_empty_ignores_low_sp(self):
         """
         Test to make sure is_empty correctly ignores characters with low SP.
@@ -290,6 +343,34 @@ class RestrictedBattleQueueUnitTests(unittest.TestCase):
                                                         self.p2,
                                                         expected,
                                                         actual))    
+
+    def test_find_num_matches_ables(self):
+        """
+        Test to make sure find_num keeps counting the entries able to add
+        correctly through a game, including after moves are undone.
+        """
+        rng = random.Random(148)
+        for _ in range(20):
+            bq = self.battle_queue.copy()
+            steps = 0
+            while not bq.is_over():
+                for character in [bq.peek(), bq.peek().enemy]:
+                    key = bq.get_state_key()
+                    players = [key[1][0], key[2][0]]
+                    expected = sum(1 for side, able in zip(key[3], key[4])
+                                   if players[side] == type(character) and
+                                   able)
+                    actual = bq.find_num(character)
+
+                    self.assertEqual(expected, actual,
+                                     ("When the BattleQueue looks like:\n" +
+                                      "{}\nfind_num({}) should return {} " +
+                                      "but got {} instead.").format(
+                                          bq, character, expected, actual))
+                bq.apply_move(rng.choice(bq.peek().get_available_actions()))
+                steps += 1
+                if steps % 5 == 0:
+                    bq.undo_move()
         
 if __name__ == "__main__":
     unittest.main(exit = False)
\ No newline at end of file
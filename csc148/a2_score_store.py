@@ -0,0 +1,207 @@
+"""
+The ScoreStore class for A2.
+
+A TranspositionTable forgets its scores when its process exits. A ScoreStore
+keeps the scores of solved positions in an sqlite database file instead, so
+that they're kept between matches and shared between processes, such as the
+workers of a tournament. A TranspositionTable backed by a ScoreStore looks up
+the scores it doesn't hold in the store, and writes every score it stores
+through to it.
+
+Call use_score_store() to back the tables every minimax playstyle uses with
+a store:
+    use_score_store('scores.sqlite')
+"""
+from typing import Dict, Hashable, List, Union
+import os
+import sqlite3
+import a2_game_state
+import a2_playstyle
+from a2_game_state import GameState
+from a2_skill_decision_tree import SkillDecisionTree
+from a2_transposition_table import TranspositionTable
+
+
+def encode_key(key: Hashable) -> Union[str, None]:
+    """
+    Return key, a state key from BattleQueue.get_state_key() or a GameState,
+    encoded as a string that's the same in every process. Return None if key
+    can't be encoded, which happens when a Sorcerer's SkillDecisionTree has
+    no signature.
+
+    >>> from a2_characters import Rogue, Mage
+    >>> encode_key(GameState((Rogue, Mage), (100, 90), (100, 100), (0, 1)))
+    'GameState((Rogue,Mage),(100,90),(100,100),(0,1),None,False,(None,None))'
+    """
+    if key is None or isinstance(key, (bool, int, str)):
+        return repr(key)
+    if isinstance(key, type):
+        return key.__name__
+    if isinstance(key, tuple):
+        parts = [encode_key(value) for value in key]
+        if None in parts:
+            return None
+        return '(' + ','.join(parts) + ')'
+    if isinstance(key, GameState):
+        state = encode_key(key.__getstate__())
+        return None if state is None else 'GameState' + state
+    if isinstance(key, SkillDecisionTree):
+        signature = key.get_signature()
+        return None if signature is None else 'Tree:' + signature
+    return None
+
+
+class ScoreStore:
+    """
+    A class representing the scores of solved positions, kept in an sqlite
+    database file.
+
+    Scores are keyed by encode_key(); scores whose keys can't be encoded
+    aren't kept. Every process opens its own connection to the file, so a
+    ScoreStore inherited by a forked process keeps working. Scores are
+    written to the file batch_size at a time, and when flush() is called;
+    other processes can only look up scores once they're written.
+
+    path - the path of the database file.
+    batch_size - the number of scores to hold before writing them.
+    """
+    path: str
+    batch_size: int
+    _connection: Union[sqlite3.Connection, None]
+    _pid: Union[int, None]
+    _pending: Dict[str, int]
+
+    def __init__(self, path: str, batch_size: int = 1000) -> None:
+        """
+        Initialize this ScoreStore to keep scores in the database file at
+        path, creating it if it doesn't exist, writing batch_size scores at a
+        time.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._connection = None
+        self._pid = None
+        self._pending = {}
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return this process's connection to the database file, opening it if
+        this process hasn't yet.
+        """
+        if self._pid != os.getpid():
+            # A connection or scores inherited from another process belong
+            # to it, so they're left alone.
+            self._pid = os.getpid()
+            self._pending = {}
+            self._connection = sqlite3.connect(self.path, timeout=60)
+            # Write-ahead logging lets processes look scores up while
+            # another one writes.
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS scores '
+                '(key TEXT PRIMARY KEY, score INTEGER NOT NULL) '
+                'WITHOUT ROWID')
+            self._connection.commit()
+        return self._connection
+
+    def __len__(self) -> int:
+        """
+        Return the number of scores in this ScoreStore, writing any scores not
+        yet written.
+        """
+        self.flush()
+        return self._connect().execute(
+            'SELECT COUNT(*) FROM scores').fetchone()[0]
+
+    def lookup(self, key: Hashable) -> Union[int, None]:
+        """
+        Return the score stored for key, or None if there isn't one.
+        """
+        encoded = encode_key(key)
+        if encoded is None:
+            return None
+        connection = self._connect()
+        score = self._pending.get(encoded)
+        if score is None:
+            row = connection.execute('SELECT score FROM scores WHERE key = ?',
+                                     (encoded,)).fetchone()
+            if row is not None:
+                score = row[0]
+        return score
+
+    def store(self, key: Hashable, score: int) -> None:
+        """
+        Store score for key, writing it along with the others held once
+        batch_size are held.
+        """
+        encoded = encode_key(key)
+        if encoded is None:
+            return
+        self._connect()
+        self._pending[encoded] = score
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the scores this ScoreStore holds to the database file. Scores
+        already written by other processes are kept.
+        """
+        connection = self._connect()
+        if self._pending:
+            with connection:
+                connection.executemany(
+                    'INSERT OR IGNORE INTO scores VALUES (?, ?)',
+                    self._pending.items())
+            self._pending = {}
+
+    def close(self) -> None:
+        """
+        Write the scores this ScoreStore holds, and close its connection.
+        """
+        if self._connection is not None and self._pid == os.getpid():
+            self.flush()
+            self._connection.close()
+        self._connection = None
+        self._pid = None
+
+
+def use_score_store(path: Union[str, None]) -> Union[ScoreStore, None]:
+    """
+    Back the TranspositionTables that the minimax playstyles and
+    get_game_state_score() use with a ScoreStore keeping scores in the
+    database file at path, and return it. If path is None, stop backing them
+    with one, and return None.
+    """
+    store = None if path is None else ScoreStore(path)
+    for table in _get_tables():
+        if table.score_store is not None:
+            table.score_store.close()
+        table.score_store = store
+    return store
+
+
+def flush_score_store() -> None:
+    """
+    Write any scores not yet written by the ScoreStore set by
+    use_score_store(), if there is one.
+    """
+    for table in _get_tables():
+        if table.score_store is not None:
+            table.score_store.flush()
+
+
+def _get_tables() -> List[TranspositionTable]:
+    """
+    Return the TranspositionTables of exact scores that the minimax
+    playstyles use.
+    """
+    return [a2_playstyle.TRANSPOSITION_TABLE,
+            a2_game_state.GAME_STATE_TABLE]
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config='a2_pyta.txt')
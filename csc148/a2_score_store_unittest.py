@@ -0,0 +1,176 @@
+"""
+Unittests for the ScoreStore for A2.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+import shutil
+import tempfile
+import unittest
+
+from a2_game import make_game, PLAYSTYLE_CLASSES
+from a2_game_state import GameState, get_game_state_score
+from a2_playstyle import get_state_score, TRANSPOSITION_TABLE, BOUND_TABLE
+from a2_score_store import ScoreStore, encode_key, use_score_store, \
+    flush_score_store
+from a2_skill_decision_tree import SkillDecisionTree, create_default_tree, f6
+from a2_skills import MageAttack
+from a2_transposition_table import TranspositionTable
+from a2_tournament import get_pairings, play_games
+
+
+def make_small_game(queue='n', first='r', second='m'):
+    """
+    Return a BattleQueue for a game between a character of class first and
+    one of class second, both low enough on HP to search quickly.
+    """
+    bq = make_game(queue, first, second, 'm', 'm')
+    for character in [bq.peek(), bq.peek().enemy]:
+        character.set_hp(30)
+    return bq
+
+
+def score_in_worker(path, state):
+    """
+    Return the score of state, found with a table backed by the ScoreStore at
+    path, as a worker process would.
+    """
+    store = ScoreStore(path)
+    score = get_game_state_score(state, TranspositionTable(score_store=store))
+    store.close()
+    return score
+
+
+class ScoreStoreUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up a temporary directory for database files.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'scores.sqlite')
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        use_score_store(None)
+        shutil.rmtree(self.directory)
+
+    def test_encode_key(self):
+        """
+        Test to make sure equal positions in different games encode the same
+        way, including Sorcerers with trees that pick the same skills, and
+        that keys with trees that can't be compared don't encode.
+        """
+        for first, second in [('r', 'm'), ('s', 'v')]:
+            key = make_small_game('r', first, second).get_state_key()
+            other = make_small_game('r', first, second).get_state_key()
+            self.assertEqual(encode_key(key), encode_key(other))
+            self.assertIsNotNone(encode_key(key))
+        self.assertIsNone(encode_key(
+            (SkillDecisionTree(MageAttack(), f6, 1),)))
+        self.assertEqual(encode_key((create_default_tree(),)),
+                         encode_key((create_default_tree(),)))
+
+    def test_round_trip(self):
+        """
+        Test to make sure scores are kept once a ScoreStore is closed, and
+        that scores for keys that can't be encoded are ignored.
+        """
+        store = ScoreStore(self.path, batch_size=2)
+        state = GameState((MageAttack, MageAttack), (1, 2), (3, 4), (0, 1))
+        store.store(('a', 1), 5)
+        store.store(state, -7)
+        store.store(object(), 3)
+        self.assertEqual(store.lookup(('a', 1)), 5)
+        store.close()
+
+        store = ScoreStore(self.path)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.lookup(('a', 1)), 5)
+        self.assertEqual(store.lookup(state), -7)
+        self.assertIsNone(store.lookup(('a', 2)))
+        store.close()
+
+    def test_search_warms_up(self):
+        """
+        Test to make sure a search backed by a ScoreStore finds the same score
+        as one that isn't, and that a later search with an empty table finds
+        it in the store without storing anything new.
+        """
+        for first, second in [('r', 'm'), ('s', 'v')]:
+            bq = make_small_game('r', first, second)
+            expected = get_state_score(bq, TranspositionTable())
+            store = ScoreStore(self.path)
+            actual = get_state_score(bq, TranspositionTable(score_store=store))
+            self.assertEqual(expected, actual)
+            size = len(store)
+            self.assertGreater(size, 0)
+            store.close()
+
+            store = ScoreStore(self.path)
+            table = TranspositionTable(score_store=store)
+            self.assertEqual(table.lookup(bq.get_state_key()), expected)
+            self.assertEqual(get_state_score(bq, table), expected)
+            self.assertEqual(len(store), size)
+            store.close()
+
+    def test_playstyles_use_store(self):
+        """
+        Test to make sure every minimax playstyle that searches in this
+        process keeps the scores it solves in the store, and still picks the
+        same attack as RecursiveMinimax.
+        """
+        bq = make_small_game()
+        expected = PLAYSTYLE_CLASSES['mr'](bq).select_attack()
+        for playstyle in ['mr', 'mi', 'ab', 'mt']:
+            TRANSPOSITION_TABLE.clear()
+            BOUND_TABLE.clear()
+            store = use_score_store(os.path.join(self.directory,
+                                                 playstyle + '.sqlite'))
+            actual = PLAYSTYLE_CLASSES[playstyle](bq).select_attack()
+            flush_score_store()
+
+            self.assertEqual(expected, actual,
+                             "{} picked {} but RecursiveMinimax picks "
+                             "{}.".format(playstyle, actual, expected))
+            self.assertGreater(len(store), 0,
+                               "{} stored no scores.".format(playstyle))
+            use_score_store(None)
+
+    def test_shared_between_processes(self):
+        """
+        Test to make sure scores written by worker processes can be looked up
+        by this one.
+        """
+        state = GameState.from_battle_queue(make_small_game())
+        with ProcessPoolExecutor(2) as executor:
+            scores = list(executor.map(score_in_worker, [self.path] * 2,
+                                       [state] * 2))
+
+        store = ScoreStore(self.path)
+        self.assertEqual(scores[0], scores[1])
+        self.assertEqual(store.lookup(state.cleaned()), scores[0])
+        store.close()
+
+    def test_tournament(self):
+        """
+        Test to make sure a tournament with a score store plays the same games
+        as one without, and keeps the scores its minimax players solve.
+        """
+        pairings = get_pairings(['n'], ['r', 'm'], ['ab'], 1)
+        expected = [result['winner'] for result in play_games(pairings, 0)]
+        # Otherwise, every score would already be held in memory.
+        TRANSPOSITION_TABLE.clear()
+        BOUND_TABLE.clear()
+        actual = [result['winner'] for result in
+                  play_games(pairings, 0, self.path)]
+
+        self.assertEqual(expected, actual)
+        store = ScoreStore(self.path)
+        self.assertGreater(len(store), 0)
+        self.assertIsNone(TRANSPOSITION_TABLE.score_store)
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
@@ -0,0 +1,184 @@
+"""
+The SearchStats class for A2.
+
+A SearchStats counts the work a minimax search does, so that playstyles can be
+compared and tuned. Pass one to get_state_score, RecursiveMinimax or
+IterativeMinimax in a2_playstyle.py to collect it.
+"""
+import json
+import time
+from typing import Dict, List, TextIO, Union
+
+# The counters kept for each move, in the order they're reported.
+COUNTERS = ['nodes', 'terminals', 'copies', 'max_depth', 'cache_hits',
+            'cache_misses']
+
+
+class SearchStats:
+    """
+    A class representing statistics about minimax searches.
+
+    The counters count the work done since the current move was started:
+        nodes - the number of states whose children were searched.
+        terminals - the number of states reached whose game was over.
+        copies - the number of times a BattleQueue was copied.
+        max_depth - the most moves ahead of the starting state reached.
+        cache_hits - the number of scores found in a TranspositionTable.
+        cache_misses - the number of scores not found in a TranspositionTable.
+
+    moves - a dict of the counters and wall time of each finished move, in
+            the order they were finished.
+    output - a file each finished move is written to as a line of JSON, or
+             None.
+    """
+    nodes: int
+    terminals: int
+    copies: int
+    max_depth: int
+    cache_hits: int
+    cache_misses: int
+    moves: List[Dict[str, Union[int, float, str]]]
+    output: Union[TextIO, None]
+
+    def __init__(self, output: TextIO = None) -> None:
+        """
+        Initialize this SearchStats with no moves, writing each finished move
+        to output as a line of JSON if output isn't None.
+
+        >>> s = SearchStats()
+        >>> s.nodes
+        0
+        >>> s.moves
+        []
+        """
+        self.output = output
+        self.moves = []
+        self._start_time = None
+        self.start_move()
+
+    def start_move(self) -> None:
+        """
+        Reset the counters and start timing a new move.
+
+        >>> s = SearchStats()
+        >>> s.record_node(3)
+        >>> s.start_move()
+        >>> s.nodes, s.max_depth
+        (0, 0)
+        """
+        self.nodes = 0
+        self.terminals = 0
+        self.copies = 0
+        self.max_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._start_time = time.perf_counter()
+
+    def record_node(self, depth: int) -> None:
+        """
+        Record that the children of a state depth moves ahead were searched.
+
+        >>> s = SearchStats()
+        >>> s.record_node(2)
+        >>> s.record_node(1)
+        >>> s.nodes, s.max_depth
+        (2, 2)
+        """
+        self.nodes += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def record_terminal(self, depth: int) -> None:
+        """
+        Record that a state depth moves ahead whose game is over was reached.
+
+        >>> s = SearchStats()
+        >>> s.record_terminal(4)
+        >>> s.terminals, s.max_depth
+        (1, 4)
+        """
+        self.terminals += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def record_copy(self) -> None:
+        """
+        Record that a BattleQueue was copied.
+
+        >>> s = SearchStats()
+        >>> s.record_copy()
+        >>> s.copies
+        1
+        """
+        self.copies += 1
+
+    def record_lookup(self, hit: bool) -> None:
+        """
+        Record a TranspositionTable lookup, which found a score if hit is True.
+
+        >>> s = SearchStats()
+        >>> s.record_lookup(True)
+        >>> s.record_lookup(False)
+        >>> s.record_lookup(False)
+        >>> s.cache_hits, s.cache_misses
+        (1, 2)
+        """
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    def end_move(self, action: str) -> Dict[str, Union[int, float, str]]:
+        """
+        Finish the current move, in which action was picked. Return a dict of
+        its counters and wall time in seconds, which is also added to moves
+        and written to output. Then start a new move.
+
+        >>> s = SearchStats()
+        >>> s.record_node(1)
+        >>> move = s.end_move('A')
+        >>> move['action'], move['nodes']
+        ('A', 1)
+        >>> len(s.moves), s.nodes
+        (1, 0)
+        """
+        move = {'action': action}
+        for counter in COUNTERS:
+            move[counter] = getattr(self, counter)
+        move['wall_time'] = time.perf_counter() - self._start_time
+        self.moves.append(move)
+        if self.output is not None:
+            self.output.write(json.dumps(move) + '\n')
+            self.output.flush()
+        self.start_move()
+        return move
+
+    def get_aggregate(self) -> Dict[str, Union[int, float]]:
+        """
+        Return the counters and wall time summed over every finished move,
+        except max_depth, which is the deepest of them, along with the number
+        of finished moves.
+
+        >>> s = SearchStats()
+        >>> s.record_node(3)
+        >>> _ = s.end_move('A')
+        >>> s.record_node(1)
+        >>> s.record_node(1)
+        >>> _ = s.end_move('S')
+        >>> aggregate = s.get_aggregate()
+        >>> aggregate['moves'], aggregate['nodes'], aggregate['max_depth']
+        (2, 3, 3)
+        """
+        aggregate = {'moves': len(self.moves)}
+        for counter in COUNTERS + ['wall_time']:
+            values = [move[counter] for move in self.moves]
+            if counter == 'max_depth':
+                aggregate[counter] = max(values, default=0)
+            else:
+                aggregate[counter] = sum(values)
+        return aggregate
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config='a2_pyta.txt')
@@ -0,0 +1,107 @@
+"""
+Unittests for SearchStats for A2.
+"""
+import io
+import json
+import unittest
+
+from a2_game import CHARACTER_CLASSES, PLAYSTYLE_CLASSES
+from a2_playstyle import ManualPlaystyle, TRANSPOSITION_TABLE, get_state_score
+from a2_battle_queue import BattleQueue
+from a2_search_stats import SearchStats
+MageConstructor = CHARACTER_CLASSES['m']
+RogueConstructor = CHARACTER_CLASSES['r']
+RecursiveMinimax = PLAYSTYLE_CLASSES['mr']
+IterativeMinimax = PLAYSTYLE_CLASSES['mi']
+
+
+class SearchStatsUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up a BattleQueue with a Rogue and a Mage low on HP.
+        """
+        TRANSPOSITION_TABLE.clear()
+        self.bq = BattleQueue()
+        self.rogue = RogueConstructor("r", self.bq, ManualPlaystyle(self.bq))
+        self.mage = MageConstructor("m", self.bq, ManualPlaystyle(self.bq))
+        self.rogue.enemy = self.mage
+        self.mage.enemy = self.rogue
+        self.bq.add(self.rogue)
+        self.bq.add(self.mage)
+        self.rogue.set_hp(20)
+        self.mage.set_hp(20)
+
+    def test_get_state_score_cache_hits(self):
+        """
+        Test to make sure searching the same state twice finds its score in
+        the TranspositionTable the second time.
+        """
+        stats = SearchStats()
+        get_state_score(self.bq, stats=stats)
+
+        self.assertEqual(stats.copies, 1)
+        self.assertEqual(stats.cache_misses, stats.nodes)
+        self.assertGreater(stats.terminals, 0)
+
+        stats.start_move()
+        get_state_score(self.bq, stats=stats)
+
+        self.assertEqual((stats.nodes, stats.cache_hits, stats.cache_misses),
+                         (0, 1, 0))
+
+    def test_moves_and_aggregate(self):
+        """
+        Test to make sure each select_attack is recorded as a move, and that
+        the aggregate adds them up.
+        """
+        stats = SearchStats()
+        minimax = RecursiveMinimax(self.bq, stats)
+        first = minimax.select_attack()
+        second = minimax.copy(self.bq).select_attack()
+
+        self.assertEqual([move['action'] for move in stats.moves],
+                         [first, second])
+        aggregate = stats.get_aggregate()
+        self.assertEqual(aggregate['moves'], 2)
+        self.assertEqual(aggregate['nodes'],
+                         sum(move['nodes'] for move in stats.moves))
+        self.assertEqual(aggregate['copies'], 2)
+
+    def test_iterative_matches_recursive_without_cache(self):
+        """
+        Test to make sure IterativeMinimax reaches the same number of nodes
+        and terminal states, and the same depth, as RecursiveMinimax, both
+        with an empty table they can't fill.
+        """
+        TRANSPOSITION_TABLE.max_size = 0
+        try:
+            recursive = SearchStats()
+            RecursiveMinimax(self.bq, recursive).select_attack()
+            iterative = SearchStats()
+            IterativeMinimax(self.bq, iterative).select_attack()
+        finally:
+            TRANSPOSITION_TABLE.max_size = 200000
+
+        for counter in ['nodes', 'terminals', 'max_depth', 'cache_misses']:
+            self.assertEqual(recursive.moves[0][counter],
+                             iterative.moves[0][counter],
+                             ("RecursiveMinimax counted {} {} but " +
+                              "IterativeMinimax counted {}.").format(
+                                  recursive.moves[0][counter], counter,
+                                  iterative.moves[0][counter]))
+
+    def test_json_lines(self):
+        """
+        Test to make sure each move is written to output as a line of JSON.
+        """
+        output = io.StringIO()
+        stats = SearchStats(output)
+        IterativeMinimax(self.bq, stats).select_attack()
+        IterativeMinimax(self.bq, stats).select_attack()
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], stats.moves)
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
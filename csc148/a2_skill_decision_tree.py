@@ -8,9 +8,68 @@ a2.pdf.
 This tree will be used during the gameplay of a2_game, but we may test your
 SkillDecisionTree with other examples.
 """
-from typing import Callable, List
+from itertools import product
+import hashlib
+from typing import Callable, List, Union
 from a2_skills import MageAttack, MageSpecial, RogueAttack, RogueSpecial
 
+# The inputs a condition can declare it reads, in the order a compiled table
+# is indexed by.
+INPUTS = ['caster_hp', 'caster_sp', 'target_hp', 'target_sp']
+
+# Compiled tables cover each input from 0 up to, but not including, this.
+# Skills for inputs outside that range are picked without the table.
+TABLE_LIMIT = 256
+
+
+def reads(*inputs: str) -> Callable:
+    """
+    Return a decorator declaring that a condition reads only inputs, which are
+    in INPUTS, so that SkillDecisionTree.compile() can build a table over them.
+
+    >>> @reads('caster_hp')
+    ... def f(caster, _):
+    ...     return caster.get_hp() > 50
+    >>> f.reads
+    ('caster_hp',)
+    """
+    def declare(condition: Callable) -> Callable:
+        """
+        Record that condition reads inputs, and return it.
+        """
+        condition.reads = inputs
+        return condition
+    return declare
+
+
+class Combatant:
+    """
+    A stand-in for a Character that a SkillDecisionTree's conditions can read.
+    """
+
+    def __init__(self, hp: int, sp: int) -> None:
+        """
+        Initialize this Combatant with HP hp and SP sp.
+
+        >>> c = Combatant(40, 100)
+        >>> c.get_hp(), c.get_sp()
+        (40, 100)
+        """
+        self._hp = hp
+        self._sp = sp
+
+    def get_hp(self) -> int:
+        """
+        Return the HP of this Combatant.
+        """
+        return self._hp
+
+    def get_sp(self) -> int:
+        """
+        Return the SP of this Combatant.
+        """
+        return self._sp
+
 
 class SkillDecisionTree:
     """
@@ -22,6 +81,10 @@ class SkillDecisionTree:
                You may assume priority numbers are unique (i.e. no two
                SkillDecisionTrees will have the same number.)
     children - the subtrees of this SkillDecisionTree.
+
+    pick_skill() walks the tree unless compile() has been called, after which
+    it looks skills up in what compile() built. compile() must be called again
+    if the tree is changed.
     """
     value: 'Skill'
     condition: Callable[['Character', 'Character'], bool]
@@ -50,6 +113,17 @@ class SkillDecisionTree:
         self.condition = condition
         self.priority = priority
         self.children = children[:] if children else []
+        # Built by compile(): every condition in the tree, and for each node
+        # in order of priority, its skill, the conditions that must pass to
+        # reach it, and the condition that must fail for it to be picked.
+        self._conditions = None
+        self._flat = None
+        # Also built by compile(), if it can be: for each input, the offset
+        # into _table of each of its values, the skill picked for each
+        # combination of inputs, and a signature of both.
+        self._axes = None
+        self._table = None
+        self._signature = None
 
     # Implement a method called pick_skill which takes in a caster and target
     # and returns a skill.
@@ -58,16 +132,32 @@ class SkillDecisionTree:
         Helper function for pick skill. Return a list of all skills that satisfy
         the condition of caster to use on target.
         """
-        if not self.condition(caster, target) or not self.children:
-            return [self]
-        return sum([child.pick_all(caster, target) for child in self.children],
-                   [])
+        picked = []
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            if not node.condition(caster, target) or not node.children:
+                picked.append(node)
+            else:
+                nodes.extend(reversed(node.children))
+        return picked
 
     def pick_skill(self, caster: 'Character', target: 'Character') -> 'Skill':
         """
         Pick one skill from the tree that has the highest priority under passed
         conditions for caster to use on target.
         """
+        if self._table is not None:
+            caster_hp, caster_sp = caster.get_hp(), caster.get_sp()
+            target_hp, target_sp = target.get_hp(), target.get_sp()
+            if 0 <= min(caster_hp, caster_sp, target_hp, target_sp) and \
+                    max(caster_hp, caster_sp, target_hp, target_sp) < \
+                    TABLE_LIMIT:
+                axes = self._axes
+                return self._table[axes[0][caster_hp] + axes[1][caster_sp] +
+                                   axes[2][target_hp] + axes[3][target_sp]]
+        if self._flat is not None:
+            return self._pick_flat(caster, target)
         list_of_skills = self.pick_all(caster, target)
         skill_to_return = list_of_skills[0]
         for skill in list_of_skills:
@@ -75,6 +165,120 @@ class SkillDecisionTree:
                 skill_to_return = skill
         return skill_to_return.value
 
+    def compile(self) -> None:
+        """
+        Flatten this tree so that pick_skill() picks skills without walking
+        it. If every condition declares, with reads(), that it reads at most
+        one input, also build a table of the skill picked for every
+        combination of inputs, so that pick_skill() is a single lookup.
+
+        >>> t = create_default_tree()
+        >>> type(t.pick_skill(Combatant(100, 100), Combatant(100, 100)))
+        <class 'a2_skills.RogueSpecial'>
+        >>> len(t._table)
+        24
+        """
+        conditions = []
+        nodes = []
+        stack = [(self, ())]
+        while stack:
+            node, path = stack.pop()
+            index = len(conditions)
+            conditions.append(node.condition)
+            nodes.append((node.priority, index, node.value, path,
+                          index if node.children else None))
+            for child in reversed(node.children):
+                stack.append((child, path + (index,)))
+        nodes.sort(key=lambda item: item[:2])
+        self._conditions = conditions
+        self._flat = [(value, path, stop) for _, _, value, path, stop in nodes]
+        self._axes = None
+        self._table = None
+        self._signature = None
+        if all(len(getattr(condition, 'reads', INPUTS)) <= 1
+               for condition in conditions):
+            self._build_table()
+
+    def _pick_flat(self, caster: 'Character', target: 'Character') -> 'Skill':
+        """
+        Pick the skill for caster to use on target from this compiled tree:
+        the one with the highest priority whose conditions on the way to it
+        pass, and whose own condition fails or which has no children.
+        """
+        passed = [condition(caster, target) for condition in self._conditions]
+        for value, path, stop in self._flat:
+            if all(passed[i] for i in path) and \
+                    (stop is None or not passed[stop]):
+                return value
+        return None
+
+    def _build_table(self) -> None:
+        """
+        Build the table of the skill picked for every combination of inputs
+        from 0 to TABLE_LIMIT, for this compiled tree whose conditions each
+        read at most one input.
+
+        Values of an input that every condition reading it treats the same
+        way share one entry, so the table only has an entry for each
+        combination of distinct outcomes.
+        """
+        mappings = []
+        representatives = []
+        for name in INPUTS:
+            readers = [condition for condition in self._conditions
+                       if getattr(condition, 'reads', ()) == (name,)]
+            outcomes = {}
+            mapping = []
+            for value in range(TABLE_LIMIT):
+                inputs = dict.fromkeys(INPUTS, 0)
+                inputs[name] = value
+                caster, target = _make_combatants(inputs)
+                outcome = tuple(condition(caster, target)
+                                for condition in readers)
+                if outcome not in outcomes:
+                    outcomes[outcome] = len(outcomes)
+                mapping.append(outcomes[outcome])
+            mappings.append(mapping)
+            representatives.append([mapping.index(i)
+                                    for i in range(len(outcomes))])
+        axes = []
+        stride = 1
+        for mapping, values in reversed(list(zip(mappings,
+                                                 representatives))):
+            axes.insert(0, [i * stride for i in mapping])
+            stride *= len(values)
+        table = []
+        for values in product(*representatives):
+            table.append(self._pick_flat(
+                *_make_combatants(dict(zip(INPUTS, values)))))
+        self._axes = axes
+        self._table = table
+        self._signature = hashlib.sha1(repr(
+            (axes, [type(value).__name__ for value in table])).encode()
+        ).hexdigest()
+
+    def get_signature(self) -> Union[str, None]:
+        """
+        Return a string that's the same for every compiled tree that picks the
+        same skills as this one for every combination of inputs in its table,
+        in any process, or None if compile() didn't build this tree a table.
+
+        >>> create_default_tree().get_signature() == \\
+        ...     create_default_tree().get_signature()
+        True
+        >>> SkillDecisionTree(MageAttack(), f6, 1).get_signature()
+        """
+        return self._signature
+
+
+def _make_combatants(inputs: dict) -> tuple:
+    """
+    Return a caster and a target Combatant with the values of inputs, a dict
+    from each name in INPUTS.
+    """
+    return (Combatant(inputs['caster_hp'], inputs['caster_sp']),
+            Combatant(inputs['target_hp'], inputs['target_sp']))
+
 
 def create_default_tree() -> SkillDecisionTree:
     """
@@ -93,9 +297,12 @@ def create_default_tree() -> SkillDecisionTree:
     e = SkillDecisionTree(MageSpecial(), f3, 2, [b])
     f = SkillDecisionTree(RogueAttack(), f4, 1, [c])
     g = SkillDecisionTree(MageAttack(), f2, 3, [d])
-    return SkillDecisionTree(MageAttack(), f1, 5, [g, e, f])
+    tree = SkillDecisionTree(MageAttack(), f1, 5, [g, e, f])
+    tree.compile()
+    return tree
 
 
+@reads('caster_hp')
 def f1(caster, _) -> bool:
     """
     Returns True if caster's hp is greater than 50.
@@ -103,6 +310,7 @@ def f1(caster, _) -> bool:
     return caster.get_hp() > 50
 
 
+@reads('caster_sp')
 def f2(caster, _) -> bool:
     """
     Returns True if caster's sp is greater than 20.
@@ -110,6 +318,7 @@ def f2(caster, _) -> bool:
     return caster.get_sp() > 20
 
 
+@reads('target_sp')
 def f3(_, target) -> bool:
     """
     Returns True if target's sp is greater than 40.
@@ -117,6 +326,7 @@ def f3(_, target) -> bool:
     return target.get_sp() > 40
 
 
+@reads('caster_hp')
 def f4(caster, _) -> bool:
     """
     Returns True if caster's hp is greater than 90.
@@ -124,6 +334,7 @@ def f4(caster, _) -> bool:
     return caster.get_hp() > 90
 
 
+@reads('target_hp')
 def f5(_, target) -> bool:
     """
     Returns True if target's hp is greater than 30.
@@ -131,6 +342,7 @@ def f5(_, target) -> bool:
     return target.get_hp() < 30
 
 
+@reads()
 def f6(_, __) -> bool:
     """
     A function for conditon of leaves in skill decision tree.
@@ -11,13 +11,17 @@ errors.
 Try playing your game through multiple times and trying various combinations of
 actions.
 """
+import copy
+import itertools
+import pickle
 import unittest
 
 # Import the student solution
 from a2_game import CHARACTER_CLASSES
 from a2_playstyle import ManualPlaystyle
 from a2_battle_queue import BattleQueue
-from a2_skill_decision_tree import SkillDecisionTree, create_default_tree
+from a2_skill_decision_tree import SkillDecisionTree, create_default_tree, \
+    Combatant
 from a2_skills import MageAttack, RogueAttack, MageSpecial
 from a2_characters import Rogue
 
@@ -269,5 +273,45 @@ class SkillDecisionTreeUnitTests(unittest.TestCase):
                                                 expected,
                                                 actual))
 
+    def test_compiled_matches_tree(self):
+        """
+        Test to make sure compiled trees pick the same skills as walking the
+        tree, both with a table (the default tree) and without one (the basic
+        tree, whose conditions don't declare what they read), including for
+        HP and SP outside the table.
+        """
+        values = [-1, 0, 19, 20, 21, 29, 30, 31, 40, 41, 50, 51, 90, 91, 100,
+                  255, 256, 1000]
+        for tree in [self.default_tree, self.basic_tree]:
+            walked = copy.copy(tree)
+            walked._flat = walked._table = None
+            tree.compile()
+            for hps_sps in itertools.product(values, repeat=4):
+                caster = Combatant(*hps_sps[:2])
+                target = Combatant(*hps_sps[2:])
+                expected = type(walked.pick_skill(caster, target)).__name__
+                actual = type(tree.pick_skill(caster, target)).__name__
+
+                self.assertEqual(expected, actual,
+                                 ("With caster HP and SP {} and target HP " +
+                                  "and SP {}, the compiled tree picked {} " +
+                                  "but walking it picks {}.").format(
+                                      hps_sps[:2], hps_sps[2:], actual,
+                                      expected))
+        self.assertIsNotNone(self.default_tree._table)
+        self.assertIsNone(self.basic_tree._table)
+
+    def test_compiled_tree_pickles(self):
+        """
+        Test to make sure a compiled tree can be pickled, so it can be sent to
+        worker processes.
+        """
+        tree = pickle.loads(pickle.dumps(self.default_tree))
+        self.caster.set_hp(20)
+
+        actual = type(tree.pick_skill(self.caster, self.target)).__name__
+        self.assertEqual('MageAttack', actual,
+                         "An unpickled default tree picked {}.".format(actual))
+
 if __name__ == "__main__":
     unittest.main(exit = False)
\ No newline at end of file
@@ -26,6 +26,12 @@ class Skill:
         """
         return self._cost
 
+    def get_damage(self) -> int:
+        """
+        Return the damage this Skill deals before the target's defense.
+        """
+        return self._damage
+
     def use(self, caster: 'Character', target: 'Character') -> None:
         """
         Makes caster use this Skill on target.
@@ -284,13 +290,7 @@ class SorcererSpecial(Skill):
         85
         """
         self._deal_damage(caster, target)
-        list_of_characters = []
-        while not caster.battle_queue.is_empty():
-            character = caster.battle_queue.remove()
-            if character not in list_of_characters:
-                list_of_characters.append(character)
-        for characters in list_of_characters:
-            caster.battle_queue.add(characters)
+        caster.battle_queue.dedupe_in_place()
         caster.battle_queue.add(caster)
 
 
@@ -16,7 +16,7 @@ import unittest
 # Import the student solution
 from a2_game import CHARACTER_CLASSES
 from a2_playstyle import ManualPlaystyle
-from a2_battle_queue import BattleQueue
+from a2_battle_queue import BattleQueue, RestrictedBattleQueue
 from a2_skill_decision_tree import create_default_tree
 SorcererConstructor = CHARACTER_CLASSES['s']
 
@@ -181,7 +181,32 @@ class SorcererUnitTests(unittest.TestCase):
                          ("After using a special attack, expected the battle " +
                           "queue to be in the order P2 -> P1 but " +
                           "got {} instead.").format(" -> ".join(queue_order)))
-    
+
+    def test_special_attack_restricted_battle_queue(self):
+        """
+        Test to make sure the special attack works in a RestrictedBattleQueue,
+        keeping whether each character is able to add.
+        """
+        bq = RestrictedBattleQueue()
+        playstyle = ManualPlaystyle(bq)
+        p1 = SorcererConstructor("P1", bq, playstyle)
+        p2 = SorcererConstructor("P2", bq, playstyle)
+        p1.enemy = p2
+        p2.enemy = p1
+        p1.set_skill_decision_tree(create_default_tree())
+        p2.set_skill_decision_tree(create_default_tree())
+        bq.add(p1)
+        bq.add(p2)
+        bq.add(p2)
+        bq.add(p1)
+        p1.special_attack()
+
+        # The queue should be P1 -> P2 -> P1. The first P1 and P2 keep their
+        # ability to add, and the last P1 can't, since two Sorcerers that can
+        # were already in the queue.
+        self.assertEqual(bq.get_state_key()[-3:],
+                         ((0, 1, 0), (True, True, False), False))
+
     def test_get_next_sprite_idle(self):
         """
         Test to make sure get_next_sprite gives the correct sprites when in
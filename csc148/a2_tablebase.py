@@ -0,0 +1,237 @@
+"""
+The endgame tablebase for A2.
+
+Every game starts with both characters at 100 HP and 100 SP, so for each
+pairing of character classes and kind of BattleQueue there are only a few
+thousand positions a game can reach. This module finds all of them, solves
+them backwards from the positions where the game is over (retrograde
+analysis), and writes the score and best action of every position to a small
+file per pairing. TablebasePlaystyle in a2_playstyle.py reads those files.
+
+Run this file to build the tablebase:
+    python a2_tablebase.py [directory]
+
+Sorcerers are solved using create_default_tree(), so the tables only give the
+right answers for Sorcerers that use the default SkillDecisionTree.
+"""
+import gzip
+import os
+import pickle
+import struct
+import sys
+from typing import Dict, List, Tuple, Union
+from a2_characters import Mage, Rogue, Vampire, Sorcerer
+from a2_game_state import GameState, successors
+from a2_skill_decision_tree import create_default_tree
+
+# The directory the tablebase is written to and read from by default.
+TABLEBASE_DIRECTORY = 'tablebase'
+
+# The Character classes that tables are built for.
+TABLEBASE_CLASSES = [Mage, Rogue, Vampire, Sorcerer]
+
+# Tables loaded by load_table(), keyed by file path. A table that doesn't exist
+# is stored as None.
+_LOADED_TABLES = {}
+
+# The signature of the SkillDecisionTree Sorcerers are solved with. Trees
+# aren't encoded into the tables, so states with any other tree aren't looked
+# up.
+_DEFAULT_SIGNATURE = create_default_tree().get_signature()
+
+
+def get_start_state(classes: Tuple[type, type],
+                    restricted: bool) -> GameState:
+    """
+    Return the GameState at the start of a game between characters of classes,
+    using a RestrictedBattleQueue if restricted is True.
+
+    >>> get_start_state((Rogue, Mage), False)
+    GameState(Rogue 100/100, Mage 100/100, order=(0, 1))
+    """
+    trees = tuple(create_default_tree() if c == Sorcerer else None
+                  for c in classes)
+    ables = (True, True) if restricted else None
+    return GameState(classes, (100, 100), (100, 100), (0, 1), ables, False,
+                     trees)
+
+
+def encode_state(state: GameState) -> bytes:
+    """
+    Return state packed into bytes, leaving out its classes and trees, which
+    are the same for every state in a table.
+
+    >>> len(encode_state(get_start_state((Rogue, Mage), False)))
+    11
+    """
+    state = state.cleaned()
+    if state.ables is None:
+        entries = state.order
+    else:
+        entries = [player + 2 * able
+                   for player, able in zip(state.order, state.ables)]
+    return struct.pack('>hhhh?', state.hps[0], state.hps[1], state.sps[0],
+                       state.sps[1], state.first_time_p2) + bytes(entries)
+
+
+def encode_result(score: int, action: str) -> int:
+    """
+    Return score and action packed into one int.
+
+    >>> decode_result(encode_result(-40, 'S'))
+    (-40, 'S')
+    """
+    return score * 2 + (action == 'S')
+
+
+def decode_result(result: int) -> Tuple[int, str]:
+    """
+    Return the (score, action) packed into result by encode_result().
+
+    >>> decode_result(encode_result(12, 'A'))
+    (12, 'A')
+    """
+    return result >> 1, 'S' if result & 1 else 'A'
+
+
+def solve(start: GameState) -> Dict[GameState, Tuple[int, str]]:
+    """
+    Return the score and best action of every position reachable from start
+    whose game is not over, keyed by cleaned GameState.
+
+    Scores and actions are the ones get_state_score() and RecursiveMinimax in
+    a2_playstyle.py would give. Positions are solved backwards: a position is
+    solved once all the positions its actions lead to are.
+
+    >>> results = solve(get_start_state((Rogue, Mage), False))
+    >>> results[get_start_state((Rogue, Mage), False)]
+    (30, 'S')
+    """
+    # Find every reachable position, and which positions lead to each one.
+    start = start.cleaned()
+    children = {start: None}
+    parents = {start: []}
+    stack = [start]
+    while stack:
+        state = stack.pop()
+        children[state] = [(action, child.cleaned())
+                           for action, child in successors(state)]
+        for _, child in children[state]:
+            if child not in children:
+                children[child] = None
+                parents[child] = []
+                stack.append(child)
+            parents[child].append(state)
+
+    # Solve positions starting from the ones whose game is over.
+    unsolved = {state: len(children[state]) for state in children}
+    scores = {}
+    results = {}
+    ready = [state for state in children if unsolved[state] == 0]
+    while ready:
+        state = ready.pop()
+        if not children[state]:
+            scores[state] = state.get_terminal_score()
+        else:
+            player_class = state.classes[state.get_next_player()]
+            best_score, best_action = None, None
+            for action, child in children[state]:
+                score = scores[child]
+                if child.classes[child.get_next_player()] != player_class:
+                    score = -score
+                if best_score is None or score > best_score:
+                    best_score, best_action = score, action
+            scores[state] = best_score
+            results[state] = (best_score, best_action)
+        for parent in parents[state]:
+            unsolved[parent] -= 1
+            if unsolved[parent] == 0:
+                ready.append(parent)
+    return results
+
+
+def get_table_path(directory: str, classes: Tuple[type, type],
+                   restricted: bool) -> str:
+    """
+    Return the path of the table for classes and the kind of BattleQueue
+    given by restricted, within directory.
+
+    >>> get_table_path('tb', (Rogue, Mage), True).replace(os.sep, '/')
+    'tb/rogue_mage_r.tb'
+    """
+    return os.path.join(directory, "{}_{}_{}.tb".format(
+        classes[0].__name__.lower(), classes[1].__name__.lower(),
+        'r' if restricted else 'n'))
+
+
+def write_table(path: str, results: Dict[GameState, Tuple[int, str]]) -> None:
+    """
+    Write results, as returned by solve(), to the file at path.
+    """
+    table = {encode_state(state): encode_result(score, action)
+             for state, (score, action) in results.items()}
+    with gzip.open(path, 'wb') as table_file:
+        pickle.dump(table, table_file, pickle.HIGHEST_PROTOCOL)
+
+
+def load_table(classes: Tuple[type, type], restricted: bool,
+               directory: str = None) -> Union[Dict[bytes, int], None]:
+    """
+    Return the table for classes and the kind of BattleQueue given by
+    restricted, read from directory, or None if it hasn't been built. Tables
+    are only read from disk once.
+
+    directory defaults to TABLEBASE_DIRECTORY.
+    """
+    if directory is None:
+        directory = TABLEBASE_DIRECTORY
+    path = get_table_path(directory, classes, restricted)
+    if path not in _LOADED_TABLES:
+        if os.path.exists(path):
+            with gzip.open(path, 'rb') as table_file:
+                _LOADED_TABLES[path] = pickle.load(table_file)
+        else:
+            _LOADED_TABLES[path] = None
+    return _LOADED_TABLES[path]
+
+
+def lookup(state: GameState,
+           directory: str = None) -> Union[Tuple[int, str], None]:
+    """
+    Return the (score, best action) of state from the tablebase in directory,
+    or None if it isn't there, or if a Sorcerer in state doesn't pick the same
+    skills as one with create_default_tree().
+
+    directory defaults to TABLEBASE_DIRECTORY.
+    """
+    for tree in state.trees:
+        if tree is not None and tree.get_signature() != _DEFAULT_SIGNATURE:
+            return None
+    table = load_table(state.classes, state.ables is not None, directory)
+    if table is None:
+        return None
+    result = table.get(encode_state(state))
+    return None if result is None else decode_result(result)
+
+
+def build_tablebase(directory: str = TABLEBASE_DIRECTORY) -> List[str]:
+    """
+    Solve every pairing of TABLEBASE_CLASSES on both kinds of BattleQueue and
+    write their tables to directory. Return the paths written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for first in TABLEBASE_CLASSES:
+        for second in TABLEBASE_CLASSES:
+            for restricted in [False, True]:
+                path = get_table_path(directory, (first, second), restricted)
+                results = solve(get_start_state((first, second), restricted))
+                write_table(path, results)
+                _LOADED_TABLES.pop(path, None)
+                print("Wrote {} ({} positions)".format(path, len(results)))
+                paths.append(path)
+    return paths
+
+
+if __name__ == '__main__':
+    build_tablebase(sys.argv[1] if len(sys.argv) > 1 else TABLEBASE_DIRECTORY)
@@ -0,0 +1,131 @@
+"""
+Unittests for the tablebase for A2.
+"""
+import random
+import shutil
+import tempfile
+import unittest
+
+import a2_tablebase
+from a2_game import CHARACTER_CLASSES, PLAYSTYLE_CLASSES
+from a2_game_state import GameState, successors
+from a2_playstyle import get_state_score, TRANSPOSITION_TABLE
+from a2_tablebase import get_start_state, solve, write_table
+from a2_skill_decision_tree import SkillDecisionTree, create_default_tree, f1
+from a2_skills import RogueAttack, RogueSpecial
+MageConstructor = CHARACTER_CLASSES['m']
+RogueConstructor = CHARACTER_CLASSES['r']
+Tablebase = PLAYSTYLE_CLASSES['tb']
+RecursiveMinimax = PLAYSTYLE_CLASSES['mr']
+
+
+class TablebaseUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Solves the Rogue vs. Mage pairing into a temporary tablebase.
+        """
+        TRANSPOSITION_TABLE.clear()
+        self.directory = tempfile.mkdtemp()
+        self.old_directory = a2_tablebase.TABLEBASE_DIRECTORY
+        a2_tablebase.TABLEBASE_DIRECTORY = self.directory
+        self.start = get_start_state((RogueConstructor, MageConstructor),
+                                     False)
+        self.results = solve(self.start)
+        write_table(a2_tablebase.get_table_path(
+            self.directory, self.start.classes, False), self.results)
+
+    def tearDown(self):
+        """
+        Delete the temporary tablebase.
+        """
+        a2_tablebase.TABLEBASE_DIRECTORY = self.old_directory
+        a2_tablebase._LOADED_TABLES.clear()
+        shutil.rmtree(self.directory)
+
+    def test_scores_match_get_state_score(self):
+        """
+        Test to make sure the solved scores match get_state_score along random
+        games.
+        """
+        rng = random.Random(148)
+        for _ in range(20):
+            state = self.start
+            while not state.is_over():
+                expected = get_state_score(state.to_battle_queue())
+                actual = self.results[state.cleaned()][0]
+
+                self.assertEqual(expected, actual,
+                                 ("The tablebase gives the score {} for " +
+                                  "{} but get_state_score gives " +
+                                  "{}.").format(actual, state, expected))
+                state = rng.choice(successors(state))[1]
+
+    def test_select_attack_matches_recursive_minimax(self):
+        """
+        Test to make sure TablebasePlaystyle picks the same attacks as
+        RecursiveMinimax, reading from the table on disk.
+        """
+        rng = random.Random(148)
+        for _ in range(10):
+            state = self.start
+            while not state.is_over():
+                bq = state.to_battle_queue()
+                expected = RecursiveMinimax(bq).select_attack()
+                actual = Tablebase(bq).select_attack()
+
+                self.assertEqual(expected, actual,
+                                 ("On a BattleQueue that looks like:\n{}\n" +
+                                  "RecursiveMinimax returns {} but " +
+                                  "TablebasePlaystyle returned " +
+                                  "{}.").format(bq, expected, actual))
+                state = rng.choice(successors(state))[1]
+
+    def test_missing_position_falls_back_to_search(self):
+        """
+        Test to make sure TablebasePlaystyle still picks an attack for a
+        position that isn't in the tablebase.
+        """
+        state = GameState(self.start.classes, (40, 14), (6, 35), (0, 1))
+        self.assertIsNone(a2_tablebase.lookup(state))
+
+        actual = Tablebase(state.to_battle_queue()).select_attack()
+
+        self.assertEqual("A", actual)
+
+    def test_other_tree_falls_back_to_search(self):
+        """
+        Test to make sure TablebasePlaystyle only uses a table solved for
+        Sorcerers with the default SkillDecisionTree when a Sorcerer's tree
+        picks the same skills, and searches otherwise.
+        """
+        start = get_start_state((CHARACTER_CLASSES['s'], RogueConstructor),
+                                False)
+        write_table(a2_tablebase.get_table_path(
+            self.directory, start.classes, False), solve(start))
+        other = SkillDecisionTree(RogueSpecial(), f1, 1,
+                                  [SkillDecisionTree(RogueAttack(), f1, 2)])
+        other.compile()
+        self.assertIsNotNone(a2_tablebase.lookup(start))
+
+        for tree in [create_default_tree(), other,
+                     SkillDecisionTree(RogueAttack(), f1, 1)]:
+            bq = start.to_battle_queue()
+            bq.peek().set_skill_decision_tree(tree)
+            found = a2_tablebase.lookup(GameState.from_battle_queue(bq))
+            if tree.get_signature() == \
+                    create_default_tree().get_signature():
+                self.assertIsNotNone(found)
+            else:
+                self.assertIsNone(found)
+            expected = RecursiveMinimax(bq).select_attack()
+            actual = Tablebase(bq).select_attack()
+
+            self.assertEqual(expected, actual,
+                             ("On a BattleQueue that looks like:\n{}\n" +
+                              "RecursiveMinimax returns {} but " +
+                              "TablebasePlaystyle returned " +
+                              "{}.").format(bq, expected, actual))
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
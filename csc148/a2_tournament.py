@@ -0,0 +1,230 @@
+"""
+The tournament runner for A2.
+
+Plays games between every pairing of character classes, playstyles and
+BattleQueue types without the UI, spread over a pool of worker processes,
+and streams each game's result to a file as CSV or JSON lines. Each game is
+seeded, so a tournament plays out the same way however its games are spread
+over workers. Workers can share the scores of solved positions through a
+ScoreStore file, which later tournaments start from.
+
+Run it from the command line, for example:
+    python a2_tournament.py --games 5 --playstyles r ab --output results.csv
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, TextIO, Tuple, Union
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from a2_game import BATTLE_QUEUE_CLASSES, CHARACTER_CLASSES, \
+    PLAYSTYLE_CLASSES, make_game, play_turn
+from a2_score_store import use_score_store, flush_score_store
+
+# The fields of each game's result, in the order they're written.
+FIELDS = ['game', 'seed', 'queue', 'p1_class', 'p2_class', 'p1_playstyle',
+          'p2_playstyle', 'winner', 'turns', 'p1_hp', 'p1_sp', 'p2_hp',
+          'p2_sp', 'p1_decision_time', 'p2_decision_time',
+          'p1_max_decision_time', 'p2_max_decision_time']
+
+# The formats results can be written in.
+FORMATS = ['csv', 'jsonl']
+
+# A game to play: its number, its seed, the key of its BattleQueue type in
+# BATTLE_QUEUE_CLASSES, and the keys of each player's class and playstyle.
+Pairing = Tuple[int, int, str, str, str, str, str]
+
+
+def get_pairings(queues: List[str], classes: List[str],
+                 playstyles: List[str], games: int,
+                 seed: int = 0) -> List[Pairing]:
+    """
+    Return games pairings of every BattleQueue type in queues, class in
+    classes for each player, and playstyle in playstyles for each player.
+    Games are numbered from 0 and seeded from seed up.
+
+    >>> pairings = get_pairings(['n'], ['r', 'm'], ['r'], 2, 10)
+    >>> len(pairings)
+    8
+    >>> pairings[1]
+    (1, 11, 'n', 'r', 'r', 'r', 'r')
+    >>> pairings[2]
+    (2, 12, 'n', 'r', 'm', 'r', 'r')
+    """
+    pairings = []
+    for queue in queues:
+        for p1_class in classes:
+            for p2_class in classes:
+                for p1_playstyle in playstyles:
+                    for p2_playstyle in playstyles:
+                        for _ in range(games):
+                            game = len(pairings)
+                            pairings.append((game, seed + game, queue,
+                                             p1_class, p2_class,
+                                             p1_playstyle, p2_playstyle))
+    return pairings
+
+
+def play_game(pairing: Pairing) -> Dict[str, Union[int, float, str]]:
+    """
+    Play out the game in pairing, and return its result as a dict with the
+    keys in FIELDS.
+
+    The winner is 'p1', 'p2' or None for a tie. Decision times are the
+    seconds each player spent picking and making their moves.
+
+    Raise ValueError if a player's turn doesn't change the game, as a
+    ManualPlaystyle's doesn't without a player, since the game would never
+    end.
+
+    >>> result = play_game((0, 148, 'n', 'r', 'm', 'r', 'r'))
+    >>> result['p1_class'], result['p2_playstyle']
+    ('Rogue', 'RandomPlaystyle')
+    >>> again = play_game((0, 148, 'n', 'r', 'm', 'r', 'r'))
+    >>> [result[key] == again[key] for key in ['winner', 'turns', 'p1_hp']]
+    [True, True, True]
+    """
+    game, seed, queue, p1_class, p2_class, p1_playstyle, p2_playstyle = \
+        pairing
+    random.seed(seed)
+    battle_queue = make_game(queue, p1_class, p2_class, p1_playstyle,
+                             p2_playstyle)
+    players = [battle_queue.peek(), battle_queue.peek().enemy]
+    times = ([], [])
+    turns = 0
+    while not battle_queue.is_over():
+        player = 0 if battle_queue.peek() is players[0] else 1
+        key = battle_queue.get_state_key()
+        start = time.perf_counter()
+        move = play_turn(battle_queue)
+        times[player].append(time.perf_counter() - start)
+        if battle_queue.get_state_key() == key:
+            raise ValueError("{} picked {}, which didn't change the game "
+                             "{}".format(type(players[player].playstyle)
+                                         .__name__, move, game))
+        turns += 1
+    for player in players:
+        if hasattr(player.playstyle, 'close'):
+            player.playstyle.close()
+    flush_score_store()
+
+    winner = battle_queue.get_winner()
+    result = {'game': game, 'seed': seed,
+              'queue': BATTLE_QUEUE_CLASSES[queue].__name__,
+              'winner': None if winner is None else
+                        'p{}'.format(players.index(winner) + 1),
+              'turns': turns}
+    for i, player in enumerate(players):
+        prefix = 'p{}_'.format(i + 1)
+        result[prefix + 'class'] = type(player).__name__
+        result[prefix + 'playstyle'] = type(player.playstyle).__name__
+        result[prefix + 'hp'] = player.get_hp()
+        result[prefix + 'sp'] = player.get_sp()
+        result[prefix + 'decision_time'] = sum(times[i])
+        result[prefix + 'max_decision_time'] = max(times[i], default=0.0)
+    return {field: result[field] for field in FIELDS}
+
+
+def play_games(pairings: Iterable[Pairing], max_workers: int = None,
+               score_store: str = None
+               ) -> Iterator[Dict[str, Union[int, float, str]]]:
+    """
+    Play out the games in pairings in a pool of max_workers worker processes,
+    or one per CPU if max_workers is None, or in this process if max_workers
+    is 0. Yield each game's result, in the order of pairings, as soon as it
+    and every game before it are finished.
+
+    If score_store is given, the scores of solved positions are shared
+    through the ScoreStore file at that path.
+    """
+    if max_workers == 0:
+        if score_store is None:
+            yield from map(play_game, pairings)
+            return
+        use_score_store(score_store)
+        try:
+            yield from map(play_game, pairings)
+        finally:
+            use_score_store(None)
+        return
+    with ProcessPoolExecutor(max_workers,
+                             initializer=use_score_store,
+                             initargs=(score_store,)) as executor:
+        yield from executor.map(play_game, pairings)
+
+
+def write_results(results: Iterable[Dict[str, Union[int, float, str]]],
+                  output: TextIO, output_format: str = 'csv') -> int:
+    """
+    Write each of results to output in output_format, one of FORMATS, as it
+    arrives. Return the number of results written.
+
+    >>> import io
+    >>> output = io.StringIO()
+    >>> write_results([{'game': 0, 'winner': None}], output, 'jsonl')
+    1
+    >>> output.getvalue()
+    '{"game": 0, "winner": null}\\n'
+    """
+    writer = None
+    if output_format == 'csv':
+        writer = csv.DictWriter(output, FIELDS)
+        writer.writeheader()
+    count = 0
+    for result in results:
+        if writer is None:
+            output.write(json.dumps(result) + '\n')
+        else:
+            writer.writerow(result)
+        output.flush()
+        count += 1
+    return count
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    Run a tournament with the options in argv, or on the command line if argv
+    is None.
+    """
+    parser = argparse.ArgumentParser(
+        description="Play games between every pairing of character classes, "
+                    "playstyles and BattleQueue types.")
+    parser.add_argument('--games', type=int, default=1,
+                        help="the number of games to play for each pairing")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="the seed of the first game")
+    parser.add_argument('--queues', nargs='+',
+                        default=list(BATTLE_QUEUE_CLASSES),
+                        choices=list(BATTLE_QUEUE_CLASSES))
+    parser.add_argument('--classes', nargs='+',
+                        default=list(CHARACTER_CLASSES),
+                        choices=list(CHARACTER_CLASSES))
+    # ManualPlaystyle needs a player, so it can't be used.
+    playstyles = [key for key in PLAYSTYLE_CLASSES if key != 'm']
+    parser.add_argument('--playstyles', nargs='+', default=playstyles,
+                        choices=playstyles)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="the number of worker processes, or 0 to play "
+                             "in this process (default: one per CPU)")
+    parser.add_argument('--format', default='csv', choices=FORMATS)
+    parser.add_argument('--output', default='-',
+                        help="the file to write results to (default: stdout)")
+    parser.add_argument('--score-store', default=None,
+                        help="an sqlite file to share and keep the scores of "
+                             "solved positions in")
+    args = parser.parse_args(argv)
+
+    pairings = get_pairings(args.queues, args.classes, args.playstyles,
+                            args.games, args.seed)
+    results = play_games(pairings, args.workers, args.score_store)
+    if args.output == '-':
+        write_results(results, sys.stdout, args.format)
+    else:
+        with open(args.output, 'w', newline='') as output:
+            write_results(results, output, args.format)
+
+
+if __name__ == '__main__':
+    main()
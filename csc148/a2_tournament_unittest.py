@@ -0,0 +1,118 @@
+"""
+Unittests for the tournament runner for A2.
+"""
+import csv
+import io
+import json
+import unittest
+from unittest import mock
+
+from a2_tournament import FIELDS, get_pairings, play_game, play_games, \
+    write_results, main
+
+# The fields of a result that don't depend on how long moves took.
+OUTCOME_FIELDS = [field for field in FIELDS if 'time' not in field]
+
+
+def get_outcomes(results):
+    """
+    Return the fields of each of results that don't depend on timing.
+    """
+    return [[result[field] for field in OUTCOME_FIELDS] for result in results]
+
+
+class TournamentUnitTests(unittest.TestCase):
+    def test_pairings(self):
+        """
+        Test to make sure every pairing of queue, classes and playstyles is
+        played the given number of times, each with its own seed.
+        """
+        pairings = get_pairings(['n', 'r'], ['m', 'r', 'v'], ['r', 'ab'], 3,
+                                100)
+
+        self.assertEqual(len(pairings), 2 * 3 * 3 * 2 * 2 * 3)
+        self.assertEqual(len(set(pairing[2:] for pairing in pairings)),
+                         2 * 3 * 3 * 2 * 2)
+        self.assertEqual([pairing[1] for pairing in pairings],
+                         list(range(100, 100 + len(pairings))))
+
+    def test_games_are_seeded(self):
+        """
+        Test to make sure a game played with the same seed plays out the same
+        way, and that the result describes the game.
+        """
+        pairing = (7, 148, 'r', 's', 'v', 'r', 'mc')
+        result = play_game(pairing)
+
+        self.assertEqual(get_outcomes([result]),
+                         get_outcomes([play_game(pairing)]))
+        self.assertEqual((result['game'], result['seed'], result['queue']),
+                         (7, 148, 'RestrictedBattleQueue'))
+        self.assertEqual((result['p1_class'], result['p2_playstyle']),
+                         ('Sorcerer', 'MCTSPlaystyle'))
+        self.assertIn(result['winner'], ['p1', 'p2', None])
+        self.assertTrue(result['p1_hp'] == 0 or result['p2_hp'] == 0 or
+                        result['winner'] is None)
+        self.assertGreater(result['p2_max_decision_time'], 0)
+
+    def test_stuck_game_raises(self):
+        """
+        Test to make sure a game whose player can't move raises ValueError
+        rather than never ending, and that ManualPlaystyle can't be asked for
+        on the command line.
+        """
+        self.assertRaises(ValueError, play_game,
+                          (0, 148, 'n', 'm', 'm', 'm', 'r'))
+        with mock.patch('sys.stderr', io.StringIO()):
+            self.assertRaises(SystemExit, main,
+                              ['--playstyles', 'm', '--workers', '0'])
+
+    def test_pool_matches_one_process(self):
+        """
+        Test to make sure games played in a pool of worker processes have the
+        same results, in the same order, as games played in this process.
+        """
+        pairings = get_pairings(['n', 'r'], ['m', 'v'], ['r'], 3)
+
+        expected = get_outcomes(play_games(pairings, 0))
+        actual = get_outcomes(play_games(pairings, 2))
+
+        self.assertEqual(expected, actual)
+
+    def test_csv_and_json_lines(self):
+        """
+        Test to make sure results written as CSV and JSON lines can be read
+        back.
+        """
+        results = list(play_games(get_pairings(['n'], ['r'], ['r'], 2), 0))
+        csv_output = io.StringIO()
+        json_output = io.StringIO()
+
+        self.assertEqual(write_results(results, csv_output, 'csv'), 2)
+        self.assertEqual(write_results(results, json_output, 'jsonl'), 2)
+
+        rows = list(csv.DictReader(io.StringIO(csv_output.getvalue())))
+        self.assertEqual([row['turns'] for row in rows],
+                         [str(result['turns']) for result in results])
+        self.assertEqual(list(rows[0]), FIELDS)
+        lines = json_output.getvalue().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], results)
+
+    def test_main(self):
+        """
+        Test to make sure the command line plays every pairing asked for and
+        writes a result for each.
+        """
+        output = io.StringIO()
+        with mock.patch('sys.stdout', output):
+            main(['--games', '2', '--queues', 'n', '--classes', 'm', 'r',
+                  '--playstyles', 'r', '--workers', '0', '--format',
+                  'jsonl'])
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 8)
+        self.assertEqual(json.loads(lines[-1])['game'], 7)
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)
@@ -0,0 +1,119 @@
+"""
+The TranspositionTable class for A2.
+
+A TranspositionTable remembers the scores of game states that have already
+been searched, so that minimax does not search the same state twice when two
+different orders of moves lead to it. A TranspositionTable can be backed by a
+ScoreStore from a2_score_store.py, to keep its scores between processes.
+"""
+from collections import OrderedDict
+from typing import Hashable, Union
+
+
+class TranspositionTable:
+    """
+    A class representing a TranspositionTable.
+
+    Scores are keyed by BattleQueue.get_state_key(). Once the table holds
+    max_size scores, the least recently used score is evicted to make room.
+
+    If the table has a score_store, scores it doesn't hold are looked up in
+    it, and every score stored to the table is also stored to it.
+
+    max_size - the maximum number of scores this TranspositionTable holds.
+    score_store - a ScoreStore backing this TranspositionTable, or None.
+    """
+    max_size: int
+    score_store: Union['ScoreStore', None]
+
+    def __init__(self, max_size: int = 200000,
+                 score_store: 'ScoreStore' = None) -> None:
+        """
+        Initialize this TranspositionTable so that it holds at most max_size
+        scores, backed by score_store.
+
+        >>> t = TranspositionTable(10)
+        >>> len(t)
+        0
+        """
+        self.max_size = max_size
+        self.score_store = score_store
+        self._scores = OrderedDict()
+
+    def __len__(self) -> int:
+        """
+        Return the number of scores in this TranspositionTable.
+
+        >>> t = TranspositionTable()
+        >>> t.store('a', 1)
+        >>> len(t)
+        1
+        """
+        return len(self._scores)
+
+    def lookup(self, key: Hashable) -> Union[int, None]:
+        """
+        Return the score stored for key, or None if there isn't one in this
+        TranspositionTable or its score_store.
+
+        >>> t = TranspositionTable()
+        >>> t.store('a', 5)
+        >>> t.lookup('a')
+        5
+        >>> t.lookup('b')
+        """
+        score = self._scores.get(key)
+        if score is not None:
+            self._scores.move_to_end(key)
+        elif self.score_store is not None:
+            score = self.score_store.lookup(key)
+            if score is not None:
+                self._remember(key, score)
+        return score
+
+    def store(self, key: Hashable, score: int) -> None:
+        """
+        Store score for key, and to the score_store, evicting the least
+        recently used score if this TranspositionTable is full.
+
+        >>> t = TranspositionTable(2)
+        >>> t.store('a', 1)
+        >>> t.store('b', 2)
+        >>> t.lookup('a')
+        1
+        >>> t.store('c', 3)
+        >>> t.lookup('b')
+        >>> t.lookup('a')
+        1
+        """
+        self._remember(key, score)
+        if self.score_store is not None:
+            self.score_store.store(key, score)
+
+    def _remember(self, key: Hashable, score: int) -> None:
+        """
+        Hold score for key in this TranspositionTable, evicting the least
+        recently used score if it's full.
+        """
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        if len(self._scores) > self.max_size:
+            self._scores.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove every score held by this TranspositionTable. Scores in its
+        score_store are kept.
+
+        >>> t = TranspositionTable()
+        >>> t.store('a', 1)
+        >>> t.clear()
+        >>> len(t)
+        0
+        """
+        self._scores.clear()
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config='a2_pyta.txt')
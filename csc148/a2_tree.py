@@ -1,23 +1,134 @@
 """
 This class represents state of each step in game.
 """
+from typing import List
+import math
 
 
 class State:
     """
-    A class represents each State for iterative minimax to use
+    A class represents each State for iterative minimax to use.
+
+    The game itself is not stored: iterative minimax walks a single
+    BattleQueue, applying prev_action when it steps into a State and undoing
+    it when it steps back out. Children aren't stored either: each one is
+    created when it's stepped into and dropped once its score is folded into
+    this State's, so only the States on the current path are alive.
+
+    prev_action - the action that led to this State.
+    player - the type of the character to act next in this State.
+    actions - the actions whose children haven't been stepped into yet, last
+              one first.
+    score - the best score of the children folded in so far.
+    best_action - the action leading to the child with that score.
     """
-    def __init__(self, bq: 'BattleQueue', prev_action=None,
-                 children: list = None, score: int = None) -> None:
+    __slots__ = ['prev_action', 'player', 'actions', 'score', 'best_action']
+    prev_action: str
+    player: type
+    actions: List[str]
+    score: int
+    best_action: str
+
+    def __init__(self, prev_action: str = None, actions: List[str] = None,
+                 score: int = None) -> None:
         """
-        Initializes a state for iterative minimax to use.
+        Initializes a state for iterative minimax to use, with actions
+        left to step into.
+
+        >>> s = State('A', ['A', 'S'])
+        >>> s.actions
+        ['S', 'A']
         """
-        self.bq = bq
-        self.children = children[:] if children else []
-        self.score = score
         self.prev_action = prev_action
+        self.player = None
+        self.actions = actions[::-1] if actions else []
+        self.score = score
         self.best_action = None
 
+    def fold(self, child: 'State') -> None:
+        """
+        Fold the score of child, whose search is finished, into this State's
+        score. The child's score is negated if a different type of character
+        acts next in it. Ties go to the child folded first.
+
+        >>> s = State()
+        >>> s.player = int
+        >>> child = State('A', score=5)
+        >>> child.player = str
+        >>> s.fold(child)
+        >>> s.score, s.best_action
+        (-5, 'A')
+        """
+        if self.player == child.player:
+            score = child.score
+        else:
+            score = child.score * -1
+        if self.score is None or score > self.score:
+            self.score = score
+            self.best_action = child.prev_action
+
+
+class MCTSNode:
+    """
+    A class represents each node of the tree Monte Carlo tree search builds.
+
+    Like State, the game itself is not stored: the search applies the
+    actions from the root to a node to a single BattleQueue to reach it.
+
+    prev_action - the action that led to this node.
+    parent - the node prev_action was taken from, or None for the root.
+    player - the type of the character to act next in this node.
+    actions - the actions that haven't been expanded into children yet.
+    children - the nodes expanded from this one.
+    visits - the number of simulations that passed through this node.
+    total - the sum of those simulations' rewards, for the character who
+            picked prev_action.
+    """
+    __slots__ = ['prev_action', 'parent', 'player', 'actions', 'children',
+                 'visits', 'total']
+    prev_action: str
+    parent: 'MCTSNode'
+    player: type
+    actions: List[str]
+    children: List['MCTSNode']
+    visits: int
+    total: float
+
+    def __init__(self, prev_action: str = None, parent: 'MCTSNode' = None,
+                 player: type = None, actions: List[str] = None) -> None:
+        """
+        Initializes a node for Monte Carlo tree search, reached from parent
+        by prev_action, with player to act next and actions left to expand.
+
+        >>> root = MCTSNode(player=int, actions=['A', 'S'])
+        >>> root.actions
+        ['S', 'A']
+        >>> root.visits, root.children
+        (0, [])
+        """
+        self.prev_action = prev_action
+        self.parent = parent
+        self.player = player
+        self.actions = actions[::-1] if actions else []
+        self.children = []
+        self.visits = 0
+        self.total = 0.0
+
+    def get_uct(self, exploration: float) -> float:
+        """
+        Return the upper confidence bound of this node's reward, which is
+        visited at least once, widened by exploration.
+
+        >>> root = MCTSNode()
+        >>> root.visits = 4
+        >>> child = MCTSNode('A', root)
+        >>> child.visits, child.total = 2, 1.0
+        >>> round(child.get_uct(0), 2)
+        0.5
+        """
+        return self.total / self.visits + exploration * math.sqrt(
+            math.log(self.parent.visits) / self.visits)
+
 
 if __name__ == '__main__':
     import python_ta
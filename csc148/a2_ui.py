@@ -9,6 +9,8 @@ all of your client code.
 """
 import a2_game
 import pygame
+from ui_assets import SpriteAtlas, LabelCache
+from a2_renderer import DirtyRenderer
 import sys
 
 GAME_SPEED = 100
@@ -23,11 +25,18 @@ P2_POSITION = CHARACTER_SIZE - (CHARACTER_SIZE // 4)
 RANDOM_TIMER = 10
 FONT_SIZE = 18
 
+# Loaded once by start_game()
+SPRITES = None
+BACKGROUND = None
+LABELS = None
+RENDERER = None
+
 def start_game():
     """
     Start and initialize the game
     """
     global PYGAME_SCREEN, CHARACTER_SIZE, NUMBER_OF_CHARACTERS, FONT_SIZE
+    global SPRITES, BACKGROUND, LABELS, RENDERER
     a2_game.set_up_game()
     
     # Set up the width and height of the screen (proportional to the character
@@ -40,6 +49,12 @@ def start_game():
     # set the screen to draw on
     PYGAME_SCREEN = pygame.display.set_mode(pixel_size)
 
+    # Load every sprite and the font now, rather than on every frame
+    SPRITES = SpriteAtlas('sprites')
+    BACKGROUND = pygame.image.load('sprites/background.png').convert()
+    LABELS = LabelCache(FONT_SIZE)
+    RENDERER = DirtyRenderer(PYGAME_SCREEN)
+
 def update_game():
     """
     Update the game's UI.
@@ -62,72 +77,56 @@ def update_game():
     
     p2_label = "{}\nHP: {}\nSP: {}".format(p2_name, p2_hp, p2_sp).split("\n")
     
-    font_type = pygame.font.get_default_font()
-    font = pygame.font.SysFont(font_type, FONT_SIZE)
-    
-    p1_icon = pygame.image.load('sprites/' + p1_sprite + '.png')
-    p2_icon = pygame.image.load('sprites/' + p2_sprite + '.png')
-
-    PYGAME_SCREEN.fill((255, 255, 255)) # (255, 255, 255)=(r,g,b)=white
-    bg = pygame.image.load('sprites/background.png')
+    # Only the parts of the screen whose layers changed are redrawn
     rect = pygame.Rect(0, 0, NUMBER_OF_CHARACTERS * CHARACTER_SIZE,
                        CHARACTER_SIZE + PADDING * 2)
-    PYGAME_SCREEN.blit(bg, rect)
+    RENDERER.set_layer('background', [(BACKGROUND, rect, None)])
     
     # Draw the first character
     (x, y) = P1_POSITION, PADDING
-    rect = pygame.Rect(x, y, CHARACTER_SIZE, CHARACTER_SIZE)
-    PYGAME_SCREEN.blit(p1_icon, rect)
-    
-    y_coordinate = 0
-    for line in p1_label:
-        text = font.render(line, True, (0, 0, 0))
-        PYGAME_SCREEN.blit(text, (P1_POSITION + PADDING, y_coordinate))
-        y_coordinate += FONT_SIZE
+    RENDERER.set_layer('p1_sprite', [SPRITES.get_blit(p1_sprite, (x, y))])
+    RENDERER.set_layer('p1_label', get_label_blits('p1', p1_label,
+                                                   P1_POSITION + PADDING, 0))
     
     # Draw the HP bar
     # Draw the SP bar
     
     # Draw the second character
     # Flip p2 so they face p1
-    p2_icon = pygame.transform.flip(p2_icon, True, False)
     (x, y) = P2_POSITION, PADDING
-    rect = pygame.Rect(x, y, CHARACTER_SIZE, CHARACTER_SIZE)
-    PYGAME_SCREEN.blit(p2_icon, rect)
-
-    y_coordinate = 0
-    for line in p2_label:
-        text = font.render(line, True, (0, 0, 0))
-        PYGAME_SCREEN.blit(text, (P2_POSITION + PADDING, y_coordinate))
-        y_coordinate += FONT_SIZE    
+    RENDERER.set_layer('p2_sprite', [SPRITES.get_blit(p2_sprite, (x, y),
+                                                      flipped=True)])
+    RENDERER.set_layer('p2_label', get_label_blits('p2', p2_label,
+                                                   P2_POSITION + PADDING, 0))
     
     # Update the current player and available actions
     if not a2_game.GAME_IS_OVER:
         actions = draw_parameters['actions']
         current_player = draw_parameters['current_player']
-        action_label = ["Current Character: {}".format(current_player),
+        status_label = ["Current Character: {}".format(current_player),
                         "Available Actions: {}".format(", ".join(actions))]
-    
-        y_coordinate = CHARACTER_SIZE + PADDING
-        for line in action_label:
-            text = font.render(line, True, (0, 0, 0))
-            PYGAME_SCREEN.blit(text, (P1_POSITION + PADDING // 2, y_coordinate))
-            y_coordinate += FONT_SIZE
     else:
-        game_label = ["Game over!"]
+        status_label = ["Game over!"]
         winner = a2_game.GAME_WINNER
         if winner:
-            game_label.append("The winner is {}!".format(winner.get_name()))
+            status_label.append("The winner is {}!".format(winner.get_name()))
         else:
-            game_label.append("The game ended in a tie!")
-        
-        y_coordinate = CHARACTER_SIZE + PADDING
-        for line in game_label:
-            text = font.render(line, True, (0, 0, 0))
-            PYGAME_SCREEN.blit(text, (P1_POSITION + PADDING // 2, y_coordinate))
-            y_coordinate += FONT_SIZE 
+            status_label.append("The game ended in a tie!")
+    
+    RENDERER.set_layer('status_label',
+                       get_label_blits('status', status_label,
+                                       P1_POSITION + PADDING // 2,
+                                       CHARACTER_SIZE + PADDING))
     
-    pygame.display.flip()
+    pygame.display.update(RENDERER.draw())
+
+def get_label_blits(key, lines, x, y):
+    """
+    Return the blits drawing lines of text, rendered as the label key, one
+    under the other from (x, y).
+    """
+    return [(text, (x, y + i * FONT_SIZE), None)
+            for i, text in enumerate(LABELS.render_lines(key, lines))]
 
 if __name__ == '__main__':
     start_game()
@@ -138,6 +137,8 @@ if __name__ == '__main__':
     
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                # Stop waiting on any AI that's still thinking
+                a2_game.cancel_search()
                 pygame.quit()
                 sys.exit(0)
             if event.type == pygame.KEYDOWN and not a2_game.GAME_IS_OVER:
@@ -154,20 +155,31 @@ if __name__ == '__main__':
                     a2_game.LAST_KEY_PRESSED = k
                     a2_game.perform_attack()
                 
-        # If the current player isn't using a manual playstyle, pick a move
+        # If the current player isn't using a manual playstyle, start them
+        # picking a move in the background, so the UI keeps drawing while
+        # they think, and make it once they've picked it
+        waiting = False
         if (not a2_game.GAME_IS_OVER and
             not a2_game.BATTLE_QUEUE.is_over() and 
-            not a2_game.BATTLE_QUEUE.peek().playstyle.is_manual and
-            RANDOM_TIMER == 10):
-            a2_game.perform_attack()
+            not a2_game.BATTLE_QUEUE.peek().playstyle.is_manual):
+            a2_game.start_search()
+            if RANDOM_TIMER == 10:
+                waiting = not a2_game.poll_attack()
+        # Otherwise, let the other player search for their replies while the
+        # current player picks their move
+        elif (not a2_game.GAME_IS_OVER and
+              not a2_game.BATTLE_QUEUE.is_over()):
+            a2_game.start_pondering()
     
         # Redraw the game
         update_game()
         
-        # Only let the random strategy make a decision every 10 ticks of time
-        RANDOM_TIMER -= 1
-        if RANDOM_TIMER == 0:
-            RANDOM_TIMER = 10
+        # Only let the random strategy make a decision every 10 ticks of time,
+        # or the first tick after that its move is ready
+        if not waiting:
+            RANDOM_TIMER -= 1
+            if RANDOM_TIMER == 0:
+                RANDOM_TIMER = 10
     
     pygame.quit()
     sys.exit(0)        
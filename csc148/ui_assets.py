@@ -0,0 +1,147 @@
+"""
+The sprite and font caches shared by the A1 and A2 UIs.
+
+Loading sprites from disk, building a font and rendering labels on every frame
+makes frames take longer than GAME_SPEED, and by differing amounts. Each UI
+instead loads every sprite once into its own SpriteAtlas, and renders its
+labels through its own LabelCache, which keeps one font and only re-renders a
+line of text when it changes.
+"""
+from typing import Any, Dict, List, Tuple
+import math
+import os
+import pygame
+
+
+class SpriteAtlas:
+    """
+    A class representing every sprite in a directory, packed into one surface.
+
+    Each sprite is packed twice: as it is, and flipped left to right for a
+    character on the right of the screen, so that they face the other way.
+    Sprites are packed into a grid of cells the size of the largest one.
+
+    atlas - the surface every sprite is packed into.
+    """
+    atlas: pygame.Surface
+    _rects: Dict[str, Tuple[pygame.Rect, pygame.Rect]]
+
+    def __init__(self, directory: str = 'sprites',
+                 exclude: Tuple[str, ...] = ('background',)) -> None:
+        """
+        Initialize this SpriteAtlas with every .png file in directory, named
+        by their file names without the extension, except those in exclude.
+
+        If the display has been set up, the atlas is converted to its pixel
+        format, so that drawing from it is fast.
+        """
+        images = []
+        for file_name in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(file_name)
+            if extension == '.png' and name not in exclude:
+                images.append((name, pygame.image.load(
+                    os.path.join(directory, file_name))))
+
+        width = max([image.get_width() for _, image in images], default=0)
+        height = max([image.get_height() for _, image in images], default=0)
+        columns = max(math.ceil(math.sqrt(2 * len(images))), 1)
+        rows = math.ceil(2 * len(images) / columns)
+        self.atlas = pygame.Surface((columns * width, rows * height),
+                                    pygame.SRCALPHA)
+
+        self._rects = {}
+        for i, (name, image) in enumerate(images):
+            rects = []
+            for cell, surface in [(i, image),
+                                  (len(images) + i,
+                                   pygame.transform.flip(image, True, False))]:
+                rect = surface.get_rect(topleft=((cell % columns) * width,
+                                                 (cell // columns) * height))
+                self.atlas.blit(surface, rect)
+                rects.append(rect)
+            self._rects[name] = (rects[0], rects[1])
+
+        if pygame.display.get_surface() is not None:
+            self.atlas = self.atlas.convert_alpha()
+
+    def __len__(self) -> int:
+        """
+        Return the number of sprites in this SpriteAtlas.
+        """
+        return len(self._rects)
+
+    def __contains__(self, name: str) -> bool:
+        """
+        Return whether this SpriteAtlas has a sprite called name.
+        """
+        return name in self._rects
+
+    def get_rect(self, name: str, flipped: bool = False) -> pygame.Rect:
+        """
+        Return the area of the atlas holding the sprite called name, or its
+        flipped copy if flipped.
+        """
+        return self._rects[name][flipped]
+
+    def draw(self, surface: pygame.Surface, name: str, position: Any,
+             flipped: bool = False) -> pygame.Rect:
+        """
+        Draw the sprite called name, or its flipped copy if flipped, onto
+        surface at position. Return the area of surface drawn on.
+        """
+        return surface.blit(self.atlas, position, self._rects[name][flipped])
+
+    def get_blit(self, name: str, position: Any,
+                 flipped: bool = False) -> tuple:
+        """
+        Return the arguments to pass to Surface.blit() to draw the sprite
+        called name, or its flipped copy if flipped, at position.
+        """
+        return self.atlas, position, self._rects[name][flipped]
+
+
+class LabelCache:
+    """
+    A class that renders lines of text in one font, keeping the last surface
+    rendered for each line until its text changes.
+
+    font - the font lines are rendered in.
+    """
+    font: pygame.font.Font
+    _colour: Tuple[int, int, int]
+    _lines: Dict[Any, Tuple[str, pygame.Surface]]
+
+    def __init__(self, size: int, colour: Tuple[int, int, int] = (0, 0, 0)
+                 ) -> None:
+        """
+        Initialize this LabelCache to render text in the default font at size
+        size, in colour.
+        """
+        self.font = pygame.font.SysFont(pygame.font.get_default_font(), size)
+        self._colour = colour
+        self._lines = {}
+
+    def render(self, key: Any, text: str) -> pygame.Surface:
+        """
+        Return a surface with text rendered on it, for the line identified by
+        key. If the text of that line hasn't changed since it was last
+        rendered, return the same surface as last time.
+        """
+        line = self._lines.get(key)
+        if line is None or line[0] != text:
+            line = (text, self.font.render(text, True, self._colour))
+            self._lines[key] = line
+        return line[1]
+
+    def render_lines(self, key: Any, lines: List[str]
+                     ) -> List[pygame.Surface]:
+        """
+        Return a surface for each of lines, rendered as the lines identified
+        by key and their index in lines.
+        """
+        return [self.render((key, i), line) for i, line in enumerate(lines)]
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config='a2_pyta.txt')
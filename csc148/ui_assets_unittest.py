@@ -0,0 +1,82 @@
+"""
+Unittests for the sprite and font caches for the UIs.
+
+These run without a window, using SDL's dummy video driver.
+"""
+import os
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from ui_assets import SpriteAtlas, LabelCache
+
+
+def get_pixels(surface):
+    """
+    Return the RGBA pixels of surface, copied onto a surface with an alpha
+    channel so that surfaces of different pixel formats can be compared.
+    """
+    copy = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+    copy.blit(surface, (0, 0))
+    return pygame.image.tobytes(copy, 'RGBA')
+
+
+class AssetsUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up pygame and an atlas of the sprites.
+        """
+        pygame.init()
+        self.atlas = SpriteAtlas('sprites')
+
+    def test_atlas_has_every_sprite(self):
+        """
+        Test to make sure every sprite but the background is in the atlas.
+        """
+        names = [file_name[:-4] for file_name in os.listdir('sprites')
+                 if file_name.endswith('.png')]
+
+        self.assertEqual(len(self.atlas), len(names) - 1)
+        self.assertNotIn('background', self.atlas)
+        for name in names:
+            if name != 'background':
+                self.assertIn(name, self.atlas,
+                              "The atlas is missing {}.".format(name))
+
+    def test_atlas_matches_files(self):
+        """
+        Test to make sure drawing a sprite from the atlas, flipped or not,
+        draws the same pixels as drawing its file.
+        """
+        for name in ['mage_idle_0', 'rogue_attack_9', 'vampire_special_4']:
+            image = pygame.image.load('sprites/{}.png'.format(name))
+            for flipped in [False, True]:
+                expected = image
+                if flipped:
+                    expected = pygame.transform.flip(image, True, False)
+                actual = self.atlas.atlas.subsurface(
+                    self.atlas.get_rect(name, flipped))
+
+                self.assertEqual(get_pixels(expected),
+                                 get_pixels(actual),
+                                 ("The atlas's copy of {} (flipped: {}) " +
+                                  "differs from its file.").format(name,
+                                                                   flipped))
+
+    def test_labels_render_once(self):
+        """
+        Test to make sure a line is only rendered again once its text
+        changes.
+        """
+        labels = LabelCache(18)
+        first = labels.render_lines('p1', ['P1', 'HP: 100'])
+
+        self.assertEqual(labels.render_lines('p1', ['P1', 'HP: 100']), first)
+        again = labels.render_lines('p1', ['P1', 'HP: 90'])
+        self.assertIs(again[0], first[0])
+        self.assertIsNot(again[1], first[1])
+
+
+if __name__ == "__main__":
+    unittest.main(exit = False)